@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Offline microbenchmarks for the per-cycle hot paths, with stored baselines
+
+Times the functions every cycle runs (kline parsing, RSI, MFI, indicators, signal,
+structure stop, qty/price formatting) on seeded synthetic candles at several history
+lengths, so a slowdown shows up before it reaches a live loop. Baselines are
+machine-specific: save one on the machine that runs --check.
+
+Usage:
+    python _bench/bench_hot_paths.py                                  # Run and print
+    python _bench/bench_hot_paths.py --save-baseline                  # Store as the baseline
+    python _bench/bench_hot_paths.py --check                          # Exit 1 on >25% regression
+    python _bench/bench_hot_paths.py --check --threshold 10 --filter rsi
+    python _bench/bench_hot_paths.py --lengths 200 1000 --output hot_paths.json
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import subprocess
+import contextlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.trade_engine import TradeEngine
+from core.risk_management import RiskManager
+from strategies.RSI_MFI_Cloud import RSIMFICloudStrategy
+
+DEFAULT_BASELINE = os.path.join(project_root, '_bench', 'baselines', 'hot_paths.json')
+DEFAULT_LENGTHS = (100, 500, 1000, 5000)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def synthetic_klines(length, seed=7, start_price=600.0):
+    """Bybit v5 kline rows for a 5m random walk: strings, newest first"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.002, length)))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wick = np.abs(rng.normal(0, 0.001, (2, length))) * close
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    volume = rng.uniform(50, 500, length)
+    start_ms = 1_700_000_000_000
+    rows = [[str(start_ms + i * 300_000), f"{open_[i]:.2f}", f"{high[i]:.2f}", f"{low[i]:.2f}",
+             f"{close[i]:.2f}", f"{volume[i]:.3f}", f"{volume[i] * close[i]:.2f}"]
+            for i in range(length)]
+    return rows[::-1]
+
+
+def time_call(func, repeat=15, min_time=0.05):
+    """Best per-call seconds over `repeat` short autoranged loops, the minimum is the least noisy"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def build_cases(lengths):
+    """[(name, length or None, callable)] in report order"""
+    strategy = RSIMFICloudStrategy(RiskManager())
+    cases = []
+
+    for length in lengths:
+        rows = synthetic_klines(length)
+        df = TradeEngine.parse_klines(rows)
+        entry = float(df['close'].iloc[-1])
+
+        # Signals print their structure stop, keep that out of the timings
+        def generate_signal(df=df):
+            strategy.last_signal = None
+            with contextlib.redirect_stdout(None):
+                return strategy.generate_signal(df)
+
+        def structure_stop(df=df):
+            with contextlib.redirect_stdout(None):
+                strategy.get_structure_stop(df, 'BUY', entry)
+
+        cases += [
+            ('parse_klines', length, lambda rows=rows: TradeEngine.parse_klines(rows)),
+            ('calculate_rsi', length, lambda df=df: strategy.calculate_rsi(df['close'])),
+            ('calculate_mfi', length, lambda df=df: strategy.calculate_mfi(df['high'], df['low'], df['close'])),
+            ('calculate_indicators', length, lambda df=df: strategy.calculate_indicators(df)),
+            ('generate_signal', length, generate_signal),
+            ('get_structure_stop', length, structure_stop),
+        ]
+
+    # Formatting does not depend on history, a step/tick typical of linear perps
+    info = {'min_qty': 0.01, 'qty_step': 0.01, 'tick_size': 0.01}
+    cases += [
+        ('format_qty', None, lambda: TradeEngine.format_qty(None, info, 1.23456)),
+        ('format_price', None, lambda: TradeEngine.format_price(None, info, 612.3456)),
+    ]
+    return cases
+
+
+def case_key(name, length):
+    return f"{name}[{length}]" if length else name
+
+
+def run_benchmarks(cases, repeat=15):
+    results = {}
+    for key, (name, length, func) in cases.items():
+        seconds = time_call(func, repeat=repeat)
+        results[key] = {'name': name, 'length': length, 'us_per_call': seconds * 1e6}
+        print(f"   {key:<28} {seconds * 1e6:12.2f} µs")
+    return results
+
+
+def retime(cases, results, keys, repeat):
+    """Time suspected regressions again and keep the best, one noisy neighbour should not fail a check"""
+    for key in keys:
+        seconds = time_call(cases[key][2], repeat=repeat)
+        results[key]['us_per_call'] = min(results[key]['us_per_call'], seconds * 1e6)
+
+
+def compare(results, baseline):
+    """[(key, baseline us, current us, change %)] for every case present in both"""
+    rows = []
+    for key, current in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base:
+            continue
+        change = (current['us_per_call'] / base['us_per_call'] - 1) * 100
+        rows.append((key, base['us_per_call'], current['us_per_call'], change))
+    return rows
+
+
+def print_comparison(rows, threshold):
+    print("=" * 60)
+    print(f"VS BASELINE | regression threshold +{threshold:.0f}%")
+    print("=" * 60)
+    for key, base, current, change in rows:
+        flag = "❌" if change > threshold else "✅"
+        print(f"{flag} {key:<28} {base:10.2f} → {current:10.2f} µs ({change:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks with baseline regression check")
+    parser.add_argument('--lengths', type=int, nargs='+', default=list(DEFAULT_LENGTHS),
+                        help="History lengths in bars")
+    parser.add_argument('--filter', help="Only cases whose name contains this, e.g. rsi or [1000]")
+    parser.add_argument('--repeat', type=int, default=15, help="Timing repeats, the best is kept")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if any case regressed past --threshold")
+    parser.add_argument('--threshold', type=float, default=25.0, help="Allowed slowdown in percent")
+    parser.add_argument('--retries', type=int, default=2, help="Re-time cases over the threshold this many times")
+    parser.add_argument('--output', help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"HOT PATHS | lengths {', '.join(map(str, args.lengths))} | best of {args.repeat}")
+    print("=" * 60)
+    cases = {case_key(name, length): (name, length, func) for name, length, func in build_cases(args.lengths)}
+    if args.filter:
+        cases = {key: case for key, case in cases.items() if args.filter in key}
+    results = run_benchmarks(cases, args.repeat)
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        if args.check:
+            print(f"\n❌ No baseline at {args.baseline} | Run with --save-baseline first")
+            return 1
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline)
+    for _ in range(args.retries):
+        suspects = [row[0] for row in rows if row[3] > args.threshold]
+        if not suspects:
+            break
+        print(f"\n🔁 Re-timing {len(suspects)} case(s) over {args.threshold:.0f}%")
+        retime(cases, results, suspects, args.repeat)
+        rows = compare(results, baseline)
+    print_comparison(rows, args.threshold)
+    if baseline.get('python') != report['python'] or baseline.get('pandas') != report['pandas']:
+        print(f"⚠️ Baseline from Python {baseline.get('python')} / pandas {baseline.get('pandas')}, "
+              f"timings may not be comparable")
+
+    regressions = [row for row in rows if row[3] > args.threshold]
+    if args.check and regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0f}%")
+        return 1
+    if args.check:
+        print(f"\n✅ No regressions over {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
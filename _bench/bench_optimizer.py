@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Optimizer throughput benchmark: backtests per second, per-bar cost, peak memory, worker scaling
+
+Runs OptimizedBacktester.backtest_strategy (grid search, array kernel), its reference
+bar-by-bar loop and AdvancedCryptoHFTOptimizer.advanced_backtest (Bayesian search) on
+fixed seeded synthetic 5m datasets, then runs a batch of backtests across worker processes to show how the
+optimizer scales with cores. Baselines are machine-specific: save one on the machine
+that runs --check.
+
+Usage:
+    python _bench/bench_optimizer.py                                  # 1.5k, 15k and 1M bars
+    python _bench/bench_optimizer.py --sizes 1500 15000 --workers 1 2 4 8
+    python _bench/bench_optimizer.py --save-baseline                  # Store as the baseline
+    python _bench/bench_optimizer.py --check --threshold 20           # Exit 1 on regression
+    python _bench/bench_optimizer.py --output optimizer_report.json
+    python _bench/bench_optimizer.py --verify                         # Array kernel vs reference loop
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import subprocess
+import contextlib
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root and the optimizer scripts to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (project_root, os.path.join(project_root, '_optimizer')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from backtrader import HFTOptimizer, OptimizedBacktester
+from anti_over_optimizer_backtest import AdvancedCryptoHFTOptimizer
+
+DEFAULT_BASELINE = os.path.join(project_root, '_bench', 'baselines', 'optimizer.json')
+DEFAULT_SIZES = (1_500, 15_000, 1_000_000)
+
+# One representative point from each search space, chosen so both trade regularly
+GRID_PARAMS = {
+    'rsi_length': 7, 'mfi_length': 7, 'oversold_level': 30, 'overbought_level': 70,
+    'atr_multiplier': 1.2, 'signal_cooldown': 2, 'require_trend': False
+}
+ADVANCED_PARAMS = [7, 7, 25, 75, 1.5, 0.02, 2, True, True]
+
+# The grid_search space, plus a zero cooldown, sampled by --verify
+VERIFY_GRID = {
+    'rsi_length': [5, 7, 9], 'mfi_length': [5, 7, 9], 'oversold_level': [20, 25, 30],
+    'overbought_level': [70, 75, 80], 'atr_multiplier': [1.0, 1.2, 1.5],
+    'signal_cooldown': [0, 1, 2, 3], 'require_trend': [True, False]
+}
+
+BACKENDS = ('backtest_strategy', 'backtest_strategy_loop', 'advanced_backtest')
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def build_dataset(bars):
+    """The grid search generator at any length, with the columns both backtesters read"""
+    data = HFTOptimizer().generate_realistic_data(bars)
+    OptimizedBacktester.add_market_columns(data)
+    AdvancedCryptoHFTOptimizer.add_regime_columns(data)
+    return data
+
+
+def build_runners():
+    """{backend: fn(data) -> metrics}"""
+    backtester = OptimizedBacktester()
+    # The constructor generates and splits its own 15k bars, only its fee model is used here
+    with contextlib.redirect_stdout(None):
+        advanced = AdvancedCryptoHFTOptimizer()
+
+    def kernel(data):
+        # Cold cache, a grid search reuses RSI/MFI across points and runs faster than this
+        backtester.clear_cache()
+        return backtester.backtest_strategy(data, GRID_PARAMS)
+
+    return {
+        'backtest_strategy': kernel,
+        'backtest_strategy_loop': lambda data: backtester.backtest_strategy_loop(data, GRID_PARAMS),
+        'advanced_backtest': lambda data: advanced.advanced_backtest(ADVANCED_PARAMS, data),
+    }
+
+
+def verify_kernel(sizes, points, seed=1):
+    """Sampled grid points where the array kernel's trades or metrics differ from the reference loop"""
+    rng = random.Random(seed)
+    backtester = OptimizedBacktester()
+    mismatches = []
+    for bars in sizes:
+        data = build_dataset(bars)
+        for _ in range(points):
+            params = {key: rng.choice(values) for key, values in VERIFY_GRID.items()}
+            expected = backtester.simulate_loop(data, params)
+            actual = backtester.simulate(data, params)
+            expected_metrics = backtester._calculate_performance(expected) if expected is not None else backtester._empty_metrics()
+            actual_metrics = backtester.backtest_strategy(data, params)
+            if actual != expected:
+                count = len(expected or ())
+                first = next((i for i, (a, b) in enumerate(zip(actual or (), expected or ())) if a != b), None)
+                mismatches.append((bars, params, f"trades differ: {len(actual or ())} vs {count}, first at {first}"))
+            elif actual_metrics != expected_metrics:
+                keys = [k for k in expected_metrics if actual_metrics.get(k) != expected_metrics[k]]
+                mismatches.append((bars, params, f"metrics differ: {', '.join(keys)}"))
+        print(f"   {bars:>9} bars | {points} grid points checked")
+    return mismatches
+
+
+def current_rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux), False where unsupported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss(resettable):
+    if resettable:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    # Peak since process start, includes dataset generation
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def time_backtests(run, data, min_time, min_runs=1):
+    """Per-run seconds, repeating until min_time has elapsed"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < min_runs or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        run(data)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def measure(runners, backend, data, min_time):
+    run = runners[backend]
+    run(data.iloc[:1500])                   # Warm imports and caches outside the timings
+    rss_before = current_rss()
+    resettable = reset_peak_rss()
+    times = time_backtests(run, data, min_time)
+    best = min(times)
+    return {
+        'backend': backend,
+        'bars': len(data),
+        'runs': len(times),
+        'ms_per_backtest': best * 1000,
+        'backtests_per_s': 1 / best,
+        'us_per_bar': best / len(data) * 1e6,
+        'peak_rss_delta_mb': max(0, peak_rss(resettable) - rss_before) / 1024 / 1024,
+        'peak_exact': resettable
+    }
+
+
+# Worker scaling, each process builds its own copy of the dataset like a sharded optimizer would
+
+_worker = {}
+
+
+def _init_worker(bars, backend, barrier):
+    _worker['data'] = build_dataset(bars)
+    _worker['run'] = build_runners()[backend]
+    _worker['barrier'] = barrier
+
+
+def _ready(_):
+    # One call per worker, returns once every worker has built its dataset
+    _worker['barrier'].wait()
+    return os.getpid()
+
+
+def _backtest(_):
+    _worker['run'](_worker['data'])
+    return os.getpid()
+
+
+def measure_scaling(backend, bars, workers, per_worker):
+    rows = []
+    context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    for count in workers:
+        barrier = context.Barrier(count)
+        with context.Pool(count, initializer=_init_worker, initargs=(bars, backend, barrier)) as pool:
+            pool.map(_ready, range(count), chunksize=1)
+            started = time.perf_counter()
+            pool.map(_backtest, range(count * per_worker), chunksize=1)
+            wall = time.perf_counter() - started
+        rows.append({'workers': count, 'backtests': count * per_worker, 'wall_s': wall,
+                     'backtests_per_s': count * per_worker / wall})
+    single = rows[0]['backtests_per_s'] / rows[0]['workers']
+    for row in rows:
+        row['speedup'] = row['backtests_per_s'] / single
+        row['efficiency'] = row['speedup'] / row['workers']
+    return rows
+
+
+def result_key(backend, bars):
+    return f"{backend}[{bars}]"
+
+
+def compare(results, baseline):
+    """[(key, baseline ms, current ms, change %)] for every case present in both"""
+    rows = []
+    for key, current in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base:
+            continue
+        change = (current['ms_per_backtest'] / base['ms_per_backtest'] - 1) * 100
+        rows.append((key, base['ms_per_backtest'], current['ms_per_backtest'], change))
+    return rows
+
+
+def print_results(results):
+    print(f"   {'case':<34} {'backtests/s':>12} {'ms':>10} {'µs/bar':>8} {'peak Δ':>9}  runs")
+    for key, r in results.items():
+        # Exact peak above the pre-run RSS on Linux, otherwise an upper bound
+        peak = f"{r['peak_rss_delta_mb']:.1f}MB" if r['peak_exact'] else f"≤{r['peak_rss_delta_mb']:.0f}MB"
+        print(f"   {key:<34} {r['backtests_per_s']:12.4g} {r['ms_per_backtest']:10.1f} "
+              f"{r['us_per_bar']:8.1f} {peak:>9}  {r['runs']}")
+
+
+def print_scaling(scaling):
+    for backend, info in scaling.items():
+        print(f"\n   {backend} | {info['bars']} bars | {info['cpus']} CPUs")
+        for row in info['rows']:
+            print(f"   {row['workers']:3d} workers {row['backtests_per_s']:10.2f} backtests/s | "
+                  f"x{row['speedup']:.2f} ({row['efficiency'] * 100:.0f}% efficiency)")
+
+
+def print_comparison(rows, threshold):
+    print("=" * 60)
+    print(f"VS BASELINE | regression threshold +{threshold:.0f}%")
+    print("=" * 60)
+    for key, base, current, change in rows:
+        flag = "❌" if change > threshold else "✅"
+        print(f"{flag} {key:<34} {base:10.1f} → {current:10.1f} ms ({change:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizer backtest throughput benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Dataset sizes in bars")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--min-time', type=float, default=3.0,
+                        help="Seconds of backtests per case, at least one run")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="Worker counts for scaling")
+    parser.add_argument('--scaling-size', type=int, default=15_000, help="Dataset size for the scaling run")
+    parser.add_argument('--per-worker', type=int, default=5, help="Backtests per worker in the scaling run")
+    parser.add_argument('--no-scaling', action='store_true', help="Skip the worker scaling run")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if any case regressed past --threshold")
+    parser.add_argument('--threshold', type=float, default=25.0, help="Allowed slowdown in percent")
+    parser.add_argument('--retries', type=int, default=1, help="Re-time cases over the threshold this many times")
+    parser.add_argument('--output', help="Write JSON report to this path")
+    parser.add_argument('--verify', action='store_true', help="Only check the array kernel against the reference loop")
+    parser.add_argument('--verify-sizes', type=int, nargs='+', default=[1_500, 15_000], help="Dataset sizes for --verify")
+    parser.add_argument('--verify-points', type=int, default=25, help="Sampled grid points per size for --verify")
+    args = parser.parse_args()
+
+    if args.verify:
+        print("=" * 60)
+        print("KERNEL EQUIVALENCE | backtest_strategy vs backtest_strategy_loop")
+        print("=" * 60)
+        mismatches = verify_kernel(args.verify_sizes, args.verify_points)
+        for bars, params, detail in mismatches:
+            print(f"❌ {bars} bars | {detail} | {params}")
+        if mismatches:
+            print(f"\n❌ {len(mismatches)} mismatching grid point(s)")
+            return 1
+        print("\n✅ Identical trades and metrics")
+        return 0
+
+    print("=" * 60)
+    print(f"OPTIMIZER THROUGHPUT | {', '.join(map(str, args.sizes))} bars | {', '.join(args.backends)}")
+    print("=" * 60)
+    runners = build_runners()
+    datasets = {}
+    results = {}
+    for bars in args.sizes:
+        datasets[bars] = build_dataset(bars)
+        for backend in args.backends:
+            key = result_key(backend, bars)
+            results[key] = measure(runners, backend, datasets[bars], args.min_time)
+            print(f"   {key:<34} {results[key]['backtests_per_s']:10.4g} backtests/s")
+    print()
+    print_results(results)
+
+    scaling = {}
+    if not args.no_scaling:
+        datasets.clear()                    # Workers build their own copies
+        for backend in args.backends:
+            scaling[backend] = {
+                'bars': args.scaling_size,
+                'cpus': os.cpu_count(),
+                'rows': measure_scaling(backend, args.scaling_size, args.workers, args.per_worker)
+            }
+        print_scaling(scaling)
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': {'backtest_strategy': GRID_PARAMS, 'advanced_backtest': ADVANCED_PARAMS},
+        'results': results,
+        'scaling': scaling
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        if args.check:
+            print(f"\n❌ No baseline at {args.baseline} | Run with --save-baseline first")
+            return 1
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline)
+    for _ in range(args.retries):
+        suspects = [row[0] for row in rows if row[3] > args.threshold]
+        if not suspects:
+            break
+        print(f"\n🔁 Re-timing {len(suspects)} case(s) over {args.threshold:.0f}%")
+        for key in suspects:
+            backend, bars = results[key]['backend'], results[key]['bars']
+            retry = measure(runners, backend, build_dataset(bars), args.min_time)
+            if retry['ms_per_backtest'] < results[key]['ms_per_backtest']:
+                results[key] = retry
+        rows = compare(results, baseline)
+    print()
+    print_comparison(rows, args.threshold)
+    if baseline.get('python') != report['python'] or baseline.get('pandas') != report['pandas']:
+        print(f"⚠️ Baseline from Python {baseline.get('python')} / pandas {baseline.get('pandas')}, "
+              f"timings may not be comparable")
+
+    regressions = [row for row in rows if row[3] > args.threshold]
+    if args.check and regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0f}%")
+        return 1
+    if args.check:
+        print(f"\n✅ No regressions over {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for TradeEngine.run against the offline SimExchange
+
+Usage:
+    python _bench/load_test.py --engines 10 --duration 60                 # 10 symbols, synthetic candles
+    python _bench/load_test.py --engines 20 --speed 300 --latency-ms 30   # Faster market, slow API
+    python _bench/load_test.py --candles data/BNBUSDT_5m.csv --engines 5  # Replay recorded candles
+    python _bench/load_test.py --engines 50 --output load_report.json     # Machine-readable report
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import subprocess
+import contextlib
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.trade_engine import TradeEngine
+from core.sim_exchange import SimExchange
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values) if values else 0.0
+    }
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return 0.0
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def build_engine(sim, index):
+    """One TradeEngine per simulated symbol, sharing the simulator"""
+    engine = TradeEngine(exchange=sim)
+    symbol = f"SIM{index:03d}/USDT"
+    engine.risk_manager.symbol = symbol
+    engine.risk_manager.linear = symbol.replace('/', '')
+    engine.symbol = engine.risk_manager.symbol
+    engine.linear = engine.risk_manager.linear
+    engine.notifier.enabled = False
+    return engine
+
+
+def instrument_cycles(engine, samples, budget):
+    """Wrap run_cycle on the instance to record latency and overruns"""
+    original = engine.run_cycle
+    stats = {'cycles': 0, 'overruns': 0, 'latencies': samples}
+
+    async def timed_cycle():
+        started = time.perf_counter()
+        await original()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        stats['cycles'] += 1
+        if elapsed > budget:
+            stats['overruns'] += 1
+
+    engine.run_cycle = timed_cycle
+    return stats
+
+
+async def measure_loop_lag(samples, interval, stop_event):
+    """Sleep probe: how late the loop wakes us up is the event-loop lag"""
+    loop = asyncio.get_running_loop()
+    while not stop_event.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_load_test(args):
+    candles = {}
+    if args.candles:
+        recorded = SimExchange.load_candles(args.candles)
+        candles = {f"SIM{i:03d}USDT": recorded for i in range(args.engines)}
+
+    sim = SimExchange(
+        speed=args.speed,
+        ticks_per_bar=args.ticks_per_bar,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.latency_jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+        candles=candles,
+        seed=args.seed
+    )
+
+    cycle_samples, lag_samples = [], []
+    engines, engine_stats = [], []
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(args.engines):
+            engine = build_engine(sim, i)
+            if not engine.connect():
+                raise RuntimeError(f"Engine {i} failed to connect to simulator")
+            engines.append(engine)
+            engine_stats.append(instrument_cycles(engine, cycle_samples, args.cycle_budget))
+
+        stop_event = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(lag_samples, args.lag_interval, stop_event))
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        rss_start = current_rss_mb()
+
+        run_tasks = [asyncio.create_task(engine.run()) for engine in engines]
+        await asyncio.sleep(args.duration)
+
+        for engine in engines:
+            engine.running = False
+        await asyncio.gather(*run_tasks, return_exceptions=True)
+        stop_event.set()
+        await lag_task
+
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        for engine in engines:
+            await engine.stop()
+
+    # Each engine should complete roughly one cycle per budget window
+    expected_per_engine = int(wall / args.cycle_budget)
+    missed = sum(max(0, expected_per_engine - s['cycles']) for s in engine_stats)
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'engines': args.engines,
+            'duration_s': args.duration,
+            'speed': args.speed,
+            'ticks_per_bar': args.ticks_per_bar,
+            'latency_ms': args.latency_ms,
+            'latency_jitter_ms': args.latency_jitter_ms,
+            'failure_rate': args.failure_rate,
+            'cycle_budget_s': args.cycle_budget,
+            'candles': args.candles or 'synthetic'
+        },
+        'cycle_latency_s': summarize(cycle_samples),
+        'event_loop_lag_s': summarize(lag_samples),
+        'cycles': {
+            'total': sum(s['cycles'] for s in engine_stats),
+            'expected': expected_per_engine * args.engines,
+            'missed': missed,
+            'overruns': sum(s['overruns'] for s in engine_stats),
+            'per_engine_min': min((s['cycles'] for s in engine_stats), default=0)
+        },
+        'cpu': {
+            'seconds': cpu,
+            'utilization_pct': cpu / wall * 100 if wall else 0.0
+        },
+        'memory': {
+            'rss_start_mb': rss_start,
+            'rss_end_mb': current_rss_mb(),
+            'peak_rss_mb': peak_rss_mb()
+        },
+        'exchange_calls': dict(sim.call_counts),
+        'wall_s': wall
+    }
+
+
+def print_report(report):
+    c, lag, cyc = report['cycle_latency_s'], report['event_loop_lag_s'], report['cycles']
+    print("=" * 60)
+    print(f"LOAD TEST | {report['config']['engines']} engines | {report['wall_s']:.1f}s")
+    print("=" * 60)
+    print(f"Cycle latency   p50 {c['p50']*1000:8.1f}ms | p95 {c['p95']*1000:8.1f}ms | "
+          f"p99 {c['p99']*1000:8.1f}ms | max {c['max']*1000:8.1f}ms")
+    print(f"Event-loop lag  p50 {lag['p50']*1000:8.1f}ms | p99 {lag['p99']*1000:8.1f}ms | "
+          f"max {lag['max']*1000:8.1f}ms")
+    print(f"Cycles          {cyc['total']} done | {cyc['expected']} expected | "
+          f"{cyc['missed']} missed | {cyc['overruns']} over budget")
+    print(f"CPU             {report['cpu']['utilization_pct']:.1f}% | "
+          f"RSS {report['memory']['rss_end_mb']:.1f}MB (peak {report['memory']['peak_rss_mb']:.1f}MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TradeEngine load test against SimExchange")
+    parser.add_argument('--engines', type=int, default=10, help="Number of engines/symbols")
+    parser.add_argument('--duration', type=float, default=30, help="Test duration in seconds")
+    parser.add_argument('--speed', type=float, default=60, help="Simulated market speed multiplier")
+    parser.add_argument('--ticks-per-bar', type=int, default=60, help="Simulated ticks per candle")
+    parser.add_argument('--candles', help="CSV of recorded OHLCV candles to replay")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Injected API latency")
+    parser.add_argument('--latency-jitter-ms', type=float, default=0, help="Injected API latency jitter")
+    parser.add_argument('--failure-rate', type=float, default=0, help="Injected API failure probability")
+    parser.add_argument('--cycle-budget', type=float, default=1.0, help="Cycle budget in seconds")
+    parser.add_argument('--lag-interval', type=float, default=0.05, help="Loop lag probe interval")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
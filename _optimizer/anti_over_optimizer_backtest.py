@@ -1,15 +1,18 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from skopt import gp_minimize
-from skopt.space import Integer, Real, Categorical
-from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.gaussian_process.kernels import Matern
 import json
 import warnings
 import os
+import sys
 warnings.filterwarnings('ignore')
 
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from core.profiler import CycleProfiler
+
 class AdvancedCryptoHFTOptimizer:
     def __init__(self, h5_path=None, symbol="ZORAUSDT", timeframe="5m", initial_balance=10000):
         self.h5_path = h5_path
@@ -135,7 +138,7 @@ class AdvancedCryptoHFTOptimizer:
         
         # Generate volume with correlation to volatility
         base_volume = 1000000
-        volume_mult = 1 + np.array(volatilities[1:]) * 10  # Higher vol = higher volume
+        volume_mult = 1 + np.array(volatilities) * 10  # Higher vol = higher volume
         volumes = np.random.lognormal(np.log(base_volume), 0.5) * volume_mult
         
         df = pd.DataFrame({
@@ -144,28 +147,34 @@ class AdvancedCryptoHFTOptimizer:
             'low': lows,
             'close': closes,
             'volume': volumes
-        }, index=timestamps[1:])  # Align with closes
+        }, index=timestamps)  # One timestamp per open/close pair
         
         print(f"Generated {len(df)} realistic crypto candles")
         return df
     
     def prepare_data(self):
         """Prepare data with market regime detection and splits"""
+        self.add_regime_columns(self.data)
+        
+        # Walk-forward splits for HFT
+        self.create_walk_forward_splits()
+    
+    @staticmethod
+    def add_regime_columns(data):
+        """Regime, volatility and session columns advanced_backtest reads, added in place"""
         # Market regime indicators
-        self.data['sma_200'] = self.data['close'].rolling(200, min_periods=50).mean()
-        self.data['bull_market'] = self.data['close'] > self.data['sma_200']
+        data['sma_200'] = data['close'].rolling(200, min_periods=50).mean()
+        data['bull_market'] = data['close'] > data['sma_200']
         
         # Volatility measure
-        self.data['volatility'] = self.data['close'].pct_change().rolling(20).std()
+        data['volatility'] = data['close'].pct_change().rolling(20).std()
         
         # Time-based features
-        if hasattr(self.data.index, 'hour'):
-            self.data['hour'] = self.data.index.hour
+        if hasattr(data.index, 'hour'):
+            data['hour'] = data.index.hour
             # Active trading hours (higher volume/volatility)
-            self.data['active_hours'] = self.data['hour'].isin([8, 9, 10, 14, 15, 16, 20, 21, 22])
-        
-        # Walk-forward splits for HFT
-        self.create_walk_forward_splits()
+            data['active_hours'] = data['hour'].isin([8, 9, 10, 14, 15, 16, 20, 21, 22])
+        return data
         
     def create_walk_forward_splits(self):
         """Create walk-forward validation splits optimized for HFT"""
@@ -264,8 +273,8 @@ class AdvancedCryptoHFTOptimizer:
             overbought_adj = np.where(data['bull_market'], 
                                      overbought_level + 5, overbought_level - 5)
         else:
-            oversold_adj = oversold_level
-            overbought_adj = overbought_level
+            oversold_adj = np.full(len(data), oversold_level)
+            overbought_adj = np.full(len(data), overbought_level)
         
         # Trading simulation
         position = 0
@@ -354,7 +363,7 @@ class AdvancedCryptoHFTOptimizer:
                     continue
                 
                 # Signal-based exit
-                if (rsi.iloc[i] > overbought_adj or mfi.iloc[i] > overbought_adj):
+                if (rsi.iloc[i] > overbought_adj[i] or mfi.iloc[i] > overbought_adj[i]):
                     exit_price = current_price * (1 - self.slippage - self.taker_fee)
                     balance = position * exit_price
                     
@@ -375,8 +384,8 @@ class AdvancedCryptoHFTOptimizer:
             # Entry logic
             elif position == 0 and (i - last_trade_idx) >= cooldown_periods:
                 # Check for buy signals
-                rsi_signal = rsi.iloc[i] < oversold_adj
-                mfi_signal = mfi.iloc[i] < oversold_adj
+                rsi_signal = rsi.iloc[i] < oversold_adj[i]
+                mfi_signal = mfi.iloc[i] < oversold_adj[i]
                 
                 # Trend filter
                 if trend_filter:
@@ -541,6 +550,9 @@ class AdvancedCryptoHFTOptimizer:
     
     def optimize_hft_parameters(self, n_calls=100):
         """Advanced HFT parameter optimization with proper bounds"""
+        # Imported here so the backtester loads without scikit-optimize (benchmarks, replays)
+        from skopt import gp_minimize
+        from skopt.space import Integer, Real, Categorical
         
         # HFT-optimized parameter space
         space = [
@@ -564,9 +576,16 @@ class AdvancedCryptoHFTOptimizer:
         self.call_count = 0
         self.best_results = []
         
+        # PROFILE_CYCLES=N profiles the first N objective calls, SIGUSR1 the next N
+        objective = self.objective_function
+        profiler = CycleProfiler.from_env(parent_dir, label='objective')
+        if profiler:
+            profiler.install_signal()
+            objective = profiler.wrap(objective)
+        
         # Run Bayesian optimization
         result = gp_minimize(
-            func=self.objective_function,
+            func=objective,
             dimensions=space,
             n_calls=n_calls,
             n_initial_points=min(20, n_calls//3),
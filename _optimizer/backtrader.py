@@ -5,7 +5,6 @@ import os
 import json
 import numpy as np
 import pandas as pd
-from binance.client import Client
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -14,6 +13,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
+from core.profiler import CycleProfiler
+
 try:
     from strategies.RSI_MFI_Cloud import RSIMFICloudStrategy
 except ImportError:
@@ -93,12 +94,183 @@ class HFTOptimizer:
         }, index=dates)
 
 class OptimizedBacktester:
+    FEE_RATE = 0.001            # 0.1% per trade (realistic for spot)
+    TIME_LIMIT_S = 7200         # Max 2 hours in a position for HFT
+    
     def __init__(self):
-        pass
-        
+        self._strategy = None
+        self._frames = {}       # id(df) -> (df, per-frame arrays), frames are not modified between calls
+        self._indicators = {}   # (id(df), name, length) -> (df, values list)
+        
+    @staticmethod
+    def add_market_columns(df):
+        """ATR(14) for stops and a 50 bar EMA trend, added in place unless already present"""
+        if 'atr' not in df.columns:
+            prev_close = df['close'].shift(1)
+            true_range = pd.concat([df['high'] - df['low'],
+                                    (df['high'] - prev_close).abs(),
+                                    (df['low'] - prev_close).abs()], axis=1).max(axis=1)
+            df['atr'] = true_range.ewm(span=14, adjust=False).mean()
+        if 'trend' not in df.columns:
+            ema = df['close'].ewm(span=50, adjust=False).mean()
+            df['trend'] = np.where(df['close'] > ema, 'UP', 'DOWN')
+        return df
+    
     def backtest_strategy(self, df, params):
-        """Realistic backtest with proper HFT logic"""
-        strategy = RSIMFICloudStrategy()
+        """Array kernel, the same trades and metrics as backtest_strategy_loop at a fraction of the cost
+        
+        Entries are found with vectorized masks and a search over candidate bars, only the bars
+        of an open position are stepped through. RSI and MFI series are cached per frame and
+        length, so grid points that differ only in levels, stops or cooldown reuse them.
+        """
+        trades = self.simulate(df, params)
+        if trades is None:
+            return self._empty_metrics()
+        return self._performance_from_arrays(
+            np.array([t['pnl_pct'] for t in trades], dtype=float),
+            np.array([t['duration_minutes'] for t in trades], dtype=float))
+    
+    def clear_cache(self):
+        self._frames.clear()
+        self._indicators.clear()
+    
+    def _frame_arrays(self, df):
+        cached = self._frames.get(id(df))
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        if len(self._frames) >= 16:
+            self.clear_cache()
+        
+        frame = df if {'atr', 'trend'} <= set(df.columns) else self.add_market_columns(df[['high', 'low', 'close']].copy())
+        trend = frame['trend'].to_numpy()
+        arrays = {
+            'close': frame['close'].to_numpy(dtype=float).tolist(),
+            'atr': frame['atr'].to_numpy(dtype=float).tolist(),
+            'up': trend == 'UP',
+            'down': trend == 'DOWN',
+            # Integer times keep (exit - entry).total_seconds() exact without Timestamp objects
+            'ns': df.index.as_unit('ns').asi8.tolist(),
+        }
+        self._frames[id(df)] = (df, arrays)
+        return arrays
+    
+    def _indicator(self, df, name, length):
+        key = (id(df), name, length)
+        cached = self._indicators.get(key)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        if len(self._indicators) >= 256:
+            self._indicators.clear()
+        
+        if self._strategy is None:
+            self._strategy = RSIMFICloudStrategy(None)
+        strategy = self._strategy
+        strategy.params[f'{name}_length'] = length
+        if name == 'rsi':
+            series = strategy.calculate_rsi(df['close'])
+        else:
+            series = strategy.calculate_mfi(df['high'], df['low'], df['close'])
+        values = series.to_numpy(dtype=float)
+        self._indicators[key] = (df, values)
+        return values
+    
+    def simulate(self, df, params):
+        """Trades of simulate_loop, stepping only through bars with a position open"""
+        if len(df) < 100:
+            return None
+        frame = self._frame_arrays(df)
+        rsi = self._indicator(df, 'rsi', params['rsi_length'])
+        mfi = self._indicator(df, 'mfi', params['mfi_length'])
+        
+        oversold = params['oversold_level']
+        overbought = params['overbought_level']
+        cooldown = params.get('signal_cooldown', 2)
+        atr_multiplier = params.get('atr_multiplier', 1.2)
+        fee_rate = self.FEE_RATE
+        limit_ns = self.TIME_LIMIT_S * 1_000_000_000
+        
+        # Entry masks, NaN compares False just as the loop skips NaN bars
+        long_entry = (rsi < oversold) & (mfi < oversold)
+        short_entry = ~long_entry & (rsi > overbought) & (mfi > overbought)
+        if params.get('require_trend', True):
+            long_entry &= frame['up']
+            short_entry &= frame['down']
+        candidates = np.flatnonzero(long_entry | short_entry)
+        
+        rsi_l, mfi_l = rsi.tolist(), mfi.tolist()
+        close, atr, ns = frame['close'], frame['atr'], frame['ns']
+        index = df.index
+        n = len(close)
+        step = max(cooldown, 1)     # Bars after a signal before the next one is considered
+        
+        trades = []
+        next_bar = max(50, -999 + cooldown)
+        while True:
+            k = int(np.searchsorted(candidates, next_bar))
+            if k == len(candidates):
+                break
+            entry = int(candidates[k])
+            position = 1 if long_entry[entry] else -1
+            price = close[entry]
+            entry_price = price * (1 + fee_rate) if position == 1 else price * (1 - fee_rate)
+            
+            i = entry + step
+            exit_reason = None
+            while i < n:
+                r = rsi_l[i]
+                if r != r or mfi_l[i] != mfi_l[i]:
+                    i += 1
+                    continue
+                price = close[i]
+                if position == 1 and r > overbought:
+                    exit_reason = "RSI_OVERBOUGHT"
+                elif position == -1 and r < oversold:
+                    exit_reason = "RSI_OVERSOLD"
+                elif ns[i] - ns[entry] > limit_ns:
+                    exit_reason = "TIME_LIMIT"
+                
+                a = atr[i]
+                if a == a and a > 0:
+                    stop_distance = a * atr_multiplier
+                    if position == 1 and price <= entry_price - stop_distance:
+                        exit_reason = "STOP_LOSS"
+                    elif position == -1 and price >= entry_price + stop_distance:
+                        exit_reason = "STOP_LOSS"
+                if exit_reason:
+                    break
+                i += 1
+            
+            if exit_reason is None:
+                break               # Still open at the end of the data, not counted
+            
+            exit_price = price * (1 - fee_rate * position)
+            if position == 1:
+                pnl_pct = (exit_price - entry_price) / entry_price
+            else:
+                pnl_pct = (entry_price - exit_price) / entry_price
+            trades.append({
+                'entry_time': index[entry],
+                'exit_time': index[i],
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'position': position,
+                'pnl_pct': pnl_pct,
+                'duration_minutes': (ns[i] - ns[entry]) / 1_000_000_000 / 60,
+                'exit_reason': exit_reason
+            })
+            next_bar = i + step
+        return trades
+    
+    def backtest_strategy_loop(self, df, params):
+        """Reference bar-by-bar backtest, kept to check the array kernel against"""
+        trades = self.simulate_loop(df, params)
+        if trades is None:
+            return self._empty_metrics()
+        return self._calculate_performance(trades)
+    
+    def simulate_loop(self, df, params):
+        """Trades of the bar-by-bar backtest, None when there are too few bars"""
+        strategy = RSIMFICloudStrategy(None)  # No risk manager, the symbol is not used offline
         
         # Update strategy params
         for key, value in params.items():
@@ -108,10 +280,10 @@ class OptimizedBacktester:
         strategy.signal_cooldown_period = params.get('signal_cooldown', 2)
         
         # Calculate indicators
-        df = strategy.calculate_indicators(df)
+        df = self.add_market_columns(strategy.calculate_indicators(df))
         
         if len(df) < 100:
-            return self._empty_metrics()
+            return None
         
         # Trading simulation
         balance = 1000
@@ -121,7 +293,7 @@ class OptimizedBacktester:
         entry_time = None
         last_signal_bar = -999
         
-        fee_rate = 0.001  # 0.1% per trade (realistic for spot)
+        fee_rate = self.FEE_RATE
         
         for i in range(50, len(df)):  # Skip first 50 bars
             row = df.iloc[i]
@@ -175,7 +347,7 @@ class OptimizedBacktester:
                     exit_reason = "RSI_OVERSOLD"
                 
                 # Time-based exit (max 2 hours for HFT)
-                elif (current_time - entry_time).total_seconds() > 7200:
+                elif (current_time - entry_time).total_seconds() > self.TIME_LIMIT_S:
                     exit_signal = True
                     exit_reason = "TIME_LIMIT"
                 
@@ -216,7 +388,7 @@ class OptimizedBacktester:
                     position = 0
                     last_signal_bar = i
         
-        return self._calculate_performance(trades)
+        return trades
     
     def _empty_metrics(self):
         return {
@@ -230,6 +402,43 @@ class OptimizedBacktester:
             'calmar_ratio': 0
         }
     
+    def _performance_from_arrays(self, pnl, durations):
+        """_calculate_performance on plain arrays, the same reductions without a DataFrame"""
+        num_trades = len(pnl)
+        if not num_trades:
+            return self._empty_metrics()
+        
+        total_return = pnl.sum()
+        win_rate = (pnl > 0).mean()
+        avg_duration = durations.mean()
+        
+        wins = pnl[pnl > 0].sum()
+        losses = abs(pnl[pnl < 0].sum())
+        profit_factor = wins / losses if losses > 0 else 2.0
+        
+        if num_trades > 1:
+            std = pnl.std(ddof=1)
+            sharpe = pnl.mean() / std * np.sqrt(252 * 288) if std > 0 else 0
+        else:
+            sharpe = 0
+        
+        cumulative = np.cumprod(1 + pnl)
+        running_max = np.maximum.accumulate(cumulative)
+        max_drawdown = ((cumulative - running_max) / running_max).min()
+        
+        calmar = total_return / abs(max_drawdown) if max_drawdown < 0 else total_return
+        
+        return {
+            'total_return': total_return,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': max_drawdown,
+            'win_rate': win_rate,
+            'profit_factor': profit_factor,
+            'num_trades': num_trades,
+            'avg_duration': avg_duration,
+            'calmar_ratio': calmar
+        }
+    
     def _calculate_performance(self, trades):
         if not trades:
             return self._empty_metrics()
@@ -281,9 +490,16 @@ def grid_search_optimization():
     optimizer = HFTOptimizer()
     backtester = OptimizedBacktester()
     
+    # PROFILE_CYCLES=N profiles the first N backtests, SIGUSR1 the next N
+    profiler = CycleProfiler.from_env(parent_dir, label='backtest')
+    backtest = backtester.backtest_strategy
+    if profiler:
+        profiler.install_signal()
+        backtest = profiler.wrap(backtest)
+    
     # Generate realistic data
     print("Generating realistic 5m ZORA data...")
-    data = optimizer.generate_realistic_data(1500)
+    data = backtester.add_market_columns(optimizer.generate_realistic_data(1500))
     print(f"Data shape: {data.shape}")
     
     # Proper HFT parameter grid based on research
@@ -312,6 +528,10 @@ def grid_search_optimization():
     print(f"Testing {total_combinations} parameter combinations...")
     count = 0
     
+    # Walk-forward windows, sliced once so the backtester's indicator cache is hit across grid points
+    train_data = data.iloc[:1000]  # First 1000 bars for training
+    test_data = data.iloc[1000:1300]  # Next 300 for testing
+    
     for rsi_len in param_grid['rsi_length']:
         for mfi_len in param_grid['mfi_length']:
             for oversold in param_grid['oversold_level']:
@@ -335,18 +555,14 @@ def grid_search_optimization():
                                 }
                                 
                                 try:
-                                    # Walk-forward test
-                                    train_data = data.iloc[:1000]  # First 1000 bars for training
-                                    test_data = data.iloc[1000:1300]  # Next 300 for testing
-                                    
                                     # Quick train validation
-                                    train_metrics = backtester.backtest_strategy(train_data, params)
+                                    train_metrics = backtest(train_data, params)
                                     
                                     if train_metrics['num_trades'] < 5:
                                         continue
                                     
                                     # Test on unseen data
-                                    test_metrics = backtester.backtest_strategy(test_data, params)
+                                    test_metrics = backtest(test_data, params)
                                     
                                     # Combined score favoring consistency
                                     score = (
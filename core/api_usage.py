@@ -0,0 +1,275 @@
+import os
+import time
+import threading
+from collections import deque
+
+from core import metrics
+from core.latency import LatencyHistogram
+
+# Bybit v5 limits as (requests, window seconds). Method limits are per UID, '*' is the
+# per-IP limit on every REST call. Override or extend with API_LIMITS="place_order=10/1,*=600/5"
+DEFAULT_LIMITS = {
+    '*': (600, 5.0),
+    'place_order': (10, 1.0),
+    'place_batch_order': (10, 1.0),
+    'amend_order': (10, 1.0),
+    'cancel_order': (10, 1.0),
+    'cancel_all_orders': (10, 1.0),
+    'set_trading_stop': (10, 1.0),
+    'get_positions': (50, 1.0),
+    'get_open_orders': (50, 1.0),
+    'get_order_history': (50, 1.0),
+    'get_wallet_balance': (50, 1.0),
+}
+
+def parse_limits(spec):
+    """'place_order=10/1,*=600/5' -> {'place_order': (10, 1.0), '*': (600, 5.0)}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rate = item.partition('=')
+        requests, _, window = rate.partition('/')
+        limits[name.strip()] = (int(requests), float(window or 1))
+    return limits
+
+def _fmt_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024 or unit == 'MB':
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+
+class _Endpoint:
+    __slots__ = ('calls', 'errors', 'bytes_out', 'bytes_in', 'latency', 'recent', 'reported')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}                # retCode (or exception name) -> count
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency = LatencyHistogram()
+        self.recent = deque()           # monotonic call times inside the rate window
+        self.reported = None            # (limit, remaining, time) from X-Bapi-Limit headers
+
+class _Limit:
+    __slots__ = ('requests', 'window', 'horizon', 'calls', 'highs', 'peak', 'recent_peak')
+
+    def __init__(self, requests, window, horizon=300.0):
+        self.requests = requests
+        self.window = window
+        self.horizon = horizon          # Seconds the rolling peak looks back
+        self.calls = deque()            # monotonic call times inside the window
+        self.highs = deque()            # (time, used) with decreasing used, head is the rolling peak
+        self.peak = 0                   # Most calls seen inside one window since start
+        self.recent_peak = 0            # Same, since the last headroom warning check
+
+    def add(self, now):
+        self.calls.append(now)
+        self.prune(now)
+        used = len(self.calls)
+        self.peak = max(self.peak, used)
+        self.recent_peak = max(self.recent_peak, used)
+        # Sliding maximum: a newer, fuller window makes every older, emptier one irrelevant
+        while self.highs and self.highs[-1][1] <= used:
+            self.highs.pop()
+        self.highs.append((now, used))
+
+    def rolling_peak(self, now):
+        """Most calls seen inside one window during the last `horizon` seconds"""
+        while self.highs and now - self.highs[0][0] > self.horizon:
+            self.highs.popleft()
+        return self.highs[0][1] if self.highs else 0
+
+    def prune(self, now):
+        while self.calls and now - self.calls[0] > self.window:
+            self.calls.popleft()
+
+class ApiUsage:
+    """Per-endpoint exchange call accounting with rolling headroom against rate limits
+
+    Counts calls, latency, payload bytes and error codes per API method, keeps calls/min over a
+    rolling window and tracks how full each configured rate-limit window gets. Headroom is
+    1 - peak usage over the last `horizon` seconds, per API key (UID limits) and for this
+    process's share of the IP limit.
+    On pybit sessions the X-Bapi-Limit-Status header adds the exchange's own remaining count.
+    """
+
+    def __init__(self, label, limits=None, window=60.0, report_interval=300.0, warn_below=0.2, horizon=300.0):
+        self.label = label
+        self.window = window                    # Seconds of history behind calls/min
+        self.report_interval = report_interval  # Seconds between periodic reports, 0 = never
+        self.warn_below = warn_below            # Warn when headroom drops under this fraction
+        self.horizon = horizon                  # Seconds of history behind the rolling headroom
+        self.endpoints = {}
+        self.limits = {name: _Limit(*rate, horizon=horizon) for name, rate in (limits or DEFAULT_LIMITS).items()}
+        self.started = time.monotonic()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_report = time.monotonic()
+        self._last_warning = 0.0
+        self._attached = False
+
+    @classmethod
+    def from_env(cls, label):
+        """None when API_ACCOUNTING=false"""
+        if os.getenv('API_ACCOUNTING', 'true').lower() != 'true':
+            return None
+        limits = dict(DEFAULT_LIMITS)
+        limits.update(parse_limits(os.getenv('API_LIMITS', '')))
+        return cls(
+            label,
+            limits=limits,
+            report_interval=float(os.getenv('API_REPORT_INTERVAL', '300')),
+            warn_below=float(os.getenv('API_HEADROOM_WARN', '0.2')),
+            horizon=float(os.getenv('API_HEADROOM_HORIZON', '300'))
+        )
+
+    def attach(self, exchange):
+        """Hook the exchange's HTTP session for bytes and limit headers, and export metrics once"""
+        session = getattr(exchange, 'client', None)
+        hooks = getattr(session, 'hooks', None)
+        if isinstance(hooks, dict) and self._on_response not in hooks.setdefault('response', []):
+            hooks['response'].append(self._on_response)
+        if not self._attached:
+            self._attached = True
+            metrics.API_HEADROOM.callbacks.append(
+                lambda: {(self.label, scope): h['headroom'] for scope, h in self.headroom().items()})
+
+    # Recording, called from whichever thread made the call
+
+    def _on_response(self, response, *args, **kwargs):
+        """requests response hook, runs in the calling thread before the InstrumentedExchange wrapper returns"""
+        request = response.request
+        body = request.body or b''
+        sent = len(request.path_url) + len(body)
+        length = response.headers.get('Content-Length')
+        received = int(length) if length and length.isdigit() else len(response.content)
+        limit = response.headers.get('X-Bapi-Limit')
+        remaining = response.headers.get('X-Bapi-Limit-Status')
+        reported = (int(limit), int(remaining)) if limit and remaining and limit.isdigit() and remaining.isdigit() else None
+
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = []
+        pending.append((sent, received, reported))
+
+    def record(self, name, seconds, code=None):
+        now = time.monotonic()
+        pending = getattr(self._local, 'pending', None)
+        self._local.pending = None
+
+        with self._lock:
+            endpoint = self.endpoints.get(name)
+            if endpoint is None:
+                endpoint = self.endpoints[name] = _Endpoint()
+            endpoint.calls += 1
+            endpoint.latency.record(seconds * 1_000_000)
+            endpoint.recent.append(now)
+            while now - endpoint.recent[0] > self.window:
+                endpoint.recent.popleft()
+            if code is not None:
+                endpoint.errors[str(code)] = endpoint.errors.get(str(code), 0) + 1
+
+            # pybit retries inside one call, every HTTP attempt counts against the limits
+            attempts = len(pending) if pending else 1
+            for _ in range(attempts):
+                for scope in ('*', name):
+                    limit = self.limits.get(scope)
+                    if limit:
+                        limit.add(now)
+
+            for sent, received, reported in pending or ():
+                endpoint.bytes_out += sent
+                endpoint.bytes_in += received
+                metrics.API_BYTES.inc(name, 'sent', amount=sent)
+                metrics.API_BYTES.inc(name, 'received', amount=received)
+                if reported:
+                    endpoint.reported = (*reported, now)
+
+    # Reading
+
+    def headroom(self):
+        """{scope: {'used', 'peak', 'max', 'limit', 'window', 'headroom'}}, headroom from the busiest
+        window in the last `horizon` seconds, so an old burst stops counting once it ages out"""
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for scope, limit in self.limits.items():
+                if not limit.peak:
+                    continue
+                limit.prune(now)
+                peak = limit.rolling_peak(now)
+                result[scope] = {
+                    'used': len(limit.calls),
+                    'peak': peak,
+                    'max': limit.peak,
+                    'limit': limit.requests,
+                    'window': limit.window,
+                    'headroom': max(0.0, 1 - peak / limit.requests)
+                }
+        return result
+
+    def snapshot(self):
+        """{method: summary} with calls/min over the rolling window"""
+        now = time.monotonic()
+        span = min(self.window, max(now - self.started, 1e-9))
+        result = {}
+        with self._lock:
+            for name, e in sorted(self.endpoints.items()):
+                while e.recent and now - e.recent[0] > self.window:
+                    e.recent.popleft()
+                s = e.latency.summary()
+                result[name] = {
+                    'calls': e.calls,
+                    'per_min': len(e.recent) * 60 / span,
+                    'bytes_out': e.bytes_out,
+                    'bytes_in': e.bytes_in,
+                    'p50_ms': s['p50_ms'],
+                    'p99_ms': s['p99_ms'],
+                    'errors': dict(e.errors),
+                    'reported': e.reported[:2] if e.reported else None
+                }
+        return result
+
+    def report(self, title="API Usage"):
+        endpoints = self.snapshot()
+        headroom = self.headroom()
+        total = sum(e['calls'] for e in endpoints.values())
+        per_min = sum(e['per_min'] for e in endpoints.values())
+        uptime = max(time.monotonic() - self.started, 1e-9)
+        lines = [f"📡 {title} | {self.label} | {total} calls, {total * 60 / uptime:.1f}/min average, "
+                 f"{per_min:.1f}/min last {self.window:.0f}s"]
+        lines.append(f"   {'method':<22} {'calls':>7} {'/min':>7} {'sent':>8} {'recv':>8} {'p50':>7} {'p99':>7}  errors (retCode×n)")
+        for name, e in endpoints.items():
+            errors = ", ".join(f"{code}×{n}" for code, n in sorted(e['errors'].items())) or "-"
+            # Bytes come from the HTTP session hook, the simulator has none
+            sent, received = (_fmt_bytes(e['bytes_out']), _fmt_bytes(e['bytes_in'])) if e['bytes_in'] else ('-', '-')
+            lines.append(f"   {name:<22} {e['calls']:7d} {e['per_min']:7.1f} {sent:>8} {received:>8} "
+                         f"{e['p50_ms']:7.1f} {e['p99_ms']:7.1f}  {errors}")
+        for scope, h in sorted(headroom.items(), key=lambda kv: kv[1]['headroom']):
+            name = 'IP (this process)' if scope == '*' else scope
+            reported = endpoints.get(scope, {}).get('reported')
+            exchange = f" | exchange reports {reported[1]}/{reported[0]} left" if reported else ""
+            lines.append(f"   ⛽ {name:<22} peak {h['peak']}/{h['limit']} per {h['window']:g}s "
+                         f"(last {self.horizon:.0f}s, {h['max']} since start) | now {h['used']} | "
+                         f"{h['headroom'] * 100:.0f}% headroom{exchange}")
+        return "\n".join(lines)
+
+    def maybe_report(self):
+        """Warn on low headroom and print the periodic report, call once per cycle"""
+        now = time.monotonic()
+        if self.warn_below and now - self._last_warning >= 60:
+            with self._lock:
+                tight = [(limit.recent_peak / limit.requests, scope, limit, limit.recent_peak)
+                         for scope, limit in self.limits.items()
+                         if limit.recent_peak > (1 - self.warn_below) * limit.requests]
+                for limit in self.limits.values():
+                    limit.recent_peak = 0
+            if tight:
+                self._last_warning = now
+                _, scope, limit, peak = max(tight, key=lambda t: t[0])
+                print(f"\n⚠️ Rate Limit Headroom | {self.label} | {'IP' if scope == '*' else scope} "
+                      f"peaked at {peak}/{limit.requests} per {limit.window:g}s")
+        if not self.report_interval or now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        if self.endpoints:
+            print(f"\n{self.report()}")
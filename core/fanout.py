@@ -0,0 +1,249 @@
+import os
+import time
+import asyncio
+from datetime import datetime
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+from core.trade_engine import TradeEngine, project_root
+from core.market_stream import MarketStream
+from core.telegram_notifier import TelegramNotifier
+from core.status_renderer import StatusRenderer
+from core.scheduler import CycleScheduler
+from core.profiler import CycleProfiler
+from core.loop_watchdog import LoopWatchdog
+from core.memory_telemetry import MemoryTelemetry
+from core import metrics, tracing
+
+class FanOutEngine:
+    """One signal computation per cycle, executed concurrently on every configured account
+
+    Accounts come from ACCOUNTS=main,sub1 with SUB1_BYBIT_API_KEY, SUB1_BYBIT_API_SECRET
+    and optional SUB1_FIXED_RISK_USD per account.
+    """
+
+    def __init__(self, accounts, symbol=None, account_timeout=None):
+        self.notifier = TelegramNotifier()
+        self.accounts = {}          # name -> TradeEngine with its own credentials and RiskManager
+        for i, name in enumerate(accounts):
+            engine = TradeEngine(symbol=symbol, notifier=self.notifier)
+            prefix = name.upper()
+            # The first account may use the default TESTNET_/LIVE_ keys, the others need their own
+            engine.api_key = os.getenv(f'{prefix}_BYBIT_API_KEY', engine.api_key if i == 0 else None)
+            engine.api_secret = os.getenv(f'{prefix}_BYBIT_API_SECRET', engine.api_secret if i == 0 else None)
+            if engine.exchange_name != 'sim' and not (engine.api_key and engine.api_secret):
+                print(f"⚠️ Account {name} has no {prefix}_BYBIT_API_KEY/SECRET | Skipped")
+                continue
+            risk = os.getenv(f'{prefix}_FIXED_RISK_USD')
+            if risk:
+                engine.risk_manager.fixed_risk_usd = float(risk)
+            engine.display_enabled = False
+            engine.state_key = f"{name}-{engine.linear}"
+            self.accounts[name] = engine
+
+        if not self.accounts:
+            raise ValueError("No accounts configured | Every account in ACCOUNTS was skipped")
+
+        # Market data and indicators come from the lead account only, the strategy is shared after connect
+        self.lead = next(iter(self.accounts.values()))
+        self.strategy = self.lead.strategy
+        for name, engine in self.accounts.items():
+            engine.tracer = self.lead.tracer
+            engine.journal = self.lead.journal
+            engine.profiler = None
+            if engine.api_usage:
+                engine.api_usage.label = name       # One API key per account, its own UID limits
+
+        # Attributes main.py reads from a single engine
+        self.symbol = self.lead.symbol
+        self.linear = self.lead.linear
+        self.risk_manager = self.lead.risk_manager
+        self.demo_mode = self.lead.demo_mode
+        self.exchange = None
+        self.market_stream = None
+
+        # Profiles the fan-out cycle as a whole (PROFILE_CYCLES=N or SIGUSR1)
+        self.profiler = CycleProfiler.from_env(project_root)
+
+        self.account_timeout = account_timeout or float(os.getenv('ACCOUNT_TIMEOUT', '5'))
+        self.inflight = {}          # name -> task still working on an earlier signal
+        self.stats = {name: {'cycles': 0, 'skipped': 0, 'errors': 0, 'last_latency': 0.0, 'max_latency': 0.0}
+                      for name in self.accounts}
+        self.running = False
+        self.renderer = None
+        self.scheduler = None
+        self.startup_profiler = None
+        self.watchdog = None
+        self.memory = None
+        self.startup_balance = 0
+        self.startup_price = None
+
+        print(f"✅ Fan-out engine | {len(self.accounts)} accounts | {self.symbol}")
+
+    def connect(self):
+        # Each account restores its snapshot into its own strategy, only the lead's signal state is kept
+        with ThreadPoolExecutor(max_workers=len(self.accounts)) as pool:
+            results = dict(zip(self.accounts, pool.map(lambda e: e.connect(), self.accounts.values())))
+
+        if not results[next(iter(results))]:
+            # The lead account carries market data, without it there is nothing to trade on
+            return False
+        for name, ok in results.items():
+            if not ok:
+                print(f"❌ Account {name} failed to connect | Excluded from fan-out")
+        self.accounts = {name: e for name, e in self.accounts.items() if results[name]}
+        for engine in self.accounts.values():
+            engine.strategy = self.strategy
+
+        self.exchange = self.lead.exchange
+        self.startup_balance = sum(e.startup_balance for e in self.accounts.values())
+        self.startup_price = self.lead.startup_price
+        print(f"✅ Fan-out ready | {len(self.accounts)} accounts | Combined balance: ${self.startup_balance:,.2f}")
+        return True
+
+    async def _run_account(self, name, engine, df, signal):
+        started = time.perf_counter()
+        stats = self.stats[name]
+        try:
+            await engine.act_on_signal(df, signal)
+            stats['cycles'] += 1
+        except Exception as e:
+            stats['errors'] += 1
+            print(f"\n❌ Account {name} | Cycle failed | {e}")
+        finally:
+            latency = time.perf_counter() - started
+            stats['last_latency'] = latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+
+    async def run_cycle(self):
+        with self.profiler.cycle() if self.profiler else nullcontext(), \
+                self.memory.cycle() if self.memory else nullcontext():
+            await self._run_cycle()
+        # Accounts only act on signals, their engines never reach the per-cycle report hooks
+        for engine in self.accounts.values():
+            if engine.api_usage:
+                engine.api_usage.maybe_report()
+        if self.memory:
+            await self.memory.maybe_sample()
+
+    async def _run_cycle(self):
+        df = await asyncio.to_thread(self.lead.get_market_data)
+        if df is None or df.empty:
+            return
+        trace, self.lead._trace = self.lead._trace, None
+        prev_signal = self.strategy.last_signal
+        with tracing.active(trace):
+            signal = self.strategy.generate_signal(df)
+        if trace:
+            trace.mark('signal')
+        if self.lead.journal:
+            self.lead.journal.record_cycle(self.linear, df, signal, self.strategy, prev_signal)
+        if signal:
+            metrics.SIGNALS.inc(self.linear, signal['action'])
+
+        # An account still busy with an earlier cycle sits this one out instead of holding the others
+        tasks = []
+        for name, engine in self.accounts.items():
+            task = self.inflight.get(name)
+            if task is not None and not task.done():
+                self.stats[name]['skipped'] += 1
+                continue
+            # Each account gets its own copy of the trace, finished when its orders are done
+            engine._trace = trace.fork(name) if trace else None
+            task = asyncio.create_task(self._run_account(name, engine, df, signal))
+            self.inflight[name] = task
+            tasks.append(task)
+
+        if tasks:
+            # Stragglers keep running in the background, cancelling mid-order is worse than waiting
+            await asyncio.wait(tasks, timeout=self.account_timeout)
+
+    def render_status(self):
+        snapshots = [(name, e.status) for name, e in self.accounts.items() if e.status]
+        if not snapshots:
+            return None
+        status = snapshots[0][1]
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        open_positions = [s['position'] for _, s in snapshots if s['position']]
+        pnl = sum(p['unrealized_pnl'] for p in open_positions)
+        return (f"[{timestamp}] {status['symbol']} | RSI: {status['rsi']:.1f} | MFI: {status['mfi']:.1f} | "
+                f"{len(self.accounts)} accounts | Positions: {len(open_positions)} | PnL: {pnl:+.2f}")
+
+    async def run(self):
+        self.running = True
+        self.renderer = StatusRenderer.from_env(self.render_status)
+        if self.renderer:
+            self.renderer.start()
+        metrics.track_notifier(self.notifier)
+        metrics.start_exporter_from_env()
+        if self.profiler:
+            self.profiler.install_signal()
+        self.watchdog = LoopWatchdog.from_env(project_root)
+        if self.watchdog:
+            self.watchdog.start()
+        self.memory = MemoryTelemetry.from_env(project_root)
+        # One WebSocket carries the ticker for every account's local trailing stop
+        self.market_stream = MarketStream(self.exchange)
+        self.market_stream.start()
+        for name, engine in self.accounts.items():
+            metrics.track_engine(engine, account=name)
+            engine.running = True
+            engine.renderer = self.renderer
+            engine.market_stream = self.market_stream
+            engine._start_local_trailing()
+
+        self.scheduler = CycleScheduler.from_env(self.exchange, bar_seconds=int(self.lead.kline_interval) * 60)
+        try:
+            if self.startup_profiler:
+                self.startup_profiler.finish()
+            await self.run_cycle()
+            while self.running:
+                await self.scheduler.wait()
+                if not self.running:
+                    break
+                await self.run_cycle()
+        except Exception as e:
+            print(f"\n❌ Fatal Error | {e}")
+            await self.notifier.error_notification(str(e))
+
+    def summary(self):
+        return " | ".join(
+            f"{name}: {s['cycles']} cycles, {s['skipped']} skipped, {s['errors']} errors, max {s['max_latency'] * 1000:.0f}ms"
+            for name, s in self.stats.items())
+
+    async def stop(self):
+        self.running = False
+        if self.renderer:
+            self.renderer.stop()
+        if self.scheduler and self.scheduler.cycles:
+            print(f"\n⏱️ Scheduler | {self.scheduler.summary()}")
+        print(f"\n📊 Fan-out | {self.summary()}")
+        if self.watchdog:
+            self.watchdog.stop()
+            print(f"\n{self.watchdog.report()}")
+        if self.memory:
+            self.memory.sample()
+        if self.market_stream:
+            self.market_stream.stop()
+
+        # Let in-flight account work settle, then flatten every account concurrently
+        pending = [t for t in self.inflight.values() if not t.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=self.account_timeout)
+
+        async def stop_account(name, engine):
+            try:
+                await engine.stop(shared=False)
+            except Exception as e:
+                print(f"\n❌ Account {name} | Stop failed | {e} | Check open positions manually")
+
+        await asyncio.gather(*[stop_account(n, e) for n, e in self.accounts.items()])
+
+        # Shared by every account, closed once all of them are done
+        if self.lead.tracer:
+            self.lead.tracer.flush()
+        if self.lead.journal:
+            self.lead.journal.close()
+        if self.profiler:
+            self.profiler.finish()
+        await self.notifier.flush()
@@ -0,0 +1,393 @@
+import os
+import sys
+import json
+import math
+import time
+import struct
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+# File layout: MAGIC, then records of <u16 payload length><u8 type><payload>, all little-endian
+MAGIC = b'TBJ1'
+FRAME = struct.Struct('<HB')
+
+SYMBOL, PARAMS, BARS, DECISION, ORDER = 1, 2, 3, 4, 5
+
+# BARS: symbol id, wall time, window size, then bar rows
+BARS_HEAD = struct.Struct('<HdH')
+BAR_DTYPE = np.dtype([('ts', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                      ('close', '<f8'), ('volume', '<f8')])
+# Rows that fit one frame, longer deltas are split over several BARS records
+MAX_BAR_ROWS = (0xFFFF - BARS_HEAD.size) // BAR_DTYPE.itemsize
+# DECISION: symbol id, wall time, last_signal before, action, rsi, mfi, price, structure stop
+DECISION_REC = struct.Struct('<Hdbbdddd')
+# ORDER: symbol id, wall time, purpose, side, retCode, qty, price, sl, tp, risk, pnl, then link id bytes
+ORDER_REC = struct.Struct('<Hdbbidddddd')
+
+ACTIONS = {None: 0, 'BUY': 1, 'SELL': 2}
+ACTION_NAMES = {v: k for k, v in ACTIONS.items()}
+PURPOSES = {'entry': 1, 'close': 2, 'risk_blocked': 3}
+PURPOSE_NAMES = {v: k for k, v in PURPOSES.items()}
+SIDES = {None: 0, 'Buy': 1, 'Sell': 2}
+SIDE_NAMES = {v: k for k, v in SIDES.items()}
+
+NAN = float('nan')
+
+class DecisionJournal:
+    """Append-only binary journal of cycle inputs and decisions, written by a background thread
+
+    The hot path only queues references (the cycle's DataFrame is never mutated afterwards); the
+    writer thread encodes the queue every `flush_interval` seconds and appends it to a per-day,
+    per-process file. Bars are journaled as deltas (new or updated bars only), which is enough
+    to rebuild the exact kline window for replay.
+    """
+
+    def __init__(self, directory, flush_interval=1.0, max_pending=4096):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.records = 0
+        self.bytes_written = 0
+        self._pending = []          # Encoded frames (bytes) and cycle tuples still to encode, in order
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._symbols = {}          # name -> id
+        self._preamble = bytearray()  # Symbol and params records, repeated at the top of every file
+        self._flushed_preamble = b''  # The part of the preamble already written by earlier flushes
+        self._last_bars = {}        # symbol id -> (first ts, last ts) journaled
+        self._file = None
+        self._path = None
+        self._thread = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, project_root):
+        """None when JOURNAL=false"""
+        if os.getenv('JOURNAL', 'true').lower() != 'true':
+            return None
+        return cls(os.getenv('JOURNAL_DIR', os.path.join(project_root, '_data', 'journal')),
+                   flush_interval=float(os.getenv('JOURNAL_FLUSH_INTERVAL', '1')))
+
+    # Hot path
+
+    def _append(self, kind, payload, preamble=False):
+        self._queue(FRAME.pack(len(payload), kind) + payload, 1, preamble)
+
+    def _queue(self, item, records, preamble=False):
+        with self._lock:
+            if preamble:
+                self._preamble += item
+            self._pending.append(item)
+            self.records += records
+            full = len(self._pending) >= self.max_pending
+        if self._thread is None:
+            self._start()
+        if full:
+            self._wake.set()
+
+    def _symbol_id(self, name, params=None):
+        sid = self._symbols.get(name)
+        if sid is None:
+            sid = self._symbols[name] = len(self._symbols)
+            self._append(SYMBOL, struct.pack('<H', sid) + name.encode(), preamble=True)
+            if params is not None:
+                self._append(PARAMS, struct.pack('<H', sid) + json.dumps(params, sort_keys=True).encode(), preamble=True)
+        return sid
+
+    def record_cycle(self, symbol, df, signal, strategy, prev_signal):
+        """Bars the strategy saw (as a delta) and what it decided"""
+        sid = self._symbol_id(symbol, strategy.params)
+        action = signal['action'] if signal else None
+        stop = signal.get('structure_stop') if signal else None
+        self._queue((sid, time.time(), df, prev_signal, action, strategy.last_rsi, strategy.last_mfi, stop), 2)
+
+    def _encode_cycle(self, item):
+        sid, now, df, prev_signal, action, rsi, mfi, stop = item
+        ts = df.index.as_unit('ms').asi8
+        first, last = int(ts[0]), int(ts[-1])
+        seen = self._last_bars.get(sid)
+        # Bars at or after the last journaled one changed or are new, older ones are closed candles
+        start = 0 if seen is None or first < seen[0] else int(np.searchsorted(ts, seen[1]))
+        self._last_bars[sid] = (first, last)
+
+        rows = np.empty(len(ts) - start, dtype=BAR_DTYPE)
+        rows['ts'] = ts[start:]
+        for col in ('open', 'high', 'low', 'close', 'volume'):
+            rows[col] = df[col].to_numpy()[start:]
+        head = BARS_HEAD.pack(sid, now, len(ts))
+        frames = []
+        for i in range(0, max(len(rows), 1), MAX_BAR_ROWS):
+            bars = head + rows[i:i + MAX_BAR_ROWS].tobytes()
+            frames.append(FRAME.pack(len(bars), BARS) + bars)
+
+        decision = DECISION_REC.pack(
+            sid, now, ACTIONS.get(prev_signal, 0), ACTIONS[action],
+            NAN if rsi is None else float(rsi), NAN if mfi is None else float(mfi),
+            float(rows['close'][-1]) if len(rows) else float(df['close'].iloc[-1]),
+            NAN if stop is None else float(stop))
+        return b''.join(frames) + FRAME.pack(len(decision), DECISION) + decision
+
+    def record_order(self, symbol, purpose, side=None, ret_code=0, qty=0.0, price=0.0,
+                     sl=NAN, tp=NAN, risk=NAN, pnl=NAN, link_id=''):
+        sid = self._symbol_id(symbol)
+        self._append(ORDER, ORDER_REC.pack(
+            sid, time.time(), PURPOSES[purpose], SIDES.get(side, 0), int(ret_code),
+            float(qty), float(price), float(sl), float(tp), float(risk), float(pnl)) + link_id.encode()[:36])
+
+    # Writer thread
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._write()
+            except Exception as e:
+                # The writer thread must outlive a bad batch, later records would queue forever
+                self._last_bars.clear()
+                print(f"\n⚠️ Journal | Writer error | {e}")
+
+    def _write(self, sync=False):
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                preamble = bytes(self._preamble)
+            if not pending:
+                return
+            path = os.path.join(self.directory, f"journal-{datetime.now(timezone.utc):%Y%m%d}-{os.getpid()}.bin")
+            if path != self._path:
+                # Bar deltas are relative to the file, a new one starts from full windows
+                self._last_bars.clear()
+            chunks = []
+            for item in pending:
+                if isinstance(item, bytes):
+                    chunks.append(item)
+                    continue
+                try:
+                    chunks.append(self._encode_cycle(item))
+                except Exception as e:
+                    self._last_bars.pop(item[0], None)
+                    print(f"\n⚠️ Journal | Encode failed | {e}")
+            if not self._write_file(path, b''.join(chunks), preamble, sync):
+                # The dropped deltas never reached disk, journal full windows next time
+                self._last_bars.clear()
+
+    def _write_file(self, path, data, preamble, sync):
+        try:
+            if path != self._path:
+                if self._file:
+                    self._file.close()
+                os.makedirs(self.directory, exist_ok=True)
+                fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+                self._file = open(path, 'ab')
+                self._path = path
+                # Every file is self-contained: magic plus the symbol table and params (records
+                # registered since the last flush are already in data)
+                self._file.write(MAGIC if fresh else b'')
+                self._file.write(self._flushed_preamble)
+            self._file.write(data)
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+            self._flushed_preamble = preamble
+            self.bytes_written += len(data)
+            return True
+        except OSError as e:
+            print(f"\n⚠️ Journal | Write failed | {e}")
+            return False
+
+    def close(self):
+        """Flush everything and fsync, safe to call more than once"""
+        self._closed = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(2.0)
+        self._write(sync=True)
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._path = None
+
+# Reading
+
+def iter_frames(path):
+    """(type, payload memoryview) for every record, the fast path for scans"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a decision journal")
+    view = memoryview(data)
+    unpack = FRAME.unpack_from
+    size = FRAME.size
+    offset, end = 4, len(data)
+    while offset + size <= end:
+        length, kind = unpack(data, offset)
+        offset += size
+        if offset + length > end:
+            break               # Torn tail from a crash mid-write
+        yield kind, view[offset:offset + length]
+        offset += length
+
+def read_records(path):
+    """Decoded records as dicts, with symbol names resolved"""
+    symbols = {}
+    for kind, payload in iter_frames(path):
+        if kind == SYMBOL:
+            sid = struct.unpack_from('<H', payload)[0]
+            symbols[sid] = bytes(payload[2:]).decode()
+            yield {'type': 'symbol', 'symbol': symbols[sid]}
+        elif kind == PARAMS:
+            sid = struct.unpack_from('<H', payload)[0]
+            yield {'type': 'params', 'symbol': symbols.get(sid), 'params': json.loads(bytes(payload[2:]))}
+        elif kind == BARS:
+            sid, wall, window = BARS_HEAD.unpack_from(payload)
+            yield {'type': 'bars', 'symbol': symbols.get(sid), 'time': wall, 'window': window,
+                   'bars': np.frombuffer(payload[BARS_HEAD.size:], dtype=BAR_DTYPE)}
+        elif kind == DECISION:
+            sid, wall, prev, action, rsi, mfi, price, stop = DECISION_REC.unpack_from(payload)
+            yield {'type': 'decision', 'symbol': symbols.get(sid), 'time': wall,
+                   'prev_signal': ACTION_NAMES.get(prev), 'action': ACTION_NAMES.get(action),
+                   'rsi': rsi, 'mfi': mfi, 'price': price, 'structure_stop': None if math.isnan(stop) else stop}
+        elif kind == ORDER:
+            sid, wall, purpose, side, ret_code, qty, price, sl, tp, risk, pnl = ORDER_REC.unpack_from(payload)
+            yield {'type': 'order', 'symbol': symbols.get(sid), 'time': wall,
+                   'purpose': PURPOSE_NAMES.get(purpose), 'side': SIDE_NAMES.get(side), 'ret_code': ret_code,
+                   'qty': qty, 'price': price, 'sl': sl, 'tp': tp, 'risk': risk, 'pnl': pnl,
+                   'link_id': bytes(payload[ORDER_REC.size:]).decode()}
+
+class _Window:
+    """Rebuilds the kline window the live strategy saw from bar deltas"""
+
+    def __init__(self):
+        self.bars = np.empty(0, dtype=BAR_DTYPE)
+
+    def apply(self, rows, window):
+        if len(rows) >= window or not len(self.bars):
+            merged = rows
+        else:
+            keep = self.bars[self.bars['ts'] < rows['ts'][0]]
+            merged = np.concatenate([keep, rows])
+        self.bars = merged[-window:]
+
+    def frame(self):
+        import pandas as pd
+        df = pd.DataFrame({col: self.bars[col] for col in ('open', 'high', 'low', 'close', 'volume')},
+                          index=pd.to_datetime(self.bars['ts'], unit='ms'))
+        df.index.name = 'timestamp'
+        return df
+
+def replay(path, symbol=None, strategy_factory=None, on_decision=None):
+    """Stream journaled bars through the strategy and compare with the journaled decisions
+
+    strategy_factory(symbol, params) builds the strategy (defaults to RSIMFICloudStrategy with the
+    journaled params). Returns {'decisions', 'mismatches', 'signals'}.
+    """
+    import contextlib
+    if strategy_factory is None:
+        strategy_factory = _default_strategy
+
+    params, strategies, windows, pending = {}, {}, {}, {}
+    stats = {'decisions': 0, 'mismatches': 0, 'signals': 0}
+    for record in read_records(path):
+        name = record.get('symbol')
+        if symbol and name != symbol:
+            continue
+        kind = record['type']
+        if kind == 'params':
+            params[name] = record['params']
+        elif kind == 'bars':
+            windows.setdefault(name, _Window()).apply(record['bars'], record['window'])
+            pending[name] = True
+        elif kind == 'decision' and pending.pop(name, False):
+            strategy = strategies.get(name)
+            if strategy is None:
+                strategy = strategies[name] = strategy_factory(name, params.get(name))
+                strategy.last_signal = record['prev_signal']
+            # Structure stop logging is for the live console
+            with contextlib.redirect_stdout(None):
+                signal = strategy.generate_signal(windows[name].frame())
+
+            replayed = signal['action'] if signal else None
+            match = (replayed == record['action'] and _same(strategy.last_rsi, record['rsi'])
+                     and _same(strategy.last_mfi, record['mfi']))
+            stats['decisions'] += 1
+            stats['signals'] += replayed is not None
+            stats['mismatches'] += not match
+            if on_decision:
+                on_decision(record, signal, match)
+    return stats
+
+def _same(value, journaled):
+    if value is None:
+        return math.isnan(journaled)
+    return float(value) == journaled
+
+def _default_strategy(symbol, params):
+    from strategies.RSI_MFI_Cloud import RSIMFICloudStrategy
+    strategy = RSIMFICloudStrategy(risk_manager=None)
+    if params:
+        strategy.params = params
+    return strategy
+
+def _stats(path):
+    counts = {}
+    started = time.perf_counter()
+    for kind, _ in iter_frames(path):
+        counts[kind] = counts.get(kind, 0) + 1
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    names = {SYMBOL: 'symbol', PARAMS: 'params', BARS: 'bars', DECISION: 'decision', ORDER: 'order'}
+    print(f"📒 Journal | {path} | {total:,} records | {os.path.getsize(path):,} bytes | "
+          f"scanned at {total / elapsed if elapsed else 0:,.0f} records/s")
+    for kind, n in sorted(counts.items()):
+        print(f"   {names.get(kind, kind):<10} {n:,}")
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or replay a decision journal")
+    parser.add_argument('command', choices=('stats', 'dump', 'replay'))
+    parser.add_argument('path')
+    parser.add_argument('--symbol', help="Only records for this linear symbol, e.g. BNBUSDT")
+    args = parser.parse_args(argv)
+
+    if args.command == 'stats':
+        _stats(args.path)
+    elif args.command == 'dump':
+        for record in read_records(args.path):
+            if args.symbol and record.get('symbol') != args.symbol:
+                continue
+            if record['type'] == 'bars':
+                record = {**record, 'bars': len(record['bars'])}
+            print(record)
+    else:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        started = time.perf_counter()
+
+        def show(record, signal, match):
+            if not match:
+                replayed = signal['action'] if signal else None
+                print(f"❌ Mismatch | {record['symbol']} | {datetime.fromtimestamp(record['time'])} | "
+                      f"journal {record['action']} rsi={record['rsi']:.4f} | replay {replayed}")
+
+        stats = replay(args.path, args.symbol, on_decision=show)
+        elapsed = time.perf_counter() - started
+        print(f"🔁 Replay | {stats['decisions']:,} decisions | {stats['signals']:,} signals | "
+              f"{stats['mismatches']:,} mismatches | {elapsed:.2f}s")
+        return 1 if stats['mismatches'] else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
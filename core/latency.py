@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+
+from core import metrics
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of durations in microseconds, ~6% relative precision"""
+
+    SUB_BITS = 4                          # 16 linear sub-buckets per power of two
+    BUCKETS = 40 << SUB_BITS              # Covers 1us .. ~12 days
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, us):
+        if us < (1 << cls.SUB_BITS):
+            return us
+        exp = us.bit_length() - 1
+        sub = (us >> (exp - cls.SUB_BITS)) & ((1 << cls.SUB_BITS) - 1)
+        return min(((exp - cls.SUB_BITS + 1) << cls.SUB_BITS) + sub, cls.BUCKETS - 1)
+
+    @classmethod
+    def _upper(cls, index):
+        """Largest value that lands in bucket index"""
+        if index < (1 << cls.SUB_BITS):
+            return index
+        exp = (index >> cls.SUB_BITS) + cls.SUB_BITS - 1
+        sub = index & ((1 << cls.SUB_BITS) - 1)
+        return (((1 << cls.SUB_BITS) + sub + 1) << (exp - cls.SUB_BITS)) - 1
+
+    def record(self, us):
+        us = max(0, int(us))
+        self.counts[self._index(us)] += 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0
+        target = max(1, int(self.count * pct / 100 + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._upper(index), self.max_us)
+        return self.max_us
+
+    def summary(self):
+        """Milliseconds, for display"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total_us / self.count / 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) / 1000,
+            'p99_ms': self.percentile(99) / 1000,
+            'max_ms': self.max_us / 1000
+        }
+
+class LatencyRecorder:
+    """Named latency histograms for cycle stages and exchange calls, safe to record from worker threads"""
+
+    def __init__(self, report_interval=60.0):
+        self.histograms = {}
+        self.report_interval = report_interval      # Seconds between periodic reports, 0 = never
+        self._lock = threading.Lock()
+        self._last_report = time.monotonic()
+
+    @classmethod
+    def from_env(cls):
+        """None when LATENCY_TRACKING=false"""
+        if os.getenv('LATENCY_TRACKING', 'true').lower() != 'true':
+            return None
+        return cls(report_interval=float(os.getenv('LATENCY_REPORT_INTERVAL', '60')))
+
+    def record(self, name, seconds):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.record(seconds * 1_000_000)
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def snapshot(self, prefix=None):
+        """Per-name summaries, optionally only names starting with prefix"""
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self.histograms.items())
+                    if prefix is None or name.startswith(prefix)}
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def report(self, title="Latency"):
+        lines = [f"⏱️ {title} | p50 / p99 / max (ms)"]
+        for name, s in self.snapshot().items():
+            lines.append(f"   {name:<28} {s['p50_ms']:8.2f} {s['p99_ms']:8.2f} {s['max_ms']:8.2f}  n={s['count']}")
+        return "\n".join(lines)
+
+    def maybe_report(self):
+        """Print the report when the interval has elapsed, call once per cycle"""
+        if not self.report_interval or time.monotonic() - self._last_report < self.report_interval:
+            return
+        self._last_report = time.monotonic()
+        if self.histograms:
+            print(f"\n{self.report()}")
+
+class _Stage:
+    __slots__ = ('recorder', 'name', 't0')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+class InstrumentedExchange:
+    """Transparent proxy timing every exchange method call as api.<method> and counting it in metrics"""
+
+    def __init__(self, exchange, recorder=None, usage=None):
+        self._exchange = exchange
+        self._recorder = recorder
+        self._usage = usage
+        self._wrapped = {}
+        if usage:
+            usage.attach(exchange)
+
+    @property
+    def wrapped(self):
+        return self._exchange
+
+    def __getattr__(self, name):
+        attr = getattr(self._exchange, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+        wrapper = self._wrapped.get(name)
+        if wrapper is None:
+            recorder, usage, key = self._recorder, self._usage, f"api.{name}"
+
+            def wrapper(*args, **kwargs):
+                t0 = time.perf_counter()
+                code = None
+                try:
+                    result = getattr(self._exchange, name)(*args, **kwargs)
+                    if isinstance(result, dict) and result.get('retCode', 0) != 0:
+                        code = result.get('retCode')
+                    return result
+                except Exception as e:
+                    # pybit raises InvalidRequestError with the retCode as status_code
+                    code = getattr(e, 'status_code', None) or type(e).__name__
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - t0
+                    if recorder:
+                        recorder.record(key, elapsed)
+                    if usage:
+                        usage.record(name, elapsed, code)
+                    metrics.API_CALLS.inc(name)
+                    metrics.API_LATENCY.observe(elapsed, name)
+                    if code is not None:
+                        metrics.API_ERRORS.inc(name, str(code))
+
+            self._wrapped[name] = wrapper
+        return wrapper
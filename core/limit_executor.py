@@ -0,0 +1,262 @@
+import time
+import uuid
+import asyncio
+
+class LimitOrderExecutor:
+    """Maker-first entry: PostOnly limit at the touch, amended on book events, market fallback"""
+
+    def __init__(self, exchange, market_stream, format_price, format_qty, max_chase_bps=15.0,
+                 max_amends=8, timeout=8.0, min_reprice_interval=0.2, status_interval=0.5):
+        self.exchange = exchange
+        self.market_stream = market_stream
+        self.format_price = format_price
+        self.format_qty = format_qty
+        self.max_chase_bps = max_chase_bps                # Stop chasing beyond this from the first quote
+        self.max_amends = max_amends
+        self.timeout = timeout                            # Seconds before falling back to market
+        self.min_reprice_interval = min_reprice_interval
+        self.status_interval = status_interval            # Fill check cadence between book events
+
+    async def execute(self, linear, side, qty, info):
+        """Work a maker order for qty, returns a place_order-shaped dict plus fill details"""
+        started = time.monotonic()
+        target = float(qty)
+        fill = {'filled_qty': 0.0, 'notional': 0.0, 'maker_qty': 0.0, 'taker_qty': 0.0,
+                'amends': 0, 'reposts': 0, 'fallback': False}
+
+        changed = asyncio.Event()
+        handler = lambda symbol, ticker: changed.set()
+        self.market_stream.subscribe_book(linear, handler)
+
+        try:
+            bid, ask = await self._touch(linear)
+            if bid is None:
+                return await self._market_remainder(linear, side, target, info, fill, started)
+
+            anchor = bid if side == "Buy" else ask
+            order_id, price = await self._post(linear, side, target, anchor, info)
+            if order_id is None:
+                return await self._market_remainder(linear, side, target, info, fill, started)
+
+            last_reprice = time.monotonic()
+            last_status = 0.0
+            status = {}
+            while time.monotonic() - started < self.timeout:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.status_interval)
+                except asyncio.TimeoutError:
+                    pass
+                changed.clear()
+
+                # Only hit the order endpoints when a trade printed through us or the timer is due
+                last = self.market_stream.last_price(linear)
+                traded_through = last is not None and (last <= price if side == "Buy" else last >= price)
+                if traded_through or time.monotonic() - last_status >= self.status_interval:
+                    status = await self._status(linear, order_id)
+                    last_status = time.monotonic()
+                    self._record_fill(status, fill, maker=True)
+                    if status.get('orderStatus') == 'Filled':
+                        return self._result(fill, started, order_id)
+
+                leaves = target - fill['filled_qty']
+                bid, ask = self.market_stream.best_bid_ask(linear)
+                if bid is None:
+                    continue
+                best = bid if side == "Buy" else ask
+
+                if status.get('orderStatus') in ('Cancelled', 'Rejected', 'Deactivated'):
+                    # PostOnly rejected after the book moved through us, repost at the new touch
+                    status = {}
+                    if not self._within_chase(side, anchor, best) or fill['reposts'] >= self.max_amends:
+                        break
+                    order_id, price = await self._post(linear, side, leaves, best, info)
+                    fill['reposts'] += 1
+                    if order_id is None:
+                        break
+                    continue
+
+                improved = best > price if side == "Buy" else best < price
+                if (not improved or fill['amends'] >= self.max_amends
+                        or not self._within_chase(side, anchor, best)
+                        or time.monotonic() - last_reprice < self.min_reprice_interval):
+                    continue
+
+                if await self._amend(linear, order_id, best, info):
+                    price = best
+                    fill['amends'] += 1
+                    last_reprice = time.monotonic()
+
+            # Out of time or chase budget: pull the maker order and take the rest
+            await self._cancel(linear, order_id)
+            status = await self._final_status(linear, order_id)
+            if not status:
+                # The maker order may have filled in full, a market remainder could double the position
+                print(f"\n⚠️ Limit Entry | Fill Unknown | {linear} {order_id} | No market remainder sent")
+                result = self._result(fill, started, order_id)
+                if not fill['filled_qty']:
+                    result['retMsg'] = 'Limit entry fill state unknown'
+                return result
+            self._record_fill(status, fill, maker=True)
+            remaining = target - fill['filled_qty']
+            if remaining <= info['qty_step'] / 2:
+                return self._result(fill, started, order_id)
+            return await self._market_remainder(linear, side, remaining, info, fill, started)
+
+        finally:
+            self.market_stream.unsubscribe(linear, handler)
+
+    async def _touch(self, linear):
+        bid, ask = self.market_stream.best_bid_ask(linear)
+        if bid is not None and self.market_stream.is_fresh(linear):
+            return bid, ask
+        try:
+            resp = await asyncio.to_thread(self.exchange.get_tickers, category="linear", symbol=linear)
+            if resp.get('retCode') == 0 and resp['result']['list']:
+                row = resp['result']['list'][0]
+                return float(row['bid1Price']), float(row['ask1Price'])
+        except Exception as e:
+            print(f"\n⚠️ Limit Entry | Ticker Failed | {e}")
+        return None, None
+
+    def _within_chase(self, side, anchor, best):
+        move = (best - anchor) if side == "Buy" else (anchor - best)
+        return move / anchor * 10000 <= self.max_chase_bps
+
+    async def _post(self, linear, side, qty, price, info):
+        try:
+            resp = await asyncio.to_thread(
+                self.exchange.place_order,
+                category="linear",
+                symbol=linear,
+                side=side,
+                orderType="Limit",
+                qty=self.format_qty(info, qty),
+                price=self.format_price(info, price),
+                timeInForce="PostOnly",
+                orderLinkId=f"mk-{uuid.uuid4().hex[:20]}"
+            )
+            if resp.get('retCode') == 0:
+                return resp['result']['orderId'], price
+            print(f"\n⚠️ Limit Entry | Post Failed | {resp.get('retMsg')}")
+        except Exception as e:
+            print(f"\n⚠️ Limit Entry | Post Error | {e}")
+        return None, price
+
+    async def _amend(self, linear, order_id, price, info):
+        try:
+            resp = await asyncio.to_thread(
+                self.exchange.amend_order,
+                category="linear",
+                symbol=linear,
+                orderId=order_id,
+                price=self.format_price(info, price)
+            )
+            return resp.get('retCode') == 0
+        except Exception:
+            # Usually the order filled or was rejected in between, the next status check sorts it out
+            return False
+
+    async def _cancel(self, linear, order_id):
+        try:
+            await asyncio.to_thread(self.exchange.cancel_order, category="linear",
+                                    symbol=linear, orderId=order_id)
+        except Exception:
+            pass
+
+    async def _status(self, linear, order_id):
+        """Current order state from open orders, then history once it is no longer working"""
+        try:
+            resp = await asyncio.to_thread(self.exchange.get_open_orders, category="linear",
+                                           symbol=linear, orderId=order_id)
+            if resp.get('retCode') == 0 and resp['result']['list']:
+                return resp['result']['list'][0]
+            resp = await asyncio.to_thread(self.exchange.get_order_history, category="linear",
+                                           symbol=linear, orderId=order_id, limit=1)
+            if resp.get('retCode') == 0 and resp['result']['list']:
+                return resp['result']['list'][0]
+        except Exception as e:
+            print(f"\n⚠️ Limit Entry | Status Error | {e}")
+        return {}
+
+    async def _final_status(self, linear, order_id, attempts=3):
+        """Order state after a cancel, retried since the remainder depends on it"""
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(self.status_interval)
+            status = await self._status(linear, order_id)
+            if status:
+                return status
+        return {}
+
+    @staticmethod
+    def _record_fill(status, fill, maker):
+        """Fold an order's cumulative execution into the running totals"""
+        if not status:
+            return
+        order_id = status.get('orderId')
+        cum = float(status.get('cumExecQty') or 0)
+        avg = float(status.get('avgPrice') or 0)
+        seen = fill.setdefault('_seen', {})
+        prev_qty, prev_notional = seen.get(order_id, (0.0, 0.0))
+        if cum <= prev_qty:
+            return
+        notional = cum * avg
+        fill['filled_qty'] += cum - prev_qty
+        fill['notional'] += notional - prev_notional
+        fill['maker_qty' if maker else 'taker_qty'] += cum - prev_qty
+        seen[order_id] = (cum, notional)
+
+    async def _market_remainder(self, linear, side, qty, info, fill, started):
+        fill['fallback'] = True
+        try:
+            resp = await asyncio.to_thread(
+                self.exchange.place_order,
+                category="linear",
+                symbol=linear,
+                side=side,
+                orderType="Market",
+                qty=self.format_qty(info, qty)
+            )
+        except Exception as e:
+            resp = {'retCode': -1, 'retMsg': str(e), 'result': {}}
+
+        if resp.get('retCode') != 0:
+            result = self._result(fill, started, None)
+            if fill['filled_qty'] == 0:
+                result['retCode'] = resp.get('retCode', -1)
+                result['retMsg'] = resp.get('retMsg')
+            return result
+
+        order_id = resp['result'].get('orderId')
+        status = await self._status(linear, order_id)
+        if status:
+            self._record_fill(status, fill, maker=False)
+        else:
+            # No status available, price the market leg at the last trade or leave the average unknown
+            price = self.market_stream.last_price(linear)
+            fill['filled_qty'] += qty
+            fill['taker_qty'] += qty
+            if price:
+                fill['notional'] += qty * price
+            else:
+                fill['unpriced'] = True
+        return self._result(fill, started, order_id)
+
+    @staticmethod
+    def _result(fill, started, order_id):
+        fill.pop('_seen', None)
+        priced = fill['filled_qty'] and fill['notional'] and not fill.get('unpriced')
+        avg_price = fill['notional'] / fill['filled_qty'] if priced else None
+        return {
+            'retCode': 0 if fill['filled_qty'] > 0 else -1,
+            'retMsg': 'OK' if fill['filled_qty'] > 0 else 'Limit entry not filled',
+            'result': {'orderId': order_id},
+            'avgPrice': avg_price,
+            'filledQty': fill['filled_qty'],
+            'makerQty': fill['maker_qty'],
+            'takerQty': fill['taker_qty'],
+            'amends': fill['amends'],
+            'reposts': fill['reposts'],
+            'fallback': fill['fallback'],
+            'latency': time.monotonic() - started
+        }
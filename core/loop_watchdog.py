@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+
+from core import metrics
+from core.latency import LatencyHistogram
+
+# File fragments that identify who is holding the loop, checked innermost frame first
+_EXCHANGE = (os.sep + 'pybit' + os.sep, 'sim_exchange.py', os.sep + 'requests' + os.sep, os.sep + 'urllib3' + os.sep)
+_NOTIFIER = ('telegram_notifier.py', os.sep + 'telegram' + os.sep)
+_DISPLAY = ('status_renderer.py',)
+_DISPLAY_FUNCS = ('render_status', '_publish_status', '_print_flatten_report')
+_PASSTHROUGH = ('latency.py',)     # InstrumentedExchange wrapper frames
+
+def _classify(code):
+    path = code.co_filename
+    if any(part in path for part in _EXCHANGE):
+        return 'exchange'
+    if any(part in path for part in _NOTIFIER):
+        return 'notifier'
+    if any(part in path for part in _DISPLAY) or code.co_name in _DISPLAY_FUNCS:
+        return 'display'
+    return None
+
+def _name(frame):
+    """Function name, or the wrapped API method for decorator frames (SimExchange _api)"""
+    name = frame.f_code.co_name
+    if name == 'wrapper':
+        wrapped = frame.f_locals.get('name')
+        if isinstance(wrapped, str):
+            return wrapped
+    return name
+
+def _site(frame):
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+class LoopWatchdog:
+    """Measures event-loop lag and attributes blocking stretches to the code holding the loop
+
+    A heartbeat task sleeps `interval` and measures how late it wakes. A watcher thread notices
+    when the heartbeat is overdue and samples the loop thread's stack while it is still blocked,
+    so each block is attributed to an exchange call, the notifier, the display or other code.
+    """
+
+    def __init__(self, project_root, interval=0.05, threshold=0.1, log_size=200, warn_interval=30.0):
+        self.project_root = project_root
+        self.interval = interval
+        self.threshold = threshold          # Lag above this counts as a blocking call
+        self.warn_interval = warn_interval  # Seconds between printed warnings
+        self.lag = LatencyHistogram()
+        self.blocks = {}                    # category -> [count, seconds]
+        self.sites = {}                     # site -> [count, seconds, category]
+        self.log = deque(maxlen=log_size)   # (wall time, seconds, category, site), most recent last
+        self._expected = None
+        self._pending = None                # (category, site) sampled while the loop is stuck
+        self._loop_thread = None
+        self._task = None
+        self._thread = None
+        self._running = False
+        self._last_warning = 0.0
+
+    @classmethod
+    def from_env(cls, project_root):
+        """None when LOOP_WATCHDOG=false"""
+        if os.getenv('LOOP_WATCHDOG', 'true').lower() != 'true':
+            return None
+        return cls(
+            project_root,
+            threshold=float(os.getenv('LOOP_BLOCK_THRESHOLD_MS', '100')) / 1000,
+            log_size=int(os.getenv('LOOP_BLOCK_LOG_SIZE', '200'))
+        )
+
+    def start(self):
+        """Call from inside the running loop"""
+        self._running = True
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        while self._running:
+            self._expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._expected)
+            self._expected = None
+            self.lag.record(lag * 1_000_000)
+            metrics.LOOP_LAG.observe(lag)
+
+            pending, self._pending = self._pending, None
+            if lag >= self.threshold:
+                self._record_block(lag, *(pending or ('unattributed', 'shorter than the sampling period')))
+
+    def _watch(self):
+        period = min(self.interval, self.threshold) / 2
+        while self._running:
+            time.sleep(period)
+            expected = self._expected
+            if expected is None or self._pending is not None:
+                continue
+            if time.monotonic() - expected >= self.threshold / 2:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._pending = self._attribute(frame)
+
+    def _attribute(self, frame):
+        """(category, site) for the stack the loop thread is stuck in"""
+        frames = []                         # innermost first, minus the timing proxy
+        while frame is not None:
+            if not frame.f_code.co_filename.endswith(_PASSTHROUGH):
+                frames.append(frame)
+            frame = frame.f_back
+
+        index = next((i for i, f in enumerate(frames) if _classify(f.f_code)), None)
+        if index is None:
+            caller = next((f for f in frames if self._is_project(f)), None)
+            return 'other', _site(caller) if caller else 'outside project code'
+
+        category = _classify(frames[index].f_code)
+        # The outermost frame of the same kind is the API method / notifier call made by our code
+        target = _name(frames[index])
+        while index + 1 < len(frames) and _classify(frames[index + 1].f_code) == category:
+            index += 1
+            target = _name(frames[index])
+        caller = next((f for f in frames[index + 1:] if self._is_project(f) and not _classify(f.f_code)), None)
+        return category, f"{target} ← {_site(caller)}" if caller else target
+
+    def _is_project(self, frame):
+        return frame.f_code.co_filename.startswith(self.project_root)
+
+    def _record_block(self, seconds, category, site):
+        totals = self.blocks.setdefault(category, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        per_site = self.sites.setdefault(site, [0, 0.0, category])
+        per_site[0] += 1
+        per_site[1] += seconds
+        self.log.append((datetime.now(), seconds, category, site))
+        metrics.LOOP_BLOCKS.inc(category)
+        metrics.LOOP_BLOCKED_SECONDS.inc(category, amount=seconds)
+
+        now = time.monotonic()
+        if now - self._last_warning >= self.warn_interval:
+            self._last_warning = now
+            print(f"\n⚠️ Loop Blocked | {seconds * 1000:.0f}ms | {category} | {site}")
+
+    def report(self, top=5):
+        s = self.lag.summary()
+        lines = [f"🐢 Event Loop | Lag p50 {s['p50_ms']:.1f}ms / p99 {s['p99_ms']:.1f}ms / max {s['max_ms']:.1f}ms | "
+                 f"{sum(c for c, _ in self.blocks.values())} blocks over {self.threshold * 1000:.0f}ms"]
+        for category, (count, seconds) in sorted(self.blocks.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"   {category:<14} {count:6d} blocks {seconds * 1000:10.0f}ms")
+        for site, (count, seconds, category) in sorted(self.sites.items(), key=lambda kv: -kv[1][1])[:top]:
+            lines.append(f"   ↳ {seconds * 1000:8.0f}ms x{count:<5d} {site}")
+        return "\n".join(lines)
@@ -0,0 +1,101 @@
+import time
+import asyncio
+
+class MarketStream:
+    """Ticker stream fan-out from the pybit WebSocket thread onto the asyncio loop"""
+
+    def __init__(self, exchange=None, testnet=False):
+        self.exchange = exchange
+        self.testnet = testnet
+        self.ws = None
+        self.loop = None
+        self.handlers = {}          # symbol -> [handler(symbol, ticker)]
+        self.book_symbols = set()   # Symbols with a depth-1 order book subscription
+        self.tickers = {}           # symbol -> merged latest ticker fields
+        self.last_update = {}       # symbol -> monotonic time of last message
+
+    def start(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+
+    def subscribe_ticker(self, symbol, handler):
+        """Register handler for ticker updates, subscribing upstream on first use"""
+        first = symbol not in self.handlers
+        self.handlers.setdefault(symbol, []).append(handler)
+        if first:
+            self._source().ticker_stream(symbol=symbol, callback=self._on_message)
+
+    def subscribe_book(self, symbol, handler):
+        """Best bid/ask updates from the depth-1 order book, falling back to tickers"""
+        source = self._source()
+        if symbol not in self.book_symbols and hasattr(source, 'orderbook_stream'):
+            self.book_symbols.add(symbol)
+            source.orderbook_stream(depth=1, symbol=symbol, callback=self._on_book_message)
+        self.subscribe_ticker(symbol, handler)
+
+    def unsubscribe(self, symbol, handler):
+        """Stop calling handler, the upstream subscription stays open"""
+        handlers = self.handlers.get(symbol, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def _source(self):
+        if self.ws is None:
+            if hasattr(self.exchange, 'ticker_stream'):
+                # The simulator streams its own ticks
+                self.ws = self.exchange
+            else:
+                from pybit.unified_trading import WebSocket
+                self.ws = WebSocket(testnet=self.testnet, channel_type="linear")
+        return self.ws
+
+    def _on_message(self, message):
+        # Runs on the WebSocket thread, hand over to the loop immediately
+        data = message.get('data') or {}
+        symbol = data.get('symbol')
+        if symbol and self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._dispatch, symbol, data)
+
+    def _on_book_message(self, message):
+        data = message.get('data') or {}
+        symbol = data.get('s')
+        update = {}
+        if data.get('b'):
+            update['bid1Price'] = data['b'][0][0]
+        if data.get('a'):
+            update['ask1Price'] = data['a'][0][0]
+        if symbol and update and self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._dispatch, symbol, update)
+
+    def _dispatch(self, symbol, data):
+        # Linear tickers arrive as a snapshot followed by partial deltas
+        ticker = self.tickers.setdefault(symbol, {})
+        ticker.update({k: v for k, v in data.items() if v not in (None, '')})
+        self.last_update[symbol] = time.monotonic()
+
+        for handler in self.handlers.get(symbol, []):
+            try:
+                handler(symbol, ticker)
+            except Exception as e:
+                print(f"\n⚠️ Stream Warning | Handler error | {e}")
+
+    def last_price(self, symbol):
+        price = self.tickers.get(symbol, {}).get('lastPrice')
+        return float(price) if price else None
+
+    def best_bid_ask(self, symbol):
+        ticker = self.tickers.get(symbol, {})
+        bid, ask = ticker.get('bid1Price'), ticker.get('ask1Price')
+        if not bid or not ask:
+            return None, None
+        return float(bid), float(ask)
+
+    def is_fresh(self, symbol, max_age=2.0):
+        updated = self.last_update.get(symbol)
+        return updated is not None and time.monotonic() - updated <= max_age
+
+    def stop(self):
+        if self.ws is not None:
+            try:
+                self.ws.exit()
+            except Exception:
+                pass
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import tracemalloc
+from datetime import datetime
+
+from core import metrics
+
+def read_rss():
+    """Resident set size in bytes, current on Linux, peak elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def _fmt_bytes(n):
+    sign = '-' if n < 0 else ''
+    n = abs(n)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{sign}{n:.1f}{unit}" if unit != 'B' else f"{sign}{n:.0f}B"
+        n /= 1024
+
+class MemoryTelemetry:
+    """Opt-in RSS, tracemalloc top sites and per-cycle allocation churn, diffed over time
+
+    Every cycle records net traced bytes, the transient peak above the starting point (churn)
+    and the change in allocated blocks. Every `interval` seconds a tracemalloc snapshot is
+    compared with the previous one and with the first, so slow leaks show up as steady growth
+    at the same site. Samples are appended to MEMORY_LOG as JSON lines for multi-day trends.
+    """
+
+    def __init__(self, log_path, interval=300.0, top=10, frames=1):
+        self.log_path = log_path
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.started = time.monotonic()
+        self.rss_start = read_rss()
+        self.rss = self.rss_start
+        self.baseline = None            # First snapshot, for slow-leak diffs
+        self.previous = None            # Last snapshot, for growth since the previous sample
+        self.last_sample = time.monotonic()
+        self.samples = 0
+        self._reset_cycles()
+        self._cycle_start = None
+
+    @classmethod
+    def from_env(cls, project_root):
+        """None unless MEMORY_TELEMETRY=true, tracemalloc slows allocation noticeably"""
+        if os.getenv('MEMORY_TELEMETRY', 'false').lower() != 'true':
+            return None
+        telemetry = cls(
+            os.getenv('MEMORY_LOG', os.path.join(project_root, '_data', 'memory', 'memory.jsonl')),
+            interval=float(os.getenv('MEMORY_INTERVAL', '300')),
+            top=int(os.getenv('MEMORY_TOP', '10')),
+            frames=int(os.getenv('MEMORY_TRACE_FRAMES', '1'))
+        )
+        telemetry.start()
+        return telemetry
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        metrics.MEMORY_RSS.callbacks.append(lambda: {(): self.rss})
+        self.baseline = self.previous = self._snapshot()
+        print(f"✅ Memory telemetry | RSS {_fmt_bytes(self.rss_start)} | Sample every {self.interval:.0f}s")
+
+    def _reset_cycles(self):
+        self.cycles = 0
+        self.net_total = 0
+        self.churn_total = 0
+        self.churn_max = 0
+        self.blocks_total = 0
+
+    # Per-cycle accounting
+
+    def cycle(self):
+        return _Cycle(self)
+
+    def _begin_cycle(self):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        self._cycle_start = (current, sys.getallocatedblocks())
+
+    def _end_cycle(self):
+        if self._cycle_start is None:
+            return
+        start, blocks = self._cycle_start
+        self._cycle_start = None
+        current, peak = tracemalloc.get_traced_memory()
+        churn = peak - start
+        self.cycles += 1
+        self.net_total += current - start
+        self.churn_total += churn
+        self.churn_max = max(self.churn_max, churn)
+        self.blocks_total += sys.getallocatedblocks() - blocks
+        metrics.MEMORY_CYCLE_CHURN.observe(churn)
+
+    # Periodic snapshots
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    async def maybe_sample(self):
+        """Call once per cycle, samples when the interval has elapsed"""
+        if time.monotonic() - self.last_sample < self.interval:
+            return
+        await asyncio.to_thread(self.sample)
+
+    def sample(self):
+        self.last_sample = time.monotonic()
+        self.samples += 1
+        self.rss = read_rss()
+        snapshot = self._snapshot()
+        traced, _ = tracemalloc.get_traced_memory()
+
+        growth = snapshot.compare_to(self.previous, 'lineno')[:self.top]
+        leaks = [d for d in snapshot.compare_to(self.baseline, 'lineno') if d.size_diff > 0][:self.top]
+        self.previous = snapshot
+
+        cycles = max(self.cycles, 1)
+        record = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'uptime_s': round(time.monotonic() - self.started),
+            'rss': self.rss,
+            'rss_growth': self.rss - self.rss_start,
+            'traced': traced,
+            'cycles': self.cycles,
+            'net_per_cycle': self.net_total // cycles,
+            'churn_per_cycle': self.churn_total // cycles,
+            'churn_max': self.churn_max,
+            'blocks_per_cycle': self.blocks_total / cycles,
+            'growth': [[_site(d), d.size_diff, d.count_diff] for d in growth],
+            'since_start': [[_site(d), d.size_diff, d.count_diff] for d in leaks],
+        }
+        self._reset_cycles()
+        self._append(record)
+        print(f"\n{self.report(record)}")
+        return record
+
+    def _append(self, record):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"\n⚠️ Memory telemetry | Log write failed | {e}")
+
+    def report(self, record, top=3):
+        hours = max(record['uptime_s'] / 3600, 1e-9)
+        lines = [f"🧠 Memory | RSS {_fmt_bytes(record['rss'])} ({_fmt_bytes(record['rss_growth'])} since start, "
+                 f"{_fmt_bytes(record['rss_growth'] / hours)}/h) | Traced {_fmt_bytes(record['traced'])} | "
+                 f"Per cycle: net {_fmt_bytes(record['net_per_cycle'])}, churn {_fmt_bytes(record['churn_per_cycle'])} "
+                 f"(max {_fmt_bytes(record['churn_max'])}), blocks {record['blocks_per_cycle']:+.0f}"]
+        for site, size, count in record['since_start'][:top]:
+            lines.append(f"   ↗ {_fmt_bytes(size):>9} {count:+7d} blocks since start | {site}")
+        return "\n".join(lines)
+
+class _Cycle:
+    __slots__ = ('telemetry',)
+
+    def __init__(self, telemetry):
+        self.telemetry = telemetry
+
+    def __enter__(self):
+        self.telemetry._begin_cycle()
+        return self
+
+    def __exit__(self, *exc):
+        self.telemetry._end_cycle()
+        return False
+
+def _site(diff):
+    frame = diff.traceback[0]
+    return f"{os.path.join(*frame.filename.split(os.sep)[-2:])}:{frame.lineno}"
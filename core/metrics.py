@@ -0,0 +1,241 @@
+import os
+import time
+import bisect
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+def _num(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for labels, value in self._values.items():
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(value)}")
+        return lines
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time by a callback returning {labels tuple: value}"""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callbacks = [callback] if callback else []
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            values = dict(self._values)
+        for callback in self.callbacks:
+            try:
+                values.update(callback())
+            except Exception:
+                pass
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(value)}")
+        return lines
+
+class CallbackCounter(Gauge):
+    """Counter computed at scrape time from a monotonic total another object already keeps"""
+    kind = 'counter'
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per-bucket counts (non-cumulative), made cumulative at scrape time
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            snapshot = {labels: (list(s[0]), s[1], s[2]) for labels, s in self._values.items()}
+        for labels, (counts, total, count) in snapshot.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = ('le', _num(bound) if bound != float('inf') else '+Inf')
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+# Bot metrics, shared by every engine in the process
+API_CALLS = REGISTRY.register(Counter('bot_api_calls_total', 'Exchange API calls', ['method']))
+API_ERRORS = REGISTRY.register(Counter('bot_api_errors_total', 'Exchange API calls that raised or returned a nonzero retCode', ['method', 'code']))
+API_LATENCY = REGISTRY.register(Histogram('bot_api_latency_seconds', 'Exchange API call latency', ['method']))
+API_BYTES = REGISTRY.register(Counter('bot_api_bytes_total', 'Exchange API payload bytes', ['method', 'direction']))
+API_HEADROOM = REGISTRY.register(Gauge('bot_api_rate_limit_headroom', 'Fraction of a rate-limit window left at its busiest over the recent horizon', ['account', 'scope']))
+CYCLE_LATENCY = REGISTRY.register(Histogram('bot_cycle_latency_seconds', 'run_cycle duration', ['symbol']))
+CYCLES = REGISTRY.register(Counter('bot_cycles_total', 'Completed trading cycles', ['symbol']))
+CYCLE_ERRORS = REGISTRY.register(Counter('bot_cycle_errors_total', 'Trading cycles that raised', ['symbol']))
+SIGNALS = REGISTRY.register(Counter('bot_signals_total', 'Signals emitted by the strategy', ['symbol', 'action']))
+ORDERS = REGISTRY.register(Counter('bot_orders_total', 'Orders submitted', ['symbol', 'purpose', 'result']))
+POSITION_SIZE = REGISTRY.register(Gauge('bot_position_size', 'Open position size, negative for shorts', ['account', 'symbol']))
+UNREALIZED_PNL = REGISTRY.register(Gauge('bot_unrealized_pnl_usd', 'Unrealized PnL of the open position', ['account', 'symbol']))
+NOTIFIER_QUEUE = REGISTRY.register(Gauge('bot_notifier_queue_depth', 'Telegram outbox depth'))
+NOTIFIER_DROPPED = REGISTRY.register(CallbackCounter('bot_notifier_dropped_total', 'Telegram notifications dropped because the outbox was full'))
+LOOP_LAG = REGISTRY.register(Histogram('bot_loop_lag_seconds', 'Event loop wake-up lag measured by the watchdog heartbeat'))
+LOOP_BLOCKS = REGISTRY.register(Counter('bot_loop_blocks_total', 'Event loop stalls over the blocking threshold', ['category']))
+LOOP_BLOCKED_SECONDS = REGISTRY.register(Counter('bot_loop_blocked_seconds_total', 'Time the event loop spent blocked', ['category']))
+MEMORY_RSS = REGISTRY.register(Gauge('bot_memory_rss_bytes', 'Resident set size at the last memory telemetry sample'))
+MEMORY_CYCLE_CHURN = REGISTRY.register(Histogram('bot_memory_cycle_churn_bytes', 'Peak traced allocation above the cycle start',
+                                                 buckets=(64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20, 64 << 20)))
+UPTIME = REGISTRY.register(Gauge('bot_uptime_seconds', 'Seconds since the process started metrics'))
+
+_started = time.time()
+UPTIME.callbacks.append(lambda: {(): time.time() - _started})
+
+def track_engine(engine, account='default'):
+    """Expose an engine's position and PnL from its status snapshot, read only at scrape time
+
+    Fan-out accounts trade the same symbol, so each one passes its own account name.
+    """
+    def position():
+        status = engine.status
+        pos = status['position'] if status else None
+        size = 0.0
+        if pos:
+            size = pos['size'] if pos['side'] == 'Buy' else -pos['size']
+        return {(account, engine.linear): size}
+
+    def pnl():
+        status = engine.status
+        pos = status['position'] if status else None
+        return {(account, engine.linear): pos['unrealized_pnl'] if pos else 0.0}
+
+    POSITION_SIZE.callbacks.append(position)
+    UNREALIZED_PNL.callbacks.append(pnl)
+
+def track_notifier(notifier):
+    if getattr(notifier, '_metrics_tracked', False):
+        return
+    notifier._metrics_tracked = True
+    NOTIFIER_QUEUE.callbacks.append(lambda: {(): notifier.queue_depth})
+    NOTIFIER_DROPPED.callbacks.append(lambda: {(): notifier.dropped_total})
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+_exporter = None
+
+def start_exporter_from_env():
+    """METRICS_PORT serves /metrics over HTTP, METRICS_TEXTFILE writes a textfile-collector file; once per process"""
+    global _exporter
+    if _exporter is not None:
+        return _exporter
+
+    port = os.getenv('METRICS_PORT')
+    path = os.getenv('METRICS_TEXTFILE')
+    if port:
+        host = os.getenv('METRICS_HOST', '127.0.0.1')
+        server = ThreadingHTTPServer((host, int(port)), _Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        _exporter = server
+        print(f"✅ Metrics | http://{host}:{port}/metrics")
+    elif path:
+        interval = float(os.getenv('METRICS_INTERVAL', '15'))
+        _exporter = threading.Thread(target=_write_textfile_loop, args=(path, interval),
+                                     name="metrics-textfile", daemon=True)
+        _exporter.start()
+        print(f"✅ Metrics | Textfile {path} every {interval:.0f}s")
+    return _exporter
+
+def write_textfile(path):
+    """Atomic write so the node exporter never reads a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.metrics.', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+def _write_textfile_loop(path, interval):
+    while True:
+        try:
+            write_textfile(path)
+        except Exception as e:
+            print(f"\n⚠️ Metrics | Textfile write failed | {e}")
+        time.sleep(interval)
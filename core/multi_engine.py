@@ -0,0 +1,282 @@
+import os
+import time
+import asyncio
+from datetime import datetime
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+from core.trade_engine import TradeEngine
+from core.telegram_notifier import TelegramNotifier
+from core.order_batcher import OrderBatcher
+from core.market_stream import MarketStream
+from core.status_renderer import StatusRenderer
+from core.scheduler import CycleScheduler
+from core.latency import LatencyRecorder, InstrumentedExchange
+from core.api_usage import ApiUsage
+from core.tracing import Tracer
+from core.journal import DecisionJournal
+from core.profiler import CycleProfiler
+from core.loop_watchdog import LoopWatchdog
+from core.memory_telemetry import MemoryTelemetry
+from core.trade_engine import project_root
+from core import metrics
+
+class MultiSymbolEngine:
+    """Many per-symbol TradeEngines sharing one event loop, exchange client and notifier"""
+
+    def __init__(self, symbols, exchange=None, max_concurrency=None):
+        self.notifier = TelegramNotifier()
+        self.engines = [TradeEngine(exchange=exchange, symbol=s, notifier=self.notifier) for s in symbols]
+        self.by_linear = {e.linear: e for e in self.engines}
+
+        # Attributes main.py reads from a single engine
+        lead = self.engines[0]
+        self.symbol = ",".join(e.symbol for e in self.engines)
+        self.linear = lead.linear
+        self.risk_manager = lead.risk_manager
+        self.demo_mode = lead.demo_mode
+        self.exchange_name = lead.exchange_name
+
+        self.exchange = exchange
+        self.batcher = None
+        self.market_stream = None
+        self.renderer = None
+        self.scheduler = None
+        self.startup_profiler = None
+        self.startup_balance = 0
+        self.startup_price = None
+        self.running = False
+        self.max_concurrency = max_concurrency or int(os.getenv('MAX_CONCURRENT_REQUESTS', '8'))
+        self._semaphore = None
+        self.watchdog = None
+        self.memory = None
+
+        # Coalesced snapshots, refreshed once per cycle
+        self.positions = {}
+
+        # One set of histograms for every symbol, stages are comparable across engines
+        self.latency = LatencyRecorder.from_env()
+        self.api_usage = ApiUsage.from_env('portfolio')
+        self.tracer = Tracer.from_env(project_root)
+        self.journal = DecisionJournal.from_env(project_root)
+
+        # Profiles whole portfolio cycles, the per-symbol engines never profile on their own
+        self.profiler = CycleProfiler.from_env(project_root)
+
+        for engine in self.engines:
+            engine.profiler = None
+            engine.display_enabled = False
+            engine.latency = self.latency
+            engine.api_usage = self.api_usage
+            engine.tracer = self.tracer
+            engine.journal = self.journal
+            engine.position_feed = lambda linear=engine.linear: self.positions.get(linear)
+
+        print(f"✅ Multi-symbol engine | {len(self.engines)} symbols")
+
+    def connect(self):
+        try:
+            lead = self.engines[0]
+            if self.exchange is None and self.exchange_name == 'sim':
+                from core.sim_exchange import SimExchange
+                self.exchange = SimExchange.from_env()
+            elif self.exchange is None:
+                from pybit.unified_trading import HTTP
+                self.exchange = HTTP(
+                    demo=lead.demo_mode,
+                    api_key=lead.api_key,
+                    api_secret=lead.api_secret
+                )
+
+            # One pooled session, sized so concurrent kline fetches don't queue on connections
+            client = getattr(self.exchange, 'client', None)
+            if client is not None:
+                from requests.adapters import HTTPAdapter
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_concurrency)
+                client.mount('https://', adapter)
+
+            if not isinstance(self.exchange, InstrumentedExchange):
+                self.exchange = InstrumentedExchange(self.exchange, self.latency, self.api_usage)
+            self.batcher = OrderBatcher(self.exchange)
+            for engine in self.engines:
+                engine.exchange = self.exchange
+                engine.batcher = self.batcher
+
+            # Connect-time probes are independent, run them concurrently
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                server_time = pool.submit(self.exchange.get_server_time)
+                instruments = pool.submit(self._load_instruments)
+                balance = pool.submit(self.get_wallet_balance)
+                positions = pool.submit(self.refresh_positions)
+
+                if server_time.result().get('retCode') != 0:
+                    return False
+                infos = instruments.result()
+                self.startup_balance = balance.result()
+                positions.result()
+
+            for engine in self.engines:
+                engine.symbol_info = infos.get(engine.linear) or engine.get_symbol_info()
+                if not engine.symbol_info:
+                    print(f"⚠️ Symbol info loading issues for {engine.symbol}")
+
+            # Warm restart: reconcile snapshots against the coalesced position query
+            for engine in self.engines:
+                engine.restore_state()
+
+            mode = "Testnet" if self.demo_mode else "Live"
+            if self.exchange_name == 'sim':
+                mode = "Simulator"
+            print(f"✅ Connected to Bybit {mode} | {len(self.engines)} symbols on one client")
+            print(f"✅ Wallet balance: ${self.startup_balance:,.2f}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Connection Error | {e}")
+            return False
+
+    def _load_instruments(self):
+        """All linear instruments in as few pages as the API allows"""
+        infos, cursor = {}, None
+        try:
+            while True:
+                resp = self.exchange.get_instruments_info(category="linear", limit=1000, cursor=cursor)
+                if resp.get('retCode') != 0:
+                    break
+                for item in resp['result']['list']:
+                    if item.get('symbol') in self.by_linear:
+                        infos[item['symbol']] = TradeEngine.parse_symbol_info(item)
+                cursor = resp['result'].get('nextPageCursor')
+                if not cursor or len(infos) == len(self.by_linear):
+                    break
+        except Exception as e:
+            print(f"⚠️ Instrument list failed | {e}")
+        return infos
+
+    def get_wallet_balance(self):
+        return self.engines[0].get_wallet_balance()
+
+    def refresh_positions(self):
+        """One get_positions call for every symbol instead of one per engine"""
+        try:
+            resp = self.exchange.get_positions(category="linear", settleCoin="USDT")
+            if resp.get('retCode') != 0:
+                return False
+            self.positions = {p['symbol']: p for p in resp.get('result', {}).get('list', [])
+                              if p.get('symbol') in self.by_linear}
+            for engine in self.engines:
+                engine._position_dirty = False
+            return True
+        except Exception as e:
+            print(f"\n❌ API Error | Position Snapshot Failed | {e}")
+            # Fall back to per-engine queries this cycle
+            for engine in self.engines:
+                engine._position_dirty = True
+            return False
+
+    async def _fetch_market_data(self, engine):
+        async with self._semaphore:
+            return await asyncio.to_thread(engine.get_market_data)
+
+    async def run_cycle(self):
+        started = time.perf_counter()
+        with self.profiler.cycle() if self.profiler else nullcontext(), \
+                self.memory.cycle() if self.memory else nullcontext():
+            # Klines have no multi-symbol endpoint, so fetch them concurrently over the pool
+            frames_task = asyncio.gather(*[self._fetch_market_data(e) for e in self.engines])
+            await asyncio.to_thread(self.refresh_positions)
+            frames = await frames_task
+
+            await asyncio.gather(*[engine.run_cycle(df) for engine, df in zip(self.engines, frames)])
+        if self.latency:
+            self.latency.record('multi.cycle', time.perf_counter() - started)
+        if self.memory:
+            await self.memory.maybe_sample()
+
+    def render_status(self):
+        """Portfolio summary from the engines' snapshots, called on the renderer thread"""
+        snapshots = [e.status for e in self.engines if e.status]
+        if not snapshots:
+            return None
+        open_positions = [s['position'] for s in snapshots if s['position']]
+        pnl = sum(p['unrealized_pnl'] for p in open_positions)
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        return f"[{timestamp}] {len(self.engines)} symbols | Positions: {len(open_positions)} | PnL: {pnl:+.2f}"
+
+    async def run(self):
+        self.running = True
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.profiler:
+            self.profiler.install_signal()
+        self.watchdog = LoopWatchdog.from_env(project_root)
+        if self.watchdog:
+            self.watchdog.start()
+        self.memory = MemoryTelemetry.from_env(project_root)
+
+        # One WebSocket connection carries every symbol's subscriptions
+        self.market_stream = MarketStream(self.exchange)
+        self.market_stream.start()
+        self.renderer = StatusRenderer.from_env(self.render_status)
+        if self.renderer:
+            self.renderer.start()
+        metrics.track_notifier(self.notifier)
+        metrics.start_exporter_from_env()
+        for engine in self.engines:
+            metrics.track_engine(engine)
+            engine.running = True
+            engine.market_stream = self.market_stream
+            engine.renderer = self.renderer
+            engine._start_local_trailing()
+        lead = self.engines[0]
+        self.scheduler = CycleScheduler.from_env(self.exchange, bar_seconds=int(lead.kline_interval) * 60)
+        try:
+            if self.startup_profiler:
+                self.startup_profiler.finish()
+            await self.run_cycle()
+            while self.running:
+                await self.scheduler.wait()
+                if not self.running:
+                    break
+                await self.run_cycle()
+        except Exception as e:
+            print(f"\n❌ Fatal Error | {e}")
+            await self.notifier.error_notification(str(e))
+
+    async def stop(self):
+        self.running = False
+        for engine in self.engines:
+            engine.running = False
+        if self.renderer:
+            self.renderer.stop()
+        if self.scheduler and self.scheduler.cycles:
+            print(f"\n⏱️ Scheduler | {self.scheduler.summary()}")
+        if self.watchdog:
+            self.watchdog.stop()
+            print(f"\n{self.watchdog.report()}")
+        if self.memory:
+            self.memory.sample()
+        if self.latency and self.latency.histograms:
+            print(f"\n{self.latency.report()}")
+        if self.api_usage and self.api_usage.endpoints:
+            print(f"\n{self.api_usage.report()}")
+        if self.market_stream:
+            self.market_stream.stop()
+
+        if self.exchange and self.batcher is not None:
+            # Every managed symbol flattened concurrently under one deadline
+            report = await self.engines[0].flatten_all(set(self.by_linear), "Bot Stop")
+            for linear, entry in report['symbols'].items():
+                if entry['status'] == 'flat':
+                    self.by_linear[linear]._clear_position()
+                    self.by_linear[linear]._release_risk()
+
+        for engine in self.engines:
+            await engine._save_state(force=True)
+
+        if self.tracer:
+            self.tracer.flush()
+        if self.journal:
+            self.journal.close()
+        if self.profiler:
+            self.profiler.finish()
+        await self.notifier.flush()
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+
+class CycleProfiler:
+    """Profiles the next N cycles of a running bot (or optimizer evaluations) without a restart
+
+    Armed at startup with PROFILE_CYCLES=N, or at any time with `kill -USR1 <pid>`; a second
+    SIGUSR1 while armed stops early and writes what was collected. PROFILE_MODE=cprofile
+    writes a .pstats file (snakeviz, gprof2dot), PROFILE_MODE=sample samples the loop thread
+    every PROFILE_INTERVAL_MS and writes collapsed stacks (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, directory, cycles=10, mode='cprofile', interval=0.005, label='cycle'):
+        self.directory = directory
+        self.cycles = cycles
+        self.mode = mode
+        self.interval = interval
+        self.label = label
+        self.remaining = 0          # Cycles left to profile, 0 = disarmed
+        self.profiled = 0
+        self._stop_requested = False
+        self._profile = None        # cProfile.Profile while armed
+        self._sampler = None        # _Sampler while armed
+
+    @classmethod
+    def from_env(cls, project_root, label='cycle'):
+        """None when PROFILING=false, otherwise disarmed unless PROFILE_CYCLES is set"""
+        if os.getenv('PROFILING', 'true').lower() != 'true':
+            return None
+        start_cycles = int(os.getenv('PROFILE_CYCLES', '0'))
+        profiler = cls(
+            os.getenv('PROFILE_DIR', os.path.join(project_root, '_data', 'profiles')),
+            cycles=start_cycles or 10,
+            mode=os.getenv('PROFILE_MODE', 'cprofile').lower(),
+            interval=float(os.getenv('PROFILE_INTERVAL_MS', '5')) / 1000,
+            label=label
+        )
+        if start_cycles:
+            profiler.arm()
+        return profiler
+
+    def arm(self, cycles=None):
+        self.remaining = cycles or self.cycles
+        self._stop_requested = False
+        print(f"\n🔬 Profiler Armed | Next {self.remaining} {self.label}s | {self.mode}")
+
+    def toggle(self, *_):
+        """SIGUSR1 handler, only flips flags, the work happens at the next cycle boundary"""
+        if self.remaining:
+            self._stop_requested = True
+        else:
+            self.arm()
+
+    def install_signal(self):
+        if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGUSR1, self.toggle)
+
+    def cycle(self):
+        """Wrap one unit of work, a no-op unless armed"""
+        if not self.remaining:
+            return nullcontext()
+        return _Cycle(self)
+
+    def wrap(self, func):
+        """func with every call profiled as one cycle, for optimizer objectives"""
+        def profiled(*args, **kwargs):
+            with self.cycle():
+                return func(*args, **kwargs)
+        return profiled
+
+    def finish(self):
+        """Write a partial profile on shutdown if cycles were collected"""
+        if self.remaining and self.profiled:
+            self.remaining = 0
+            self._dump()
+
+    def _start(self):
+        if self.mode == 'sample':
+            if self._sampler is None:
+                self._sampler = _Sampler(threading.get_ident(), self.interval)
+                self._sampler.start()
+            self._sampler.active.set()
+            return True
+
+        if self._profile is None:
+            import cProfile
+            self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+            return True
+        except ValueError as e:
+            # Another profiler (debugger, coverage) owns the hook
+            print(f"\n⚠️ Profiler | Cannot enable | {e}")
+            self.remaining = 0
+            self._profile = None
+            return False
+
+    def _pause(self):
+        if self._sampler:
+            self._sampler.active.clear()
+        elif self._profile:
+            self._profile.disable()
+
+    def _end_cycle(self):
+        self._pause()
+        self.profiled += 1
+        self.remaining -= 1
+        if self.remaining <= 0 or self._stop_requested:
+            self.remaining = 0
+            self._stop_requested = False
+            self._dump()
+
+    def _dump(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(self.directory, f"{self.label}-{os.getpid()}-{stamp}")
+        cycles, self.profiled = self.profiled, 0
+        try:
+            if self._sampler:
+                sampler, self._sampler = self._sampler, None
+                sampler.stop()
+                path = f"{base}.folded"
+                with open(path, 'w') as f:
+                    for stack, count in sampler.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+                detail = f"{sum(sampler.stacks.values())} samples, {sampler.idle} idle in select"
+            else:
+                profile, self._profile = self._profile, None
+                path = f"{base}.pstats"
+                profile.dump_stats(path)
+                detail = "deterministic"
+            print(f"\n🔬 Profile Saved | {cycles} {self.label}s | {detail} | {path}")
+        except Exception as e:
+            print(f"\n⚠️ Profiler | Write failed | {e}")
+
+class _Cycle:
+    __slots__ = ('profiler', 'started')
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.started = self.profiler._start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.started:
+            self.profiler._end_cycle()
+        return False
+
+class _Sampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval while active"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()     # 'outer;...;inner' -> samples
+        self.idle = 0
+        self.active = threading.Event()
+        self._stopped = False
+
+    def run(self):
+        while not self._stopped:
+            if not self.active.wait(0.5) or self._stopped:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                # The loop parked in select() is awaiting I/O, not burning CPU in the cycle
+                if frame.f_code.co_name == 'select' and frame.f_code.co_filename.endswith('selectors.py'):
+                    self.idle += 1
+                else:
+                    self.stacks[_collapse(frame)] += 1
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._stopped = True
+        self.active.set()
+        self.join(1.0)
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
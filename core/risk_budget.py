@@ -0,0 +1,50 @@
+import multiprocessing
+
+class RiskBudget:
+    """Portfolio-wide open risk cap shared by worker processes, in fixed_risk_usd units
+
+    One shared slot per symbol holds the units that symbol currently has at risk,
+    so a restarted worker re-asserts its own slot instead of double counting.
+    """
+
+    def __init__(self, symbols, max_units, ctx=None):
+        ctx = ctx or multiprocessing
+        self.slots = {s.replace('/', ''): i for i, s in enumerate(symbols)}
+        self.max_units = float(max_units)
+        self._units = ctx.Array('d', len(self.slots))    # Synchronized, carries its own lock
+
+    def try_acquire(self, symbol, units=1.0):
+        """Reserve units for symbol if the portfolio stays within the cap"""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            return True
+        with self._units.get_lock():
+            others = sum(self._units) - self._units[slot]
+            if others + units > self.max_units + 1e-9:
+                return False
+            self._units[slot] = units
+            return True
+
+    def hold(self, symbol, units=1.0):
+        """Record a position found on the exchange, even if it overshoots the cap"""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            return
+        with self._units.get_lock():
+            if self._units[slot] <= 0:
+                self._units[slot] = units
+
+    def release(self, symbol):
+        slot = self.slots.get(symbol)
+        if slot is None:
+            return
+        with self._units.get_lock():
+            self._units[slot] = 0.0
+
+    def used(self):
+        with self._units.get_lock():
+            return sum(self._units)
+
+    def snapshot(self):
+        with self._units.get_lock():
+            return {s: self._units[i] for s, i in self.slots.items() if self._units[i] > 0}
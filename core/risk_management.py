@@ -1,7 +1,7 @@
 class RiskManager:
-    def __init__(self):
+    def __init__(self, symbol="BNB/USDT"):
         # Simple fixed risk approach
-        self.symbol = "BNB/USDT"  # Symbol moved here
+        self.symbol = symbol  # Symbol moved here
         self.linear = self.symbol.replace('/', '')
         
         # Fixed risk per trade
@@ -0,0 +1,138 @@
+import os
+import time
+import asyncio
+from collections import deque
+
+class CycleScheduler:
+    """Fires cycles on absolute deadlines aligned to exchange time, skipping overrun slots"""
+
+    def __init__(self, exchange=None, period=1.0, bar_seconds=300, close_delay=0.25,
+                 resync_interval=600.0, max_samples=10000):
+        self.exchange = exchange
+        self.period = period                    # Seconds between cycles, on a server-time grid
+        self.bar_seconds = bar_seconds          # Candle length, an extra cycle fires just after each close
+        self.close_delay = close_delay          # Seconds after bar close for the exchange to publish the bar
+        self.resync_interval = resync_interval
+
+        self.offset = 0.0                       # server time - local wall time, seconds
+        self.rtt = None
+        self._last_sync = None
+        self._next = None                       # Server-time grid slot after the last deadline
+        self._next_bar = None                   # Server-time bar close after the last deadline
+
+        # Stats
+        self.cycles = 0
+        self.bar_cycles = 0
+        self.overruns = 0                       # Cycles that ran past the next grid slot
+        self.skipped = 0                        # Slots dropped instead of queued
+        self.jitter = deque(maxlen=max_samples) # Wake-up lateness per cycle, seconds
+        self.bar_latency = deque(maxlen=max_samples)  # Wake-up time after bar close, seconds
+
+    @classmethod
+    def from_env(cls, exchange=None, bar_seconds=300):
+        return cls(
+            exchange,
+            period=float(os.getenv('CYCLE_PERIOD', '1')),
+            bar_seconds=bar_seconds,
+            close_delay=float(os.getenv('BAR_CLOSE_DELAY_MS', '250')) / 1000
+        )
+
+    def sync(self):
+        """Measure the server clock offset from get_server_time, midpoint of the round trip"""
+        if self.exchange is None:
+            return
+        try:
+            sent = time.time()
+            resp = self.exchange.get_server_time()
+            received = time.time()
+            if resp.get('retCode') != 0:
+                return
+            result = resp.get('result', {})
+            if result.get('timeNano'):
+                server = int(result['timeNano']) / 1e9
+            else:
+                server = float(result['timeSecond'])
+            self.rtt = received - sent
+            self.offset = server - (sent + received) / 2
+            self._last_sync = time.monotonic()
+        except Exception as e:
+            print(f"\n⚠️ Scheduler | Server time sync failed | {e}")
+
+    def server_now(self):
+        return time.time() + self.offset
+
+    def _next_slot(self, now):
+        return (int(now / self.period) + 1) * self.period
+
+    def _next_bar_close(self, now):
+        bar_close = int(now / self.bar_seconds) * self.bar_seconds + self.close_delay
+        if bar_close <= now:
+            bar_close += self.bar_seconds
+        return bar_close
+
+    def _next_deadline(self, now):
+        """Next grid slot or bar close after now in server time, and whether it is a bar close"""
+        slot = self._next_slot(now)
+        bar_close = self._next_bar_close(now)
+        if bar_close <= slot:
+            return bar_close, True
+        return slot, False
+
+    async def wait(self):
+        """Sleep until the next deadline, returns True when this cycle follows a bar close"""
+        if self._last_sync is None or time.monotonic() - self._last_sync > self.resync_interval:
+            await asyncio.to_thread(self.sync)
+
+        now = self.server_now()
+        if self._next is not None and now > self._next:
+            # The previous cycle ran past the next grid slot: drop the slots it covered rather than catching up
+            self.overruns += 1
+            self.skipped += int((now - self._next) / self.period) + 1
+
+        if self._next_bar is not None and now >= self._next_bar:
+            # A bar closed while the previous cycle ran, its cycle is never dropped
+            deadline, bar_close = self._next_bar, True
+        else:
+            deadline, bar_close = self._next_deadline(now)
+            await asyncio.sleep(max(0.0, deadline - self.server_now()))
+
+        woke = self.server_now()
+        self.jitter.append(max(0.0, woke - deadline))
+        self.cycles += 1
+        self._next = self._next_slot(deadline)
+        self._next_bar = self._next_bar_close(deadline)
+
+        if bar_close:
+            self.bar_cycles += 1
+            self.bar_latency.append(woke - (deadline - self.close_delay))
+            return True
+        return False
+
+    @staticmethod
+    def _percentile(values, pct):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def stats(self):
+        jitter = list(self.jitter)
+        return {
+            'cycles': self.cycles,
+            'bar_cycles': self.bar_cycles,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'offset_ms': self.offset * 1000,
+            'rtt_ms': (self.rtt or 0) * 1000,
+            'jitter_p50_ms': self._percentile(jitter, 50) * 1000,
+            'jitter_p99_ms': self._percentile(jitter, 99) * 1000,
+            'jitter_max_ms': max(jitter, default=0.0) * 1000,
+            'bar_latency_p50_ms': self._percentile(list(self.bar_latency), 50) * 1000
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"Cycles: {s['cycles']} ({s['bar_cycles']} bar) | Overruns: {s['overruns']} | "
+                f"Skipped: {s['skipped']} | Jitter p50 {s['jitter_p50_ms']:.1f}ms "
+                f"p99 {s['jitter_p99_ms']:.1f}ms max {s['jitter_max_ms']:.1f}ms | "
+                f"Clock offset {s['offset_ms']:+.0f}ms")
@@ -0,0 +1,712 @@
+import os
+import math
+import time
+import uuid
+import random
+import threading
+import functools
+
+class SimExchangeError(Exception):
+    """Raised by injected transport failures, mirrors a pybit request error"""
+
+
+def _api(method):
+    """Wrap a public call with latency/failure injection and clock advancement"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        name = method.__name__
+        self.call_counts[name] = self.call_counts.get(name, 0) + 1
+
+        delay = self._latency_for(name)
+        if delay > 0:
+            time.sleep(delay)
+
+        failure = self._injected_failure(name)
+        if failure is not None:
+            return failure
+
+        with self._lock:
+            self._advance_all()
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _fmt(value):
+    return f"{value:.8f}".rstrip('0').rstrip('.') or '0'
+
+
+class _SymbolBook:
+    """Per-symbol market, position and order state"""
+
+    def __init__(self, symbol, bars, tick_size, qty_step):
+        self.symbol = symbol
+        self.bars = bars                  # Completed bars: [start_ms, o, h, l, c, v]
+        self.tick_size = tick_size
+        self.qty_step = qty_step
+
+        self.bar_start = None
+        self.bar_plan = None              # Full OHLCV of the forming bar
+        self.path = []
+        self.tick_idx = 0
+        self.forming = None               # Forming bar as seen so far
+        self.last_price = bars[-1][4] if bars else 0.0
+
+        # One-way mode position
+        self.side = ''
+        self.size = 0.0
+        self.avg_price = 0.0
+        self.stop_loss = 0.0
+        self.take_profit = 0.0
+        self.trailing_stop = 0.0
+        self.trail_extreme = 0.0
+        self.realised_pnl = 0.0
+
+        self.orders = {}                  # orderId -> order dict (working orders)
+
+
+class SimExchange:
+    """Offline Bybit v5 stand-in exposing the pybit HTTP call surface"""
+
+    def __init__(self, symbols=None, start_price=600.0, balance=10000.0, speed=1.0,
+                 bar_minutes=5, ticks_per_bar=60, volatility=0.002, spread_bps=1.0,
+                 latency=0.0, latency_jitter=0.0, failure_rate=0.0, failure_mode='retcode',
+                 failure_rates=None, taker_fee=0.00055, maker_fee=0.0002,
+                 candles=None, history=200, seed=None, start_ms=None):
+        self.speed = speed
+        self.bar_ms = int(bar_minutes * 60_000)
+        self.ticks_per_bar = max(4, int(ticks_per_bar))
+        self.tick_ms = self.bar_ms / self.ticks_per_bar
+        self.volatility = volatility
+        self.spread_bps = spread_bps
+        self.start_price = start_price
+
+        # Fault injection
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.failure_rates = failure_rates or {}
+
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.wallet_balance = balance
+        self.history = history
+        self.call_counts = {}
+        self.executions = []
+        self.closed_orders = {}
+
+        self._rng = random.Random(seed)
+        # Latency and failure draws happen from many threads in call order, keep them off the price path
+        self._fault_rng = random.Random(None if seed is None else seed + 1)
+        self._lock = threading.RLock()
+        self._candles = candles or {}     # symbol -> DataFrame to replay
+        self._replay_pos = {}
+        self._books = {}
+
+        # Simulated clock, accelerated by `speed`
+        first_replay = self._first_replay_start()
+        if start_ms is None:
+            start_ms = first_replay if first_replay is not None else int(time.time() * 1000)
+        self._t0_real = time.monotonic()
+        self._t0_sim = start_ms - start_ms % self.bar_ms
+
+        # Streaming
+        self._subscribers = {}
+        self._stream_queue = []
+        self._pump_thread = None
+        self._pump_stop = threading.Event()
+
+        for symbol in symbols or []:
+            self._book(symbol)
+
+    @classmethod
+    def from_env(cls):
+        """Build a simulator from SIM_* environment variables"""
+        candles = None
+        symbol = os.getenv('SIM_SYMBOL')
+        path = os.getenv('SIM_CANDLES')
+        if path and symbol:
+            candles = {symbol: cls.load_candles(path)}
+
+        seed = os.getenv('SIM_SEED')
+        return cls(
+            symbols=[symbol] if symbol else None,
+            start_price=float(os.getenv('SIM_START_PRICE', '600')),
+            balance=float(os.getenv('SIM_BALANCE', '10000')),
+            speed=float(os.getenv('SIM_SPEED', '1')),
+            latency=float(os.getenv('SIM_LATENCY_MS', '0')) / 1000,
+            latency_jitter=float(os.getenv('SIM_LATENCY_JITTER_MS', '0')) / 1000,
+            failure_rate=float(os.getenv('SIM_FAILURE_RATE', '0')),
+            failure_mode=os.getenv('SIM_FAILURE_MODE', 'retcode'),
+            candles=candles,
+            seed=int(seed) if seed else None
+        )
+
+    @staticmethod
+    def load_candles(path):
+        """Load recorded OHLCV candles from CSV (timestamp in ms or ISO)"""
+        import pandas as pd
+        df = pd.read_csv(path)
+        df.columns = [c.lower() for c in df.columns]
+        if 'timestamp' in df.columns:
+            ts = df['timestamp']
+            if ts.dtype.kind in 'if':
+                df.index = pd.to_datetime(ts, unit='ms')
+            else:
+                df.index = pd.to_datetime(ts)
+        return df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+
+    # ------------------------------------------------------------------
+    # Clock and market data generation
+    # ------------------------------------------------------------------
+
+    def now_ms(self):
+        return int(self._t0_sim + (time.monotonic() - self._t0_real) * self.speed * 1000)
+
+    def _first_replay_start(self):
+        starts = []
+        for df in self._candles.values():
+            if len(df) > self.history:
+                starts.append(int(df.index[self.history].value // 1_000_000))
+        return min(starts) if starts else None
+
+    def _book(self, symbol):
+        book = self._books.get(symbol)
+        if book is None:
+            bars = self._seed_history(symbol)
+            price = bars[-1][4]
+            magnitude = math.floor(math.log10(price)) if price > 0 else 0
+            tick_size = 10.0 ** (magnitude - 4)
+            qty_step = min(1.0, 10.0 ** math.floor(math.log10(10.0 / price))) if price > 0 else 1.0
+            book = _SymbolBook(symbol, bars, tick_size, qty_step)
+            self._books[symbol] = book
+            self._start_bar(book, self._t0_sim)
+        return book
+
+    def _seed_history(self, symbol):
+        df = self._candles.get(symbol)
+        if df is not None:
+            rows = []
+            for ts, row in df.iloc[:self.history].iterrows():
+                rows.append([int(ts.value // 1_000_000), row['open'], row['high'],
+                             row['low'], row['close'], row['volume']])
+            self._replay_pos[symbol] = len(rows)
+            return rows
+
+        rows = []
+        price = self.start_price
+        start = self._t0_sim - self.history * self.bar_ms
+        for i in range(self.history):
+            o, h, l, c, v = self._synthetic_bar(price)
+            rows.append([start + i * self.bar_ms, o, h, l, c, v])
+            price = c
+        return rows
+
+    def _synthetic_bar(self, open_price):
+        ret = self._rng.gauss(0, self.volatility)
+        close = open_price * math.exp(ret)
+        wick = abs(self._rng.gauss(0, self.volatility / 2))
+        high = max(open_price, close) * (1 + wick)
+        low = min(open_price, close) * (1 - abs(self._rng.gauss(0, self.volatility / 2)))
+        volume = self._rng.lognormvariate(8, 0.5)
+        return open_price, high, low, close, volume
+
+    def _next_bar_plan(self, book):
+        df = self._candles.get(book.symbol)
+        if df is not None:
+            pos = self._replay_pos.get(book.symbol, 0)
+            if pos < len(df):
+                self._replay_pos[book.symbol] = pos + 1
+                row = df.iloc[pos]
+                return row['open'], row['high'], row['low'], row['close'], row['volume']
+            # Recording exhausted, hold the last price flat
+            p = book.last_price
+            return p, p, p, p, 0.0
+        return self._synthetic_bar(book.last_price)
+
+    def _start_bar(self, book, start_ms):
+        o, h, l, c, v = self._next_bar_plan(book)
+        book.bar_start = start_ms
+        book.bar_plan = (o, h, l, c, v)
+        book.tick_idx = 0
+        book.forming = [start_ms, o, o, o, o, 0.0]
+
+        # O -> first extreme -> second extreme -> C, sampled over the bar
+        first, second = (h, l) if self._rng.random() < 0.5 else (l, h)
+        n = self.ticks_per_bar
+        points = [o, first, second, c]
+        path = []
+        for k in range(n):
+            t = k / (n - 1) * 3
+            seg = min(int(t), 2)
+            frac = t - seg
+            path.append(points[seg] + (points[seg + 1] - points[seg]) * frac)
+        book.path = path
+
+    def _advance_all(self):
+        now = self.now_ms()
+        for book in self._books.values():
+            self._advance(book, now)
+
+    def _advance(self, book, now):
+        while True:
+            if book.tick_idx >= self.ticks_per_bar:
+                o, h, l, c, v = book.bar_plan
+                book.bars.append([book.bar_start, o, h, l, c, v])
+                if len(book.bars) > 2000:
+                    del book.bars[:len(book.bars) - 2000]
+                self._start_bar(book, book.bar_start + self.bar_ms)
+                continue
+
+            tick_ms = book.bar_start + book.tick_idx * self.tick_ms
+            if tick_ms > now:
+                break
+
+            price = book.path[book.tick_idx]
+            book.tick_idx += 1
+            bar = book.forming
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += book.bar_plan[4] / self.ticks_per_bar
+            book.last_price = price
+            self._on_tick(book, price, int(tick_ms))
+
+    # ------------------------------------------------------------------
+    # Matching engine
+    # ------------------------------------------------------------------
+
+    def _quotes(self, book):
+        half = max(book.tick_size, book.last_price * self.spread_bps / 20000)
+        return book.last_price - half, book.last_price + half
+
+    def _on_tick(self, book, price, ts):
+        # Resting limit orders fill as maker once the price trades through
+        for order in list(book.orders.values()):
+            limit = float(order['price'])
+            if (order['side'] == 'Buy' and price <= limit) or (order['side'] == 'Sell' and price >= limit):
+                self._execute_order(book, order, limit, is_maker=True)
+
+        if book.size > 0:
+            self._check_position_triggers(book, price)
+
+        if book.symbol in self._subscribers:
+            bid, ask = self._quotes(book)
+            self._stream_queue.append((book.symbol, {
+                'topic': f"tickers.{book.symbol}",
+                'type': 'snapshot',
+                'ts': ts,
+                'data': {
+                    'symbol': book.symbol,
+                    'lastPrice': _fmt(price),
+                    'bid1Price': _fmt(bid),
+                    'ask1Price': _fmt(ask),
+                    'markPrice': _fmt(price)
+                }
+            }))
+
+    def _check_position_triggers(self, book, price):
+        long = book.side == 'Buy'
+
+        if book.trailing_stop > 0:
+            if long:
+                book.trail_extreme = max(book.trail_extreme, price)
+                trail = book.trail_extreme - book.trailing_stop
+                book.stop_loss = max(book.stop_loss, trail) if book.stop_loss else trail
+            else:
+                book.trail_extreme = min(book.trail_extreme, price)
+                trail = book.trail_extreme + book.trailing_stop
+                book.stop_loss = min(book.stop_loss, trail) if book.stop_loss else trail
+
+        stop_hit = book.stop_loss and ((long and price <= book.stop_loss) or
+                                       (not long and price >= book.stop_loss))
+        tp_hit = book.take_profit and ((long and price >= book.take_profit) or
+                                       (not long and price <= book.take_profit))
+        if stop_hit or tp_hit:
+            close_side = 'Sell' if long else 'Buy'
+            self._fill(book, close_side, book.size, price, is_maker=False,
+                       reason='StopLoss' if stop_hit else 'TakeProfit')
+
+    def _fill(self, book, side, qty, price, is_maker, order_id=None, reason=None):
+        signed_pos = book.size if book.side == 'Buy' else -book.size
+        signed_qty = qty if side == 'Buy' else -qty
+
+        if signed_pos == 0 or (signed_pos > 0) == (signed_qty > 0):
+            total = abs(signed_pos) + qty
+            book.avg_price = (abs(signed_pos) * book.avg_price + qty * price) / total
+        else:
+            closed = min(qty, abs(signed_pos))
+            direction = 1 if signed_pos > 0 else -1
+            pnl = closed * (price - book.avg_price) * direction
+            book.realised_pnl += pnl
+            self.wallet_balance += pnl
+            if qty > abs(signed_pos):
+                book.avg_price = price
+
+        new_pos = signed_pos + signed_qty
+        if abs(new_pos) < 1e-12:
+            new_pos = 0.0
+        book.size = abs(new_pos)
+        book.side = '' if new_pos == 0 else ('Buy' if new_pos > 0 else 'Sell')
+
+        fee = qty * price * (self.maker_fee if is_maker else self.taker_fee)
+        self.wallet_balance -= fee
+
+        if book.size == 0:
+            book.avg_price = 0.0
+            book.stop_loss = book.take_profit = book.trailing_stop = book.trail_extreme = 0.0
+
+        self.executions.append({
+            'symbol': book.symbol, 'side': side, 'qty': qty, 'price': price,
+            'fee': fee, 'isMaker': is_maker, 'orderId': order_id,
+            'reason': reason, 'time': self.now_ms()
+        })
+
+    def _execute_order(self, book, order, price, is_maker):
+        qty = float(order['leavesQty'])
+        if order.get('reduceOnly'):
+            qty = min(qty, book.size)
+        if qty > 0:
+            self._fill(book, order['side'], qty, price, is_maker, order_id=order['orderId'])
+
+        order['cumExecQty'] = _fmt(float(order['cumExecQty']) + qty)
+        order['leavesQty'] = '0'
+        order['avgPrice'] = _fmt(price)
+        order['orderStatus'] = 'Filled'
+        order['updatedTime'] = str(self.now_ms())
+        book.orders.pop(order['orderId'], None)
+        self.closed_orders[order['orderId']] = order
+
+    # ------------------------------------------------------------------
+    # Fault injection helpers
+    # ------------------------------------------------------------------
+
+    def _latency_for(self, name):
+        if self.latency <= 0 and self.latency_jitter <= 0:
+            return 0.0
+        return self.latency + self._fault_rng.uniform(0, self.latency_jitter)
+
+    def _injected_failure(self, name):
+        rate = self.failure_rates.get(name, self.failure_rate)
+        if rate <= 0 or self._fault_rng.random() >= rate:
+            return None
+        if self.failure_mode == 'raise':
+            raise SimExchangeError(f"Simulated transport failure in {name}")
+        return {'retCode': 10016, 'retMsg': 'Simulated server error', 'result': {}, 'retExtInfo': {}}
+
+    def _ok(self, result, ext=None):
+        return {'retCode': 0, 'retMsg': 'OK', 'result': result,
+                'retExtInfo': ext or {}, 'time': self.now_ms()}
+
+    @staticmethod
+    def _err(code, msg):
+        return {'retCode': code, 'retMsg': msg, 'result': {}, 'retExtInfo': {}}
+
+    # ------------------------------------------------------------------
+    # pybit HTTP surface
+    # ------------------------------------------------------------------
+
+    @_api
+    def get_server_time(self, **kwargs):
+        now = self.now_ms()
+        return self._ok({'timeSecond': str(now // 1000), 'timeNano': str(now * 1_000_000)})
+
+    @_api
+    def get_kline(self, category="linear", symbol=None, interval='5', limit=200, **kwargs):
+        book = self._book(symbol)
+        bars = book.bars + [book.forming]
+
+        # Aggregate base bars when a coarser minute interval is requested
+        if str(interval).isdigit():
+            group = max(1, int(interval) * 60_000 // self.bar_ms)
+        else:
+            group = 1
+        if group > 1:
+            span = group * self.bar_ms
+            merged = []
+            for bar in bars:
+                start = bar[0] - bar[0] % span
+                if merged and merged[-1][0] == start:
+                    m = merged[-1]
+                    m[2] = max(m[2], bar[2])
+                    m[3] = min(m[3], bar[3])
+                    m[4] = bar[4]
+                    m[5] += bar[5]
+                else:
+                    merged.append([start] + list(bar[1:]))
+            bars = merged
+
+        limit = min(int(limit), 1000)
+        rows = [[str(int(b[0])), _fmt(b[1]), _fmt(b[2]), _fmt(b[3]), _fmt(b[4]), _fmt(b[5]),
+                 _fmt(b[5] * b[4])] for b in reversed(bars[-limit:])]
+        return self._ok({'category': category, 'symbol': symbol, 'list': rows})
+
+    @_api
+    def get_tickers(self, category="linear", symbol=None, **kwargs):
+        books = [self._book(symbol)] if symbol else list(self._books.values())
+        rows = []
+        for book in books:
+            bid, ask = self._quotes(book)
+            rows.append({
+                'symbol': book.symbol,
+                'lastPrice': _fmt(book.last_price),
+                'markPrice': _fmt(book.last_price),
+                'bid1Price': _fmt(bid),
+                'ask1Price': _fmt(ask)
+            })
+        return self._ok({'category': category, 'list': rows})
+
+    @_api
+    def get_instruments_info(self, category="linear", symbol=None, **kwargs):
+        books = [self._book(symbol)] if symbol else list(self._books.values())
+        return self._ok({'category': category, 'nextPageCursor': '', 'list': [{
+            'symbol': book.symbol,
+            'status': 'Trading',
+            'lotSizeFilter': {'minOrderQty': _fmt(book.qty_step), 'qtyStep': _fmt(book.qty_step)},
+            'priceFilter': {'tickSize': _fmt(book.tick_size)}
+        } for book in books]})
+
+    @_api
+    def get_wallet_balance(self, accountType="UNIFIED", **kwargs):
+        unrealised = sum(self._unrealised(b) for b in self._books.values())
+        return self._ok({'list': [{
+            'accountType': accountType,
+            'totalEquity': _fmt(self.wallet_balance + unrealised),
+            'coin': [{
+                'coin': 'USDT',
+                'walletBalance': _fmt(self.wallet_balance),
+                'equity': _fmt(self.wallet_balance + unrealised),
+                'unrealisedPnl': _fmt(unrealised)
+            }]
+        }]})
+
+    def _unrealised(self, book):
+        if book.size == 0:
+            return 0.0
+        direction = 1 if book.side == 'Buy' else -1
+        return book.size * (book.last_price - book.avg_price) * direction
+
+    def _position_row(self, book):
+        return {
+            'symbol': book.symbol,
+            'positionIdx': 0,
+            'side': book.side,
+            'size': _fmt(book.size),
+            'avgPrice': _fmt(book.avg_price),
+            'markPrice': _fmt(book.last_price),
+            'positionValue': _fmt(book.size * book.avg_price),
+            'unrealisedPnl': _fmt(self._unrealised(book)),
+            'cumRealisedPnl': _fmt(book.realised_pnl),
+            'stopLoss': _fmt(book.stop_loss),
+            'takeProfit': _fmt(book.take_profit),
+            'trailingStop': _fmt(book.trailing_stop)
+        }
+
+    @_api
+    def get_positions(self, category="linear", symbol=None, settleCoin=None, **kwargs):
+        if symbol:
+            rows = [self._position_row(self._book(symbol))]
+        else:
+            rows = [self._position_row(b) for b in self._books.values() if b.size > 0]
+        return self._ok({'category': category, 'list': rows})
+
+    @_api
+    def place_order(self, category="linear", symbol=None, side=None, orderType="Market",
+                    qty=None, price=None, reduceOnly=False, timeInForce=None,
+                    orderLinkId=None, **kwargs):
+        return self._place(symbol, side, orderType, qty, price, reduceOnly, timeInForce, orderLinkId)
+
+    def _place(self, symbol, side, order_type, qty, price, reduce_only, tif, link_id):
+        book = self._book(symbol)
+        try:
+            qty = float(qty)
+        except (TypeError, ValueError):
+            return self._err(10001, 'Qty invalid')
+        if qty <= 0 or side not in ('Buy', 'Sell'):
+            return self._err(10001, 'Params error')
+
+        if reduce_only and (book.size == 0 or book.side == side):
+            return self._err(110017, 'Reduce-only order has same side with current position')
+
+        now = str(self.now_ms())
+        order = {
+            'orderId': uuid.uuid4().hex,
+            'orderLinkId': link_id or '',
+            'symbol': symbol,
+            'side': side,
+            'orderType': order_type,
+            'price': _fmt(float(price)) if price else '0',
+            'qty': _fmt(qty),
+            'leavesQty': _fmt(qty),
+            'cumExecQty': '0',
+            'avgPrice': '0',
+            'timeInForce': tif or ('IOC' if order_type == 'Market' else 'GTC'),
+            'reduceOnly': bool(reduce_only),
+            'orderStatus': 'New',
+            'createdTime': now,
+            'updatedTime': now
+        }
+
+        bid, ask = self._quotes(book)
+        if order_type == 'Market':
+            self._execute_order(book, order, ask if side == 'Buy' else bid, is_maker=False)
+        else:
+            limit = float(price)
+            crosses = (side == 'Buy' and limit >= ask) or (side == 'Sell' and limit <= bid)
+            if crosses and order['timeInForce'] == 'PostOnly':
+                order['orderStatus'] = 'Cancelled'
+                order['rejectReason'] = 'EC_PostOnlyWillTakeLiquidity'
+                self.closed_orders[order['orderId']] = order
+            elif crosses:
+                self._execute_order(book, order, ask if side == 'Buy' else bid, is_maker=False)
+            elif order['timeInForce'] in ('IOC', 'FOK'):
+                order['orderStatus'] = 'Cancelled'
+                self.closed_orders[order['orderId']] = order
+            else:
+                book.orders[order['orderId']] = order
+
+        return self._ok({'orderId': order['orderId'], 'orderLinkId': order['orderLinkId']})
+
+    @_api
+    def place_batch_order(self, category="linear", request=None, **kwargs):
+        results, infos = [], []
+        for leg in request or []:
+            resp = self._place(leg.get('symbol'), leg.get('side'), leg.get('orderType', 'Market'),
+                               leg.get('qty'), leg.get('price'), leg.get('reduceOnly', False),
+                               leg.get('timeInForce'), leg.get('orderLinkId'))
+            results.append({'category': category, 'symbol': leg.get('symbol'),
+                            'orderId': resp['result'].get('orderId', ''),
+                            'orderLinkId': resp['result'].get('orderLinkId', '')})
+            infos.append({'code': resp['retCode'], 'msg': resp['retMsg']})
+        return self._ok({'list': results}, {'list': infos})
+
+    @_api
+    def amend_order(self, category="linear", symbol=None, orderId=None, orderLinkId=None,
+                    price=None, qty=None, **kwargs):
+        book = self._book(symbol)
+        order = self._find_order(book, orderId, orderLinkId)
+        if order is None:
+            return self._err(110001, 'Order does not exist')
+
+        if qty is not None:
+            filled = float(order['cumExecQty'])
+            order['qty'] = _fmt(float(qty))
+            order['leavesQty'] = _fmt(max(float(qty) - filled, 0))
+        if price is not None:
+            order['price'] = _fmt(float(price))
+            bid, ask = self._quotes(book)
+            limit = float(price)
+            crosses = (order['side'] == 'Buy' and limit >= ask) or (order['side'] == 'Sell' and limit <= bid)
+            if crosses and order['timeInForce'] == 'PostOnly':
+                book.orders.pop(order['orderId'], None)
+                order['orderStatus'] = 'Cancelled'
+                order['rejectReason'] = 'EC_PostOnlyWillTakeLiquidity'
+                self.closed_orders[order['orderId']] = order
+            elif crosses:
+                self._execute_order(book, order, ask if order['side'] == 'Buy' else bid, is_maker=False)
+        order['updatedTime'] = str(self.now_ms())
+        return self._ok({'orderId': order['orderId'], 'orderLinkId': order['orderLinkId']})
+
+    @_api
+    def cancel_order(self, category="linear", symbol=None, orderId=None, orderLinkId=None, **kwargs):
+        book = self._book(symbol)
+        order = self._find_order(book, orderId, orderLinkId)
+        if order is None:
+            return self._err(110001, 'Order does not exist')
+        self._cancel(book, order)
+        return self._ok({'orderId': order['orderId'], 'orderLinkId': order['orderLinkId']})
+
+    @_api
+    def cancel_all_orders(self, category="linear", symbol=None, settleCoin=None, **kwargs):
+        books = [self._book(symbol)] if symbol else list(self._books.values())
+        cancelled = []
+        for book in books:
+            for order in list(book.orders.values()):
+                self._cancel(book, order)
+                cancelled.append({'orderId': order['orderId'], 'orderLinkId': order['orderLinkId']})
+        return self._ok({'list': cancelled})
+
+    def _cancel(self, book, order):
+        book.orders.pop(order['orderId'], None)
+        order['orderStatus'] = 'Cancelled'
+        order['updatedTime'] = str(self.now_ms())
+        self.closed_orders[order['orderId']] = order
+
+    @staticmethod
+    def _find_order(book, order_id, link_id):
+        if order_id:
+            return book.orders.get(order_id)
+        for order in book.orders.values():
+            if link_id and order['orderLinkId'] == link_id:
+                return order
+        return None
+
+    @_api
+    def get_open_orders(self, category="linear", symbol=None, orderId=None, settleCoin=None, **kwargs):
+        books = [self._book(symbol)] if symbol else list(self._books.values())
+        rows = [dict(o) for b in books for o in b.orders.values()
+                if not orderId or o['orderId'] == orderId]
+        return self._ok({'category': category, 'list': rows})
+
+    @_api
+    def get_order_history(self, category="linear", symbol=None, orderId=None, limit=50, **kwargs):
+        rows = [dict(o) for o in self.closed_orders.values()
+                if (not symbol or o['symbol'] == symbol) and (not orderId or o['orderId'] == orderId)]
+        rows.sort(key=lambda o: int(o['updatedTime']), reverse=True)
+        return self._ok({'category': category, 'list': rows[:int(limit)]})
+
+    @_api
+    def set_trading_stop(self, category="linear", symbol=None, positionIdx=0, stopLoss=None,
+                         takeProfit=None, trailingStop=None, **kwargs):
+        book = self._book(symbol)
+        if book.size == 0:
+            return self._err(10001, 'can not set tp/sl/ts for zero position')
+
+        long = book.side == 'Buy'
+        price = book.last_price
+        if stopLoss is not None:
+            sl = float(stopLoss)
+            if sl and ((long and sl >= price) or (not long and sl <= price)):
+                return self._err(10001, 'StopLoss set for position is on the wrong side of last price')
+            book.stop_loss = sl
+        if takeProfit is not None:
+            tp = float(takeProfit)
+            if tp and ((long and tp <= price) or (not long and tp >= price)):
+                return self._err(10001, 'TakeProfit set for position is on the wrong side of last price')
+            book.take_profit = tp
+        if trailingStop is not None:
+            book.trailing_stop = float(trailingStop)
+            book.trail_extreme = price
+        return self._ok({})
+
+    # ------------------------------------------------------------------
+    # pybit WebSocket surface
+    # ------------------------------------------------------------------
+
+    def ticker_stream(self, symbol, callback):
+        """Push ticker snapshots for symbol(s) to callback from a pump thread"""
+        symbols = symbol if isinstance(symbol, list) else [symbol]
+        with self._lock:
+            for s in symbols:
+                self._book(s)
+                self._subscribers.setdefault(s, []).append(callback)
+        if self._pump_thread is None:
+            self._pump_thread = threading.Thread(target=self._pump, name="sim-exchange-pump", daemon=True)
+            self._pump_thread.start()
+
+    def _pump(self):
+        interval = max(self.tick_ms / 1000 / self.speed, 0.01)
+        while not self._pump_stop.wait(interval):
+            with self._lock:
+                self._advance_all()
+                messages, self._stream_queue = self._stream_queue, []
+            for symbol, message in messages:
+                for callback in self._subscribers.get(symbol, []):
+                    try:
+                        callback(message)
+                    except Exception as e:
+                        print(f"⚠️ Sim stream callback error | {e}")
+
+    def exit(self):
+        """Stop streaming, same name as pybit WebSocket.exit"""
+        self._pump_stop.set()
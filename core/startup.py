@@ -0,0 +1,48 @@
+import sys
+import time
+
+class StartupProfiler:
+    """Wall time per startup phase, from process start to the first trading cycle"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []            # (name, seconds, modules imported during the phase)
+        self.finished = False
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def finish(self, name="first trading cycle"):
+        """Close the report when the first cycle starts and print it"""
+        if self.finished:
+            return
+        self.finished = True
+        if self.enabled:
+            self.report(name)
+
+    def report(self, name):
+        total = time.perf_counter() - self.started
+        print(f"\n⏱️ Startup Profile | {total * 1000:.0f}ms to {name}")
+        accounted = 0.0
+        for phase, seconds, modules in self.phases:
+            accounted += seconds
+            share = seconds / total * 100 if total else 0.0
+            extra = f" | {modules} modules" if modules else ""
+            print(f"   {phase:<32} {seconds * 1000:8.1f}ms {share:5.1f}%{extra}")
+        print(f"   {'other (event loop, run setup)':<32} {(total - accounted) * 1000:8.1f}ms")
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.modules = len(sys.modules)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        self.profiler.phases.append((self.name, elapsed, len(sys.modules) - self.modules))
+        return False
@@ -0,0 +1,76 @@
+import os
+import json
+import time
+import tempfile
+
+class StateStore:
+    """Atomic on-disk snapshots of engine state for warm restarts, one small JSON file per symbol"""
+
+    def __init__(self, directory, interval=5.0, volatile=()):
+        self.directory = directory
+        self.interval = interval            # Max seconds between writes while state is unchanged
+        self.volatile = set(volatile)       # Keys that change every cycle, written only on the interval
+        self._last = {}                     # key -> (payload without timestamp, monotonic write time)
+        self.writes = 0
+        self.skipped = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, project_root, volatile=()):
+        """None when STATE_SNAPSHOTS=false"""
+        if os.getenv('STATE_SNAPSHOTS', 'true').lower() != 'true':
+            return None
+        directory = os.getenv('STATE_DIR', os.path.join(project_root, '_data', 'state'))
+        return cls(directory, interval=float(os.getenv('STATE_INTERVAL', '5')), volatile=volatile)
+
+    def _stable(self, state):
+        return {k: v for k, v in state.items() if k not in self.volatile}
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def due(self, key, state):
+        """True when state changed or the interval elapsed since the last write"""
+        previous = self._last.get(key)
+        if previous and previous[0] == self._stable(state) and time.monotonic() - previous[1] < self.interval:
+            self.skipped += 1
+            return False
+        return True
+
+    def save(self, key, state, force=False):
+        """Write when due (or forced), returns True if written"""
+        if not force and not self.due(key, state):
+            return False
+        now = time.monotonic()
+
+        payload = dict(state, saved_at=time.time())
+        data = json.dumps(payload, separators=(',', ':'), default=str)
+
+        # Write-then-rename: a crash mid-write leaves the previous snapshot intact
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        self._last[key] = (self._stable(state), now)
+        self.writes += 1
+        return True
+
+    def load(self, key):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ State snapshot unreadable | {key} | {e}")
+            return None
@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+from collections import deque
+
+class StatusRenderer:
+    """Redraws the terminal status from its own thread, so a slow or blocked stdout never stalls trading
+
+    While running it also replaces sys.stdout with a queue, so event prints anywhere on the order
+    path (fills, SL/TP warnings, closes) are written by the renderer thread, never by the caller.
+    """
+
+    def __init__(self, render, refresh_hz=1.0, stream=None, max_events=1000):
+        self.render = render                    # () -> status line, must only read published snapshots
+        self.interval = 1.0 / refresh_hz
+        self.stream = stream or sys.stdout
+        self.events = deque(maxlen=max_events)  # Pending output chunks, oldest dropped when full
+        self.events_dropped = 0
+        self.frames = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stdout = None                     # The real sys.stdout while it is redirected to the queue
+
+    @classmethod
+    def from_env(cls, render):
+        """None when HEADLESS=true or STATUS_REFRESH_HZ=0"""
+        if os.getenv('HEADLESS', 'false').lower() == 'true':
+            return None
+        refresh_hz = float(os.getenv('STATUS_REFRESH_HZ', '1'))
+        if refresh_hz <= 0:
+            return None
+        return cls(render, refresh_hz=refresh_hz)
+
+    def post(self, text):
+        """Queue a line printed once above the status line, never blocks"""
+        self.write(f"\n{text}\n")
+
+    def write(self, text):
+        """Queue raw output, never blocks"""
+        if len(self.events) == self.events.maxlen:
+            self.events_dropped += 1
+        self.events.append(text)
+        self._wake.set()
+        return len(text)
+
+    def start(self):
+        if self._thread is None:
+            if self.stream is sys.stdout and not isinstance(sys.stdout, _QueuedStdout):
+                self._stdout = sys.stdout
+                sys.stdout = _QueuedStdout(self, self._stdout)
+            self._thread = threading.Thread(target=self._run, name="status-renderer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 0.5)
+            self._thread = None
+        if self._stdout is not None:
+            # Shutdown output goes straight to the terminal again
+            sys.stdout, self._stdout = self._stdout, None
+        self._draw()
+
+    def _run(self):
+        # Queued output is written as soon as it arrives, the status line at the refresh rate
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._draw()
+
+    def _draw(self):
+        try:
+            out = []
+            while self.events:
+                out.append(self.events.popleft())
+            status = self.render()
+            if status:
+                out.append(f"\r{status}")
+            if out:
+                self.stream.write(''.join(out))
+                self.stream.flush()
+                self.frames += 1
+        except Exception:
+            # Rendering is best effort, a broken terminal must not take the renderer down
+            pass
+
+class _QueuedStdout:
+    """sys.stdout stand-in that hands writes to the renderer thread"""
+
+    def __init__(self, renderer, stream):
+        self._renderer = renderer
+        self._stream = stream
+
+    def write(self, text):
+        return self._renderer.write(text)
+
+    def flush(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
@@ -1,65 +1,172 @@
 import os
+import time
+import asyncio
+from collections import deque
 from datetime import datetime
 
+MAX_MESSAGE_LEN = 4096  # Telegram's limit per message
+
 class TelegramNotifier:
     def __init__(self):
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
         self.enabled = bool(self.bot_token and self.chat_id)
-        self.position_start_time = None
+        self.position_start_times = {}  # symbol -> open time, shared notifier serves many engines
         self.bot = None
 
+        # Outbox served by a background worker so trading code never waits on Telegram
+        self.outbox = deque(maxlen=int(os.getenv('TELEGRAM_QUEUE_SIZE', '100')))
+        self.coalesce_window = float(os.getenv('TELEGRAM_COALESCE_MS', '1000')) / 1000
+        self.min_interval = float(os.getenv('TELEGRAM_MIN_INTERVAL', '1.0'))  # ~1 msg/s per chat
+        self.dropped = 0            # Dropped since the last delivered summary
+        self.dropped_total = 0
+        self.sent = 0
+        self.queued = 0
+        self._worker = None
+        self._wakeup = None
+        self._sending = False
+        self._last_sent = 0.0
+
         if not self.enabled:
             print("ℹ️ Telegram notifications disabled")
             return
 
-        try:
-            from telegram import Bot
-            self.bot = Bot(token=self.bot_token)
-            print("✅ Telegram notifications enabled")
-        except ImportError:
-            print("⚠️ python-telegram-bot not installed")
-            self.enabled = False
-        except Exception as e:
-            print(f"⚠️ Telegram init failed: {e}")
-            self.enabled = False
+        # python-telegram-bot is imported by the outbox worker on first send, not at startup
+        print("✅ Telegram notifications enabled")
+
+    def _get_bot(self):
+        if self.bot is None and self.enabled:
+            try:
+                from telegram import Bot
+                self.bot = Bot(token=self.bot_token)
+            except ImportError:
+                print("⚠️ python-telegram-bot not installed")
+                self.enabled = False
+            except Exception as e:
+                print(f"⚠️ Telegram init failed: {e}")
+                self.enabled = False
+        return self.bot
 
     async def send_message(self, message):
-        if not self.enabled or not self.bot:
+        """Queue message and return immediately, delivery happens on the outbox worker"""
+        if not self.enabled:
             print(f"📱 {message}")
             return
-        try:
-            await self.bot.send_message(chat_id=self.chat_id, text=message)
-        except Exception as e:
-            print(f"❌ Telegram error: {e}\n📱 {message}")
+        if len(self.outbox) == self.outbox.maxlen:
+            # Full: the oldest message goes, a count of losses rides on the next delivery
+            self.dropped += 1
+            self.dropped_total += 1
+        self.outbox.append(message)
+        self.queued += 1
+        self._ensure_worker()
+        self._wakeup.set()
+
+    @property
+    def queue_depth(self):
+        return len(self.outbox)
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let a burst (e.g. many closes at shutdown) land so it goes out as one message
+            if self.coalesce_window > 0:
+                await asyncio.sleep(self.coalesce_window)
+
+            while self.outbox or self.dropped:
+                wait = self.min_interval - (time.monotonic() - self._last_sent)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._sending = True
+                try:
+                    if await asyncio.to_thread(self._get_bot) is None:
+                        # Bot unavailable: fall back to the console for what is queued
+                        while self.outbox:
+                            print(f"📱 {self.outbox.popleft()}")
+                        self.dropped = 0
+                        continue
+                    await self._deliver(self._next_batch())
+                finally:
+                    self._sending = False
+                    self._last_sent = time.monotonic()
+
+    def _next_batch(self):
+        """Join queued messages into one Telegram message up to the length limit"""
+        parts = []
+        if self.dropped:
+            parts.append(f"⚠️ {self.dropped} notifications dropped (queue full)")
+            self.dropped = 0
+        size = sum(len(p) + 2 for p in parts)
+        while self.outbox:
+            message = self.outbox[0]
+            if parts and size + len(message) > MAX_MESSAGE_LEN:
+                break
+            parts.append(self.outbox.popleft())
+            size += len(message) + 2
+        return "\n\n".join(parts)[:MAX_MESSAGE_LEN]
+
+    async def _deliver(self, text):
+        for attempt in range(2):
+            try:
+                await self.bot.send_message(chat_id=self.chat_id, text=text)
+                self.sent += 1
+                return
+            except Exception as e:
+                # RetryAfter (flood control) tells us how long to back off, retry once
+                retry_after = getattr(e, 'retry_after', None)
+                if retry_after is not None and attempt == 0:
+                    delay = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+                    await asyncio.sleep(delay)
+                    continue
+                print(f"❌ Telegram error: {e}\n📱 {text}")
+                return
+
+    async def flush(self, timeout=10.0):
+        """Wait for the outbox to drain, used on shutdown"""
+        if self._worker is None or self._worker.done():
+            return
+        self.coalesce_window = 0
+        self._wakeup.set()
+        deadline = time.monotonic() + timeout
+        while (self.outbox or self._sending) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self.outbox:
+            print(f"⚠️ Telegram | {len(self.outbox)} notifications not delivered before shutdown")
+        self._worker.cancel()
 
     async def trade_opened(self, symbol, price, size, side):
-        self.position_start_time = datetime.now()
+        symbol_short = symbol.replace('/', '')
+        opened_at = datetime.now()
+        self.position_start_times[symbol_short] = opened_at
         direction = "📈 LONG" if side == "Buy" else "📉 SHORT"
         value = size * price
-        symbol_short = symbol.replace('/', '')
         
         msg = (f"{direction} {symbol_short}\n"
                f"💵 ${value:.0f} @ ${price:.2f}\n"
                f"💸 Risk: $100 fixed\n"
-               f"⏰ {self.position_start_time:%H:%M:%S}")
+               f"⏰ {opened_at:%H:%M:%S}")
         await self.send_message(msg)
 
     async def trade_closed(self, symbol, pnl_pct, pnl_usd, reason="Signal"):
+        symbol_short = symbol.replace('/', '')
         close_time = datetime.now()
         duration = "N/A"
         
-        if self.position_start_time:
-            minutes = (close_time - self.position_start_time).total_seconds() / 60
+        opened_at = self.position_start_times.pop(symbol_short, None)
+        if opened_at:
+            minutes = (close_time - opened_at).total_seconds() / 60
             if minutes < 60:
                 duration = f"{int(minutes)}m"
             else:
                 hours, mins = int(minutes // 60), int(minutes % 60)
                 duration = f"{hours}h {mins}m"
-            self.position_start_time = None
 
         status = "✅ WIN" if pnl_usd > 0 else "❌ LOSS"
-        symbol_short = symbol.replace('/', '')
         
         msg = (f"{status} {symbol_short}\n"
                f"💰 ${pnl_usd:+.2f}\n"
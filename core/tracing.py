@@ -0,0 +1,174 @@
+import os
+import sys
+import time
+import uuid
+import threading
+import contextvars
+
+# Stamps in pipeline order, offsets are logged relative to the start of the market data fetch
+STAGES = ('receipt', 'parse', 'indicators', 'signal', 'sizing', 'send', 'ack', 'sltp')
+
+_current = contextvars.ContextVar('trace', default=None)
+
+class Trace:
+    """One pass through the pipeline, from kline request to SL/TP set"""
+
+    __slots__ = ('id', 'symbol', 'wall', 't0', 'marks', 'outcome')
+
+    def __init__(self, symbol, trace_id=None):
+        self.id = trace_id or uuid.uuid4().hex[:16]
+        self.symbol = symbol
+        self.wall = time.time()
+        self.t0 = time.perf_counter_ns()
+        self.marks = []             # (stage, ns since t0)
+        self.outcome = 'no_signal'
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter_ns() - self.t0))
+
+    def fork(self, suffix):
+        """Copy for one fan-out account, same market data and signal stamps"""
+        child = Trace(self.symbol, f"{self.id}-{suffix}"[:36])
+        child.wall, child.t0, child.marks = self.wall, self.t0, list(self.marks)
+        return child
+
+    def line(self):
+        stamps = ' '.join(f"{stage}={ns // 1000}" for stage, ns in self.marks)
+        return f"{self.id} {self.symbol} {int(self.wall * 1000)} {self.outcome} {stamps}\n"
+
+def mark(stage):
+    """Stamp the trace active in this context, a no-op when tracing is off"""
+    trace = _current.get()
+    if trace is not None:
+        trace.mark(stage)
+
+class _Active:
+    __slots__ = ('trace', 'token')
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def __enter__(self):
+        self.token = _current.set(self.trace)
+        return self.trace
+
+    def __exit__(self, *exc):
+        _current.reset(self.token)
+        return False
+
+def active(trace):
+    """Make trace the target of mark() inside the block (the strategy stamps through this)"""
+    return _Active(trace)
+
+class Tracer:
+    """Buffers finished traces as one compact line each and appends them to TRACE_FILE"""
+
+    def __init__(self, path, flush_every=32, flush_interval=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def from_env(cls, project_root):
+        """None unless TRACING=true"""
+        if os.getenv('TRACING', 'false').lower() != 'true':
+            return None
+        path = os.getenv('TRACE_FILE', os.path.join(project_root, '_data', 'traces', 'trace.log'))
+        return cls(path, flush_interval=float(os.getenv('TRACE_FLUSH_INTERVAL', '5')))
+
+    def begin(self, symbol):
+        return Trace(symbol)
+
+    def finish(self, trace):
+        with self._lock:
+            self._buffer.append(trace.line())
+            due = (len(self._buffer) >= self.flush_every or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not lines:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(''.join(lines))
+        except OSError as e:
+            print(f"\n⚠️ Tracing | Write failed | {e}")
+
+def parse_line(line):
+    """(trace_id, symbol, wall_ms, outcome, {stage: microseconds})"""
+    parts = line.split()
+    stamps = {}
+    for item in parts[4:]:
+        stage, _, us = item.partition('=')
+        stamps[stage] = int(us)
+    return parts[0], parts[1], int(parts[2]), parts[3], stamps
+
+def summarize(path, outcome=None, symbol=None):
+    from core.latency import LatencyHistogram
+
+    segments = {}               # 'prev→stage' -> LatencyHistogram
+    totals = {name: LatencyHistogram() for name in ('fetch→ack', 'receipt→ack', 'fetch→sltp')}
+    outcomes = {}
+    count = 0
+
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            _, sym, _, result, stamps = parse_line(line)
+            if (outcome and result != outcome) or (symbol and sym != symbol):
+                continue
+            count += 1
+            outcomes[result] = outcomes.get(result, 0) + 1
+
+            prev, prev_us = 'fetch', 0
+            for stage in STAGES:
+                if stage not in stamps:
+                    continue
+                key = f"{prev}→{stage}"
+                hist = segments.get(key)
+                if hist is None:
+                    hist = segments[key] = LatencyHistogram()
+                hist.record(stamps[stage] - prev_us)
+                prev, prev_us = stage, stamps[stage]
+
+            if 'ack' in stamps:
+                totals['fetch→ack'].record(stamps['ack'])
+                if 'receipt' in stamps:
+                    totals['receipt→ack'].record(stamps['ack'] - stamps['receipt'])
+            if 'sltp' in stamps:
+                totals['fetch→sltp'].record(stamps['sltp'])
+
+    print(f"🔎 Traces | {path} | {count} traces | " +
+          ", ".join(f"{k}: {v}" for k, v in sorted(outcomes.items())))
+    print(f"   {'segment':<24} {'p50':>8} {'p99':>8} {'max':>8}  (ms)")
+    for key, hist in list(segments.items()) + [(k, h) for k, h in totals.items() if h.count]:
+        s = hist.summary()
+        print(f"   {key:<24} {s['p50_ms']:8.2f} {s['p99_ms']:8.2f} {s['max_ms']:8.2f}  n={s['count']}")
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize tick-to-trade traces")
+    parser.add_argument('path', nargs='?', default=os.getenv('TRACE_FILE', os.path.join('_data', 'traces', 'trace.log')))
+    parser.add_argument('--outcome', help="Only traces with this outcome (entry, entry_failed, close, no_signal, ...)")
+    parser.add_argument('--symbol', help="Only traces for this linear symbol, e.g. BNBUSDT")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"❌ No trace file at {args.path} | Run the bot with TRACING=true")
+        return 1
+    summarize(args.path, args.outcome, args.symbol)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,49 @@
 import os
+import time
 import asyncio
 import pandas as pd
 from datetime import datetime
-from pybit.unified_trading import HTTP
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from strategies.RSI_MFI_Cloud import RSIMFICloudStrategy
 from core.risk_management import RiskManager
 from core.telegram_notifier import TelegramNotifier
+from core.order_batcher import OrderBatcher
+from core.market_stream import MarketStream
+from core.trailing_stop import LocalTrailingStop
+from core.limit_executor import LimitOrderExecutor
+from core.status_renderer import StatusRenderer
+from core.scheduler import CycleScheduler
+from core.state_store import StateStore
+from core.latency import LatencyRecorder, InstrumentedExchange
+from core.api_usage import ApiUsage
+from core import metrics, tracing
+from core.tracing import Tracer
+from core.profiler import CycleProfiler
+from core.loop_watchdog import LoopWatchdog
+from core.memory_telemetry import MemoryTelemetry
+from core.journal import DecisionJournal
+from contextlib import nullcontext
 
 load_dotenv(override=True)
 
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class TradeEngine:
-    def __init__(self):
-        self.risk_manager = RiskManager()
+    def __init__(self, exchange=None, symbol=None, notifier=None):
+        self.risk_manager = RiskManager(symbol) if symbol else RiskManager()
         self.strategy = RSIMFICloudStrategy(self.risk_manager)
         
         print("✅ Risk management initialized")
         print("✅ RSI/MFI strategy loaded")
         
-        self.notifier = TelegramNotifier()
+        self.notifier = notifier or TelegramNotifier()
         
         self.symbol = self.risk_manager.symbol
         self.linear = self.risk_manager.linear
         self.demo_mode = os.getenv('DEMO_MODE', 'true').lower() == 'true'
+        self.exchange_name = os.getenv('EXCHANGE', 'bybit').lower()
         
         # API credentials
         if self.demo_mode:
@@ -34,7 +54,8 @@ class TradeEngine:
             self.api_secret = os.getenv('LIVE_BYBIT_API_SECRET')
         
         # State
-        self.exchange = None
+        self.exchange = exchange
+        self.batcher = None
         self.running = False
         self.position = None
         self.profit_lock_active = False
@@ -42,6 +63,65 @@ class TradeEngine:
         self.position_side = None
         self.position_start_time = None
         self.pending_order = None
+        self.symbol_info = None
+        self.display_enabled = True
+        self.renderer = None
+        self.status = None      # Immutable snapshot swapped in each cycle, read by the renderer thread
+        self.kline_interval = '5'
+        self.scheduler = None
+        
+        # Coalesced position snapshot supplied by MultiSymbolEngine (None = query directly)
+        self.position_feed = None
+        self._position_dirty = False
+        
+        # Portfolio risk cap shared across supervisor workers (None = unlimited)
+        self.risk_budget = None
+        
+        # Optional tick-driven trailing stop (LOCAL_TRAILING=true)
+        self.local_trailing = os.getenv('LOCAL_TRAILING', 'false').lower() == 'true'
+        self.trailing_amend_ticks = int(os.getenv('TRAILING_AMEND_TICKS', '5'))
+        self.market_stream = None
+        self.trailer = None
+        
+        # Entry execution: 'market' or maker-first 'limit' (ENTRY_ORDER_TYPE)
+        self.entry_order_type = os.getenv('ENTRY_ORDER_TYPE', 'market').lower()
+        self.limit_executor = None
+        
+        # Hard limit for flatten-all on shutdown / kill switch
+        self.flatten_deadline = float(os.getenv('FLATTEN_DEADLINE', '10'))
+        
+        # Warm restart snapshots (STATE_SNAPSHOTS=false to disable)
+        self.state_store = StateStore.from_env(project_root, volatile=('last_rsi', 'last_mfi'))
+        self.state_key = self.linear
+        self._restored_stop = None
+        
+        # Per-stage and per-exchange-call latency histograms (LATENCY_TRACKING=false to disable)
+        self.latency = LatencyRecorder.from_env()
+        
+        # Per-endpoint call counts, bytes, retCodes and rate-limit headroom (API_ACCOUNTING=false to disable)
+        self.api_usage = ApiUsage.from_env(self.linear)
+        
+        # Tick-to-trade traces, one compact line per cycle (TRACING=true)
+        self.tracer = Tracer.from_env(project_root)
+        self._trace = None
+        
+        # On-demand profile of the next N cycles (PROFILE_CYCLES=N or SIGUSR1)
+        self.profiler = CycleProfiler.from_env(project_root)
+        
+        # Event-loop lag and blocking-call detector, started by run() (LOOP_WATCHDOG=false to disable)
+        self.watchdog = None
+        
+        # Binary journal of bars, decisions and orders for replay (JOURNAL=false to disable)
+        self.journal = DecisionJournal.from_env(project_root)
+        
+        # RSS, tracemalloc sites and per-cycle churn, started by run() (MEMORY_TELEMETRY=true)
+        self.memory = None
+        
+        # Startup
+        self.startup_profiler = None
+        self.startup_balance = 0
+        self.startup_price = None
+        self._warm_df = None
         
         # Error tracking
         self._last_market_data_error = None
@@ -50,62 +130,83 @@ class TradeEngine:
     
     def connect(self):
         try:
-            self.exchange = HTTP(
-                demo=self.demo_mode,
-                api_key=self.api_key,
-                api_secret=self.api_secret
-            )
+            if self.exchange is None and self.exchange_name == 'sim':
+                from core.sim_exchange import SimExchange
+                self.exchange = SimExchange.from_env()
+            elif self.exchange is None:
+                from pybit.unified_trading import HTTP
+                self.exchange = HTTP(
+                    demo=self.demo_mode,
+                    api_key=self.api_key,
+                    api_secret=self.api_secret
+                )
+            if not isinstance(self.exchange, InstrumentedExchange):
+                self.exchange = InstrumentedExchange(self.exchange, self.latency, self.api_usage)
+            self.batcher = OrderBatcher(self.exchange)
             
-            server_time = self.exchange.get_server_time()
-            if server_time.get('retCode') == 0:
-                mode = "Testnet" if self.demo_mode else "Live"
-                print(f"✅ Connected to Bybit {mode}")
-                
-                # Test market data
-                test_data = self.get_market_data()
-                if test_data is not None:
-                    print(f"✅ Market data connection active")
-                else:
-                    print(f"⚠️ Market data connection issues")
-                
-                # Test symbol info
-                symbol_info = self.get_symbol_info()
-                if symbol_info:
-                    print(f"✅ Symbol info loaded for {self.symbol}")
-                else:
-                    print(f"⚠️ Symbol info loading issues")
+            # Connect-time probes are independent, run them concurrently
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                server_time = pool.submit(self.exchange.get_server_time)
+                market_data = pool.submit(self.get_market_data)
+                symbol_info = pool.submit(self.get_symbol_info)
+                balance = pool.submit(self.get_wallet_balance)
                 
-                # Test balance
-                balance = self.get_wallet_balance()
-                print(f"✅ Wallet balance: ${balance:,.2f}")
-                
-                return True
-            return False
+                if server_time.result().get('retCode') != 0:
+                    return False
+                test_data = market_data.result()
+                self.symbol_info = symbol_info.result()
+                self.startup_balance = balance.result()
+            
+            # Warm restart mutates position and strategy state, so only once the probes are done
+            self.restore_state()
+            
+            mode = "Testnet" if self.demo_mode else "Live"
+            if self.exchange_name == 'sim':
+                mode = "Simulator"
+            print(f"✅ Connected to Bybit {mode}")
+            
+            if test_data is not None:
+                print(f"✅ Market data connection active")
+                # First cycle reuses this frame instead of fetching it again
+                self._warm_df = (time.monotonic(), test_data)
+                self.startup_price = float(test_data['close'].iloc[-1])
+            else:
+                print(f"⚠️ Market data connection issues")
+            
+            if self.symbol_info:
+                print(f"✅ Symbol info loaded for {self.symbol}")
+            else:
+                print(f"⚠️ Symbol info loading issues")
+            
+            print(f"✅ Wallet balance: ${self.startup_balance:,.2f}")
+            return True
+            
         except Exception as e:
             print(f"❌ Connection Error | {e}")
             return False
     
     def get_market_data(self):
         try:
+            trace = self.tracer.begin(self.linear) if self.tracer else None
             klines = self.exchange.get_kline(
                 category="linear",
                 symbol=self.linear,
-                interval='5',
+                interval=self.kline_interval,
                 limit=100
             )
+            if trace:
+                trace.mark('receipt')
             
             if klines.get('retCode') != 0 or not klines.get('result', {}).get('list'):
                 return None
             
-            data = klines['result']['list']
-            df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'].astype(float), unit='ms')
-            df = df.set_index('timestamp')
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
+            with self._stage('cycle.dataframe'):
+                df = self.parse_klines(klines['result']['list'])
             
-            return df.sort_index()
+            if trace:
+                trace.mark('parse')
+                self._trace = trace
+            return df
             
         except Exception as e:
             # Only print error occasionally to avoid spam
@@ -116,6 +217,18 @@ class TradeEngine:
                 self._last_market_data_error = now
             return None
     
+    @staticmethod
+    def parse_klines(data):
+        """Bybit kline rows (newest first, all strings) to an ascending OHLCV DataFrame"""
+        df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'].astype(float), unit='ms')
+        df = df.set_index('timestamp')
+        
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = pd.to_numeric(df[col])
+        
+        return df.sort_index()
+    
     def get_wallet_balance(self):
         try:
             resp = self.exchange.get_wallet_balance(accountType="UNIFIED")
@@ -130,14 +243,19 @@ class TradeEngine:
     def check_position(self):
         """Check current position"""
         try:
-            pos_resp = self.exchange.get_positions(category="linear", symbol=self.linear)
-            if pos_resp.get('retCode') != 0:
-                self._clear_position()
-                return None
+            if self.position_feed and not self._position_dirty:
+                snapshot = self.position_feed()
+                positions = [snapshot] if snapshot else []
+            else:
+                pos_resp = self.exchange.get_positions(category="linear", symbol=self.linear)
+                if pos_resp.get('retCode') != 0:
+                    self._clear_position()
+                    return None
                 
-            positions = pos_resp.get('result', {}).get('list', [])
+                positions = pos_resp.get('result', {}).get('list', [])
             if not positions:
                 self._clear_position()
+                self._release_risk()
                 return None
             
             position = positions[0]
@@ -145,6 +263,7 @@ class TradeEngine:
             
             if position_size <= 0:
                 self._clear_position()
+                self._release_risk()
                 return None
             
             # Check if this is a new position
@@ -162,6 +281,14 @@ class TradeEngine:
             self.entry_price = self.position['avg_price']
             self.position_side = self.position['side'].lower()
             
+            if self.risk_budget:
+                self.risk_budget.hold(self.linear)
+            
+            if self.trailer:
+                self.trailer.watch(self.position_side, self.entry_price,
+                                   self.symbol_info or self.get_symbol_info(),
+                                   active=self.profit_lock_active)
+            
             return self.position
             
         except Exception as e:
@@ -182,21 +309,31 @@ class TradeEngine:
         self.position_side = None
         self.position_start_time = None
         self.pending_order = None
+        if self.trailer:
+            self.trailer.reset()
+
+    def _release_risk(self):
+        """Return this symbol's share of the portfolio risk budget once confirmed flat"""
+        if self.risk_budget:
+            self.risk_budget.release(self.linear)
 
     def get_symbol_info(self):
         try:
             resp = self.exchange.get_instruments_info(category="linear", symbol=self.linear)
             if resp.get('retCode') == 0 and resp['result']['list']:
-                info = resp['result']['list'][0]
-                return {
-                    'min_qty': float(info['lotSizeFilter']['minOrderQty']),
-                    'qty_step': float(info['lotSizeFilter']['qtyStep']),
-                    'tick_size': float(info['priceFilter']['tickSize'])
-                }
+                return self.parse_symbol_info(resp['result']['list'][0])
             return None
         except:
             return None
     
+    @staticmethod
+    def parse_symbol_info(info):
+        return {
+            'min_qty': float(info['lotSizeFilter']['minOrderQty']),
+            'qty_step': float(info['lotSizeFilter']['qtyStep']),
+            'tick_size': float(info['priceFilter']['tickSize'])
+        }
+    
     def format_qty(self, info, raw_qty):
         step = info['qty_step']
         qty = float(int(raw_qty / step) * step)
@@ -220,6 +357,12 @@ class TradeEngine:
         """Handle profit lock activation"""
         if not self.position or not self.entry_price:
             return
+        
+        if self.trailer:
+            # Stream-driven; the 1s poll only backs it up when ticks go stale
+            if not self.market_stream.is_fresh(self.linear):
+                self.trailer.on_price(current_price)
+            return
             
         # Check for profit lock activation
         if not self.profit_lock_active:
@@ -234,9 +377,7 @@ class TradeEngine:
                 else:
                     profit_pct = ((self.entry_price - current_price) / self.entry_price) * 100
                 
-                protected_value = self.position['size'] * current_price * (profit_pct / 100)
-                
-                print(f"\n🔒 Profit Lock | +{profit_pct:.1f}% | Trailing: {self.risk_manager.trailing_stop_pct*100:.1f}% | Protected: ${protected_value:.2f}")
+                self._print_profit_lock(current_price, profit_pct)
                 
                 # Set trailing stop
                 await self._set_trailing_stop(current_price)
@@ -245,10 +386,66 @@ class TradeEngine:
                     self.symbol, profit_pct, self.risk_manager.trailing_stop_pct * 100
                 )
 
+    def _print_profit_lock(self, current_price, profit_pct):
+        protected_value = self.position['size'] * current_price * (profit_pct / 100) if self.position else 0
+        print(f"\n🔒 Profit Lock | +{profit_pct:.1f}% | Trailing: {self.risk_manager.trailing_stop_pct*100:.1f}% | Protected: ${protected_value:.2f}")
+
+    def _start_local_trailing(self):
+        """Drive profit lock and trailing from the ticker stream instead of the poll"""
+        if not self.local_trailing or self.trailer:
+            return
+        
+        self._ensure_market_stream()
+        
+        self.trailer = LocalTrailingStop(
+            self.exchange, self.linear, self.risk_manager, self.format_price,
+            min_amend_ticks=self.trailing_amend_ticks
+        )
+        self.trailer.on_activate = self._on_local_profit_lock
+        self.trailer.on_breach = self._on_local_trailing_breach
+        
+        # Resume the ratchet from a warm-restart snapshot
+        if self.position and self._restored_stop:
+            self.trailer.watch(self.position_side, self.entry_price, self.symbol_info, active=self.profit_lock_active)
+            self.trailer.stop_price = self._restored_stop
+            self.trailer.sent_price = self._restored_stop
+        self._restored_stop = None
+        
+        self.market_stream.subscribe_ticker(self.linear, self._on_ticker)
+        print(f"✅ Local trailing stop active | Amend every {self.trailing_amend_ticks} ticks")
+
+    def _ensure_market_stream(self):
+        if self.market_stream is None:
+            self.market_stream = MarketStream(self.exchange)
+            self.market_stream.start()
+        return self.market_stream
+
+    def _on_ticker(self, symbol, ticker):
+        price = ticker.get('lastPrice')
+        if price and self.position:
+            self.trailer.on_price(float(price))
+
+    async def _on_local_profit_lock(self, current_price, profit_pct):
+        self.profit_lock_active = True
+        self._print_profit_lock(current_price, profit_pct)
+        await self.notifier.profit_lock_activated(
+            self.symbol, profit_pct, self.risk_manager.trailing_stop_pct * 100
+        )
+
+    async def _on_local_trailing_breach(self, current_price, stop_price):
+        """Close locally if the exchange-side stop has not caught up yet"""
+        tick = self.symbol_info['tick_size'] if self.symbol_info else 0
+        sent = self.trailer.sent_price
+        if sent is not None and abs(sent - stop_price) <= tick * self.trailing_amend_ticks:
+            return  # Exchange stop is close enough and will fire on its own
+        
+        if self.position:
+            await self.close_position("Trailing Stop")
+
     async def _set_trailing_stop(self, current_price):
         """Set trailing stop"""
         try:
-            info = self.get_symbol_info()
+            info = await asyncio.to_thread(self.get_symbol_info)
             if not info:
                 return
                 
@@ -258,7 +455,8 @@ class TradeEngine:
             trailing_distance = abs(current_price - trailing_price)
             formatted_trailing = self.format_price(info, trailing_distance)
             
-            resp = self.exchange.set_trading_stop(
+            resp = await asyncio.to_thread(
+                self.exchange.set_trading_stop,
                 category="linear",
                 symbol=self.linear,
                 positionIdx=0,
@@ -280,12 +478,12 @@ class TradeEngine:
                     await self.close_position("Force Close")
                     await asyncio.sleep(2)
                     
-                    self.check_position()
+                    await asyncio.to_thread(self.check_position)
                     if self.position:
                         print(f"❌ Force Close Failed | Manual intervention required")
                         return False
                 
-                wallet_balance = self.get_wallet_balance()
+                wallet_balance = await asyncio.to_thread(self.get_wallet_balance)
                 current_price = signal['price']
                 structure_stop = signal.get('structure_stop')  # Get structure stop from signal
                 
@@ -293,7 +491,7 @@ class TradeEngine:
                 position_size = self.risk_manager.calculate_position_size(
                     wallet_balance, current_price, structure_stop)
                 
-                info = self.get_symbol_info()
+                info = await asyncio.to_thread(self.get_symbol_info)
                 if not info:
                     return False
                 
@@ -312,6 +510,16 @@ class TradeEngine:
                 actual_reward = float(qty) * abs(tp_price - current_price)
                 actual_rr = actual_reward / actual_risk if actual_risk > 0 else 4.0
                 
+                # Portfolio cap across all workers, measured in fixed_risk_usd units
+                risk_units = actual_risk / self.risk_manager.fixed_risk_usd
+                if self.risk_budget and not self.risk_budget.try_acquire(self.linear, risk_units):
+                    print(f"\n⏸️ Risk Budget Full | {self.risk_budget.used():.1f}/{self.risk_budget.max_units:.0f} units open | {signal['action']} skipped")
+                    self._trace_outcome('risk_budget_full')
+                    self._journal_order('risk_blocked', side="Buy" if signal['action'] == 'BUY' else "Sell",
+                                        qty=float(qty), price=current_price, risk=actual_risk)
+                    return False
+                self._trace_mark('sizing')
+                
                 # Store for display
                 self.pending_order = {
                     'action': signal['action'],
@@ -327,18 +535,27 @@ class TradeEngine:
                 }
                 
                 # Place order
-                order = self.exchange.place_order(
-                    category="linear",
-                    symbol=self.linear,
-                    side=side,
-                    orderType="Market",
-                    qty=qty
-                )
+                self._trace_mark('send')
+                order = await self._submit_entry(side, qty, info)
+                self._trace_mark('ack')
+                self._position_dirty = True
+                metrics.ORDERS.inc(self.linear, 'entry', 'ok' if order.get('retCode') == 0 else 'failed')
                 
                 if order.get('retCode') != 0:
                     print(f"\n❌ Order Failed | {order.get('retMsg')} | Retry in 5s")
                     self.pending_order = None
+                    self._release_risk()
+                    self._trace_outcome('entry_failed')
+                    self._journal_order('entry', side=side, ret_code=order.get('retCode', -1),
+                                        qty=float(qty), price=current_price, sl=sl_price, tp=tp_price, risk=actual_risk)
                     return False
+                self._trace_outcome('entry')
+                
+                if order.get('avgPrice'):
+                    current_price = order['avgPrice']
+                    self.pending_order['price'] = current_price
+                self._journal_order('entry', side=side, ret_code=0, qty=float(qty), price=current_price,
+                                    sl=sl_price, tp=tp_price, risk=actual_risk)
                 
                 # Set stop loss and take profit with structure stops
                 await self._set_stop_and_tp(signal, current_price, info, structure_stop)
@@ -351,7 +568,7 @@ class TradeEngine:
                 
                 # Wait for position to be detected
                 await asyncio.sleep(1)
-                self.check_position()
+                await asyncio.to_thread(self.check_position)
                 
                 await self.notifier.trade_opened(self.symbol, current_price, float(qty), side)
                 return True
@@ -363,6 +580,34 @@ class TradeEngine:
 
 
  
+    async def _submit_entry(self, side, qty, info):
+        """Send the entry as a market order, or work it maker-first when configured"""
+        if self.entry_order_type != 'limit':
+            # The trace ID doubles as orderLinkId so exchange-side records line up with the trace log
+            extra = {'orderLinkId': self._trace.id} if self._trace else {}
+            return await asyncio.to_thread(
+                self.exchange.place_order,
+                category="linear",
+                symbol=self.linear,
+                side=side,
+                orderType="Market",
+                qty=qty,
+                **extra
+            )
+        
+        if self.limit_executor is None:
+            self.limit_executor = LimitOrderExecutor(
+                self.exchange, self._ensure_market_stream(), self.format_price, self.format_qty,
+                max_chase_bps=float(os.getenv('LIMIT_MAX_CHASE_BPS', '15')),
+                timeout=float(os.getenv('LIMIT_TIMEOUT', '8'))
+            )
+        
+        result = await self.limit_executor.execute(self.linear, side, qty, info)
+        mode = "Market fallback" if result['fallback'] else "Maker"
+        print(f"\n⚡ Entry Fill | {mode} | Maker {result['makerQty']:g} / Taker {result['takerQty']:g} | "
+              f"Amends: {result['amends']} | {result['latency']*1000:.0f}ms")
+        return result
+    
     async def _set_stop_and_tp(self, signal, current_price, info, structure_stop=None):
         """Set stop loss and take profit with structure stops"""
         try:
@@ -374,7 +619,8 @@ class TradeEngine:
                 current_price, side, structure_stop)
             
             # Set both SL and TP
-            stop_resp = self.exchange.set_trading_stop(
+            stop_resp = await asyncio.to_thread(
+                self.exchange.set_trading_stop,
                 category="linear",
                 symbol=self.linear,
                 positionIdx=0,
@@ -383,6 +629,7 @@ class TradeEngine:
                 slTriggerBy="LastPrice",
                 tpTriggerBy="LastPrice"
             )
+            self._trace_mark('sltp')
             
             if stop_resp.get('retCode') != 0:
                 print(f"\n⚠️ SL/TP Warning | Price Invalid | Manual monitoring required")
@@ -399,14 +646,16 @@ class TradeEngine:
             side = "Sell" if self.position['side'] == "Buy" else "Buy"
             qty = str(self.position['size'])
             
-            order = self.exchange.place_order(
-                category="linear",
-                symbol=self.linear,
-                side=side,
-                orderType="Market",
-                qty=qty,
-                reduceOnly=True
-            )
+            # Routed through the batcher so concurrent closes share one round trip
+            self._position_dirty = True
+            order = await self.batcher.place("linear", {
+                'symbol': self.linear,
+                'side': side,
+                'orderType': "Market",
+                'qty': qty,
+                'reduceOnly': True
+            })
+            metrics.ORDERS.inc(self.linear, 'close', 'ok' if order.get('retCode') == 0 else 'failed')
             
             if order.get('retCode') != 0:
                 print(f"\n❌ Close Failed | {order.get('retMsg')} | Manual intervention required")
@@ -422,6 +671,7 @@ class TradeEngine:
             
             pnl = self.position.get('unrealized_pnl', 0)
             result = "Win" if pnl > 0 else "Loss"
+            self._journal_order('close', side=side, qty=float(qty), pnl=pnl)
             
             print(f"\n📉 CLOSED | {reason} | ⏱️ Duration: {duration} | PnL: {pnl:+.2f} | {result}")
             
@@ -429,6 +679,7 @@ class TradeEngine:
             
             # Clear all position state
             self._clear_position()
+            self._release_risk()
             
             return True
             
@@ -451,109 +702,485 @@ class TradeEngine:
             
             if is_opposite:
                 await self.close_position("Opposite Signal")
+                self._trace_outcome('close')
+            else:
+                self._trace_outcome('hold')
         else:
             await self.open_position(signal)
 
-    async def run_cycle(self):
+    def _stage(self, name):
+        return self.latency.stage(name) if self.latency else nullcontext()
+    
+    def _journal_order(self, purpose, symbol=None, **fields):
+        if not self.journal:
+            return
+        name = self.state_key if symbol in (None, self.linear) else symbol
+        if self._trace:
+            fields.setdefault('link_id', self._trace.id)
+        self.journal.record_order(name, purpose, **fields)
+    
+    def _profile_cycle(self):
+        return self.profiler.cycle() if self.profiler else nullcontext()
+    
+    def _memory_cycle(self):
+        return self.memory.cycle() if self.memory else nullcontext()
+    
+    def _trace_mark(self, stage):
+        if self._trace:
+            self._trace.mark(stage)
+    
+    def _trace_outcome(self, outcome):
+        if self._trace:
+            self._trace.outcome = outcome
+    
+    def _finish_trace(self):
+        trace, self._trace = self._trace, None
+        if trace and self.tracer:
+            self.tracer.finish(trace)
+    
+    async def run_cycle(self, df=None):
+        started = time.perf_counter()
+        try:
+            with self._stage('cycle'), self._profile_cycle(), self._memory_cycle():
+                # Get data (MultiSymbolEngine passes a frame it fetched concurrently)
+                if df is None and self._warm_df:
+                    fetched_at, warm = self._warm_df
+                    self._warm_df = None
+                    if time.monotonic() - fetched_at < 2.0:
+                        df = warm
+                if df is None:
+                    with self._stage('cycle.market_data'):
+                        df = self.get_market_data()
+                if df is None or df.empty:
+                    return
+                
+                # Get signal
+                prev_signal = self.strategy.last_signal
+                with self._stage('cycle.signal'), tracing.active(self._trace):
+                    signal = self.strategy.generate_signal(df)
+                self._trace_mark('signal')
+                if self.journal:
+                    self.journal.record_cycle(self.linear, df, signal, self.strategy, prev_signal)
+                if signal:
+                    metrics.SIGNALS.inc(self.linear, signal['action'])
+                await self.act_on_signal(df, signal)
+                
+        except Exception as e:
+            self._report_cycle_error(e)
+        
+        metrics.CYCLES.inc(self.linear)
+        metrics.CYCLE_LATENCY.observe(time.perf_counter() - started, self.linear)
+        if self.latency:
+            self.latency.maybe_report()
+        if self.api_usage:
+            self.api_usage.maybe_report()
+        if self.memory:
+            await self.memory.maybe_sample()
+    
+    async def act_on_signal(self, df, signal):
+        """Position, risk and order handling for a signal computed once (FanOutEngine shares it)"""
         try:
-            # Get data
-            df = self.get_market_data()
-            if df is None or df.empty:
-                return
-            
             # Check position
-            self.check_position()
-            
-            # Get signal and current price
-            signal = self.strategy.generate_signal(df)
+            with self._stage('cycle.check_position'):
+                await asyncio.to_thread(self.check_position)
             current_price = df['close'].iloc[-1]
             
             # Risk management
             if self.position:
-                await self.handle_risk_management(current_price)
-                self.check_position()
+                with self._stage('cycle.risk_management'):
+                    await self.handle_risk_management(current_price)
+                    await asyncio.to_thread(self.check_position)
             
-            # Display status
-            self._display_status(df, current_price)
+            # Publish status (drawn by the renderer thread, never blocks on stdout)
+            with self._stage('cycle.status'):
+                self._publish_status(current_price)
             
             # Handle signals
-            await self.handle_signal(signal)
+            with self._stage('cycle.handle_signal'):
+                await self.handle_signal(signal)
+            
+            with self._stage('cycle.state_save'):
+                await self._save_state()
                 
         except Exception as e:
-            # Only print connection errors occasionally to avoid spam
-            now = datetime.now()
-            if (self._last_cycle_error is None or 
-                (now - self._last_cycle_error).seconds > 30):
-                print(f"\n❌ API Error | Connection Lost | Reconnecting... | {e}")
-                self._last_cycle_error = now
+            self._trace_outcome('error')
+            self._report_cycle_error(e)
+        finally:
+            self._finish_trace()
+    
+    def _report_cycle_error(self, e):
+        metrics.CYCLE_ERRORS.inc(self.linear)
+        # Only print connection errors occasionally to avoid spam
+        now = datetime.now()
+        if (self._last_cycle_error is None or 
+            (now - self._last_cycle_error).seconds > 30):
+            print(f"\n❌ API Error | Connection Lost | Reconnecting... | {e}")
+            self._last_cycle_error = now
 
 
 
-    def _display_status(self, df, current_price):
-        """Display consolidated status format with structure stop info"""
-        # Get indicators
-        df_with_indicators = self.strategy.calculate_indicators(df)
-        current_rsi = df_with_indicators['rsi'].iloc[-1] if 'rsi' in df_with_indicators.columns else 50.0
-        current_mfi = df_with_indicators['mfi'].iloc[-1] if 'mfi' in df_with_indicators.columns else 50.0
-        
-        timestamp = datetime.now().strftime('%H:%M:%S')
+    def _publish_status(self, current_price):
+        """Swap in a fresh status snapshot and queue opening lines, no terminal I/O here"""
+        rsi = self.strategy.last_rsi if self.strategy.last_rsi is not None else 50.0
+        mfi = self.strategy.last_mfi if self.strategy.last_mfi is not None else 50.0
         symbol_short = self.symbol.replace('/', '')
         
         if self.pending_order:
-            # Position just opened - show full opening info (3 lines)
-            direction_emoji = "📈" if self.pending_order['action'] == 'BUY' else "📉"
-            
-            # Line 1: Opening info
-            opening_line = f"[{timestamp}] {symbol_short} | RSI: {current_rsi:.1f} | MFI: {current_mfi:.1f} | {direction_emoji} {self.pending_order['action']} {self.pending_order['qty']} @ ${self.pending_order['price']:.2f}"
-            print(f"\n{opening_line}")
-            
-            # Line 2: Risk details with structure stop info
-            stop_type = "Structure" if self.pending_order.get('structure_based') else "Fixed"
-            stop_distance_pct = abs(self.pending_order['price'] - self.pending_order['sl_price']) / self.pending_order['price'] * 100
-            
-            risk_line = (f"💰 Risk: ${self.pending_order['risk_amount']:.0f} | "
-                        f"SL: ${self.pending_order['sl_price']:.2f} ({stop_type} {stop_distance_pct:.1f}%) | "
-                        f"TP: ${self.pending_order['tp_price']:.2f} (+${self.pending_order['reward_amount']:.0f}) | "
-                        f"R:R 1:{self.pending_order['rr_ratio']:.1f}")
-            print(f"{risk_line}")
-            
-            # Clear pending order
+            if self.renderer:
+                self.renderer.post(self._format_opening(self.pending_order, symbol_short, rsi, mfi))
             self.pending_order = None
-            
-        elif self.position:
-            # Position monitoring - only update the timer line
-            if self.position_start_time:
-                duration = datetime.now() - self.position_start_time
+        
+        self.status = {
+            'time': datetime.now(),
+            'symbol': symbol_short,
+            'rsi': rsi,
+            'mfi': mfi,
+            'price': current_price,
+            'position': dict(self.position) if self.position else None,
+            'start_time': self.position_start_time,
+            'profit_lock': self.profit_lock_active
+        }
+    
+    @staticmethod
+    def _format_opening(order, symbol_short, rsi, mfi):
+        """Opening info with structure stop details (2 lines)"""
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        direction_emoji = "📈" if order['action'] == 'BUY' else "📉"
+        
+        # Line 1: Opening info
+        opening_line = f"[{timestamp}] {symbol_short} | RSI: {rsi:.1f} | MFI: {mfi:.1f} | {direction_emoji} {order['action']} {order['qty']} @ ${order['price']:.2f}"
+        
+        # Line 2: Risk details with structure stop info
+        stop_type = "Structure" if order.get('structure_based') else "Fixed"
+        stop_distance_pct = abs(order['price'] - order['sl_price']) / order['price'] * 100
+        
+        risk_line = (f"💰 Risk: ${order['risk_amount']:.0f} | "
+                    f"SL: ${order['sl_price']:.2f} ({stop_type} {stop_distance_pct:.1f}%) | "
+                    f"TP: ${order['tp_price']:.2f} (+${order['reward_amount']:.0f}) | "
+                    f"R:R 1:{order['rr_ratio']:.1f}")
+        return f"{opening_line}\n{risk_line}"
+    
+    def render_status(self):
+        """Status line from the latest snapshot, called on the renderer thread"""
+        status = self.status
+        if status is None:
+            return None
+        
+        position = status['position']
+        if position:
+            # Position monitoring - timer line
+            if status['start_time']:
+                duration = datetime.now() - status['start_time']
                 hours, remainder = divmod(int(duration.total_seconds()), 3600)
                 minutes, seconds = divmod(remainder, 60)
                 duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
             else:
                 duration_str = "00:00:00"
             
-            pnl = self.position['unrealized_pnl']
-            lock_status = ' 🔒' if self.profit_lock_active else ''
-            
-            # Line 3: Position monitoring (updates every second)
-            monitor_line = f"⏱️ {duration_str} | ${current_price:.2f} | PnL: {pnl:+.2f}{lock_status}"
-            print(f"\r{monitor_line}", end='', flush=True)
-            
-        else:
-            # No position - market status (updates every second)
-            status = f"[{timestamp}] {symbol_short} | RSI: {current_rsi:.1f} | MFI: {current_mfi:.1f} | No Position"
-            print(f"\r{status}", end='', flush=True)
+            lock_status = ' 🔒' if status['profit_lock'] else ''
+            return f"⏱️ {duration_str} | ${status['price']:.2f} | PnL: {position['unrealized_pnl']:+.2f}{lock_status}"
+        
+        # No position - market status
+        timestamp = status['time'].strftime('%H:%M:%S')
+        return f"[{timestamp}] {status['symbol']} | RSI: {status['rsi']:.1f} | MFI: {status['mfi']:.1f} | No Position"
     
     async def run(self):
         self.running = True
+        self._start_local_trailing()
+        metrics.track_engine(self)
+        metrics.track_notifier(self.notifier)
+        metrics.start_exporter_from_env()
+        if self.profiler:
+            self.profiler.install_signal()
+        self.watchdog = LoopWatchdog.from_env(project_root)
+        if self.watchdog:
+            self.watchdog.start()
+        self.memory = MemoryTelemetry.from_env(project_root)
+        if self.display_enabled and self.renderer is None:
+            self.renderer = StatusRenderer.from_env(self.render_status)
+            if self.renderer:
+                self.renderer.start()
+        
+        # Absolute deadlines on exchange time, with an extra cycle right after each candle close
+        self.scheduler = CycleScheduler.from_env(self.exchange, bar_seconds=int(self.kline_interval) * 60)
         try:
+            # First cycle runs immediately, then on the scheduler's deadlines
+            if self.startup_profiler:
+                self.startup_profiler.finish()
+            await self.run_cycle()
             while self.running:
+                await self.scheduler.wait()
+                if not self.running:
+                    break
                 await self.run_cycle()
-                await asyncio.sleep(1)
         except Exception as e:
             print(f"\n❌ Fatal Error | {e}")
             await self.notifier.error_notification(str(e))
     
-    async def stop(self):
+    def get_open_positions(self, symbols=None):
+        """Open linear USDT positions in one call, optionally filtered by symbol"""
+        try:
+            resp = self.exchange.get_positions(category="linear", settleCoin="USDT")
+            if resp.get('retCode') != 0:
+                return []
+            
+            positions = [p for p in resp.get('result', {}).get('list', [])
+                         if float(p.get('size', 0)) > 0]
+            if symbols is not None:
+                positions = [p for p in positions if p.get('symbol') in symbols]
+            return positions
+            
+        except Exception as e:
+            print(f"\n❌ API Error | Position List Failed | {e}")
+            return []
+    
+    async def close_positions(self, positions, reason="Signal"):
+        """Close many positions with one batch submission, returns results by symbol"""
+        legs = [{
+            'symbol': p['symbol'],
+            'side': "Sell" if p['side'] == "Buy" else "Buy",
+            'orderType': "Market",
+            'qty': str(p['size']),
+            'reduceOnly': True
+        } for p in positions]
+        
+        results = await self.batcher.place_many("linear", legs)
+        
+        outcome = {}
+        for pos, result in zip(positions, results):
+            symbol = pos['symbol']
+            outcome[symbol] = result
+            metrics.ORDERS.inc(symbol, 'flatten', 'ok' if result.get('retCode') == 0 else 'failed')
+            pnl = float(pos.get('unrealisedPnl', 0) or 0)
+            self._journal_order('close', symbol=symbol, side="Sell" if pos['side'] == "Buy" else "Buy",
+                                ret_code=result.get('retCode', -1), qty=float(pos['size']), pnl=pnl)
+            
+            if result.get('retCode') != 0:
+                print(f"\n❌ Close Failed | {symbol} | {result.get('retMsg')} | Manual intervention required")
+                continue
+            
+            result_str = "Win" if pnl > 0 else "Loss"
+            print(f"\n📉 CLOSED | {symbol} | {reason} | PnL: {pnl:+.2f} | {result_str}")
+            await self.notifier.trade_closed(symbol, 0, pnl, reason)
+            
+            if symbol == self.linear:
+                self._clear_position()
+            if self.risk_budget:
+                self.risk_budget.release(symbol)
+        
+        return outcome
+    
+    def _snapshot_state(self):
+        """Compact engine, strategy and indicator state for warm restarts"""
+        return {
+            'symbol': self.linear,
+            'position': {
+                'side': self.position['side'],
+                'size': self.position['size'],
+                'avg_price': self.position['avg_price']
+            } if self.position else None,
+            'position_start_time': self.position_start_time.isoformat() if self.position_start_time else None,
+            'profit_lock_active': self.profit_lock_active,
+            'trailing_stop': self.trailer.stop_price if self.trailer else None,
+            'last_signal': self.strategy.last_signal,
+            'last_rsi': None if self.strategy.last_rsi is None else float(self.strategy.last_rsi),
+            'last_mfi': None if self.strategy.last_mfi is None else float(self.strategy.last_mfi)
+        }
+    
+    async def _save_state(self, force=False):
+        if not self.state_store:
+            return
+        state = self._snapshot_state()
+        if force or self.state_store.due(self.state_key, state):
+            try:
+                await asyncio.to_thread(self.state_store.save, self.state_key, state, True)
+            except Exception as e:
+                print(f"\n⚠️ State snapshot failed | {e}")
+    
+    def restore_state(self):
+        """Reload the last snapshot and reconcile it with the position on the exchange"""
+        if not self.state_store:
+            return False
+        state = self.state_store.load(self.state_key)
+        if not state:
+            return False
+        
+        self.strategy.last_signal = state.get('last_signal')
+        self.strategy.last_rsi = state.get('last_rsi')
+        self.strategy.last_mfi = state.get('last_mfi')
+        age = time.time() - state.get('saved_at', time.time())
+        
+        self.check_position()
+        saved = state.get('position')
+        matched = bool(
+            self.position and saved and saved['side'] == self.position['side']
+            and abs(saved['avg_price'] - self.position['avg_price']) <= self.position['avg_price'] * 1e-6
+        )
+        
+        if matched:
+            # Same position as before the restart: keep its clock, profit lock and trailing level
+            if state.get('position_start_time'):
+                self.position_start_time = datetime.fromisoformat(state['position_start_time'])
+            self.profit_lock_active = bool(state.get('profit_lock_active'))
+            self._restored_stop = state.get('trailing_stop')
+            lock = ' 🔒' if self.profit_lock_active else ''
+            print(f"♻️ State Restored | {self.linear} {self.position['side']} position matched{lock} | Last signal: {self.strategy.last_signal} | Age {age:.0f}s")
+        elif self.position:
+            print(f"♻️ State Restored | {self.linear} position differs from snapshot | Lock state reset | Last signal: {self.strategy.last_signal}")
+        else:
+            print(f"♻️ State Restored | {self.linear} flat | Last signal: {self.strategy.last_signal} | Age {age:.0f}s")
+        return True
+    
+    def _open_position_map(self, symbols):
+        """Open positions by symbol from exchange state, raises if the exchange can't say"""
+        resp = self.exchange.get_positions(category="linear", settleCoin="USDT")
+        if resp.get('retCode') != 0:
+            raise RuntimeError(resp.get('retMsg'))
+        return {p['symbol']: p for p in resp.get('result', {}).get('list', [])
+                if p.get('symbol') in symbols and float(p.get('size', 0)) > 0}
+    
+    async def flatten_all(self, symbols=None, reason="Bot Stop", deadline=None):
+        """Cancel working orders and close every position concurrently, verified flat within deadline"""
+        symbols = set(symbols) if symbols is not None else {self.linear}
+        deadline = self.flatten_deadline if deadline is None else deadline
+        started = time.monotonic()
+        remaining = lambda: max(0.0, started + deadline - time.monotonic())
+        outcome = {}
+        
+        def record(symbol):
+            return outcome.setdefault(symbol, {'status': 'open', 'attempts': 0, 'size': 0.0,
+                                               'pnl': 0.0, 'time_to_flat': None, 'error': None})
+        
+        # Cancel working orders per symbol and snapshot positions, all at once
+        cancels = [asyncio.to_thread(self.exchange.cancel_all_orders, category="linear", symbol=s)
+                   for s in symbols]
+        positions = {}
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(asyncio.to_thread(self._open_position_map, symbols), *cancels,
+                               return_exceptions=True),
+                remaining())
+            for symbol, result in zip(symbols, results[1:]):
+                if isinstance(result, Exception) or result.get('retCode') != 0:
+                    error = result if isinstance(result, Exception) else result.get('retMsg')
+                    record(symbol)['error'] = f"Cancel failed: {error}"
+            if isinstance(results[0], Exception):
+                raise results[0]
+            positions = results[0]
+        except Exception as e:
+            # No reliable snapshot: try again in the verify loop below
+            print(f"\n❌ Flatten | Position snapshot failed | {e}")
+            positions = None
+        
+        for symbol, pos in (positions or {}).items():
+            entry = record(symbol)
+            entry['size'] = float(pos['size'])
+            entry['pnl'] = float(pos.get('unrealisedPnl', 0) or 0)
+        
+        while remaining() > 0:
+            if positions is None:
+                try:
+                    positions = await asyncio.wait_for(
+                        asyncio.to_thread(self._open_position_map, symbols), remaining())
+                except Exception:
+                    await asyncio.sleep(min(0.2, remaining()))
+                    continue
+            
+            # Anything we were tracking that is no longer open is flat
+            now = time.monotonic()
+            for symbol, entry in outcome.items():
+                if symbol not in positions and entry['status'] == 'open' and entry['attempts']:
+                    entry['status'] = 'flat'
+                    entry['time_to_flat'] = now - started
+            if not positions:
+                break
+            
+            # Close whatever is still open, every leg in one concurrent batch submission
+            legs = list(positions.values())
+            for pos in legs:
+                record(pos['symbol'])['attempts'] += 1
+            try:
+                results = await asyncio.wait_for(self.close_positions(legs, reason), remaining())
+                for symbol, result in results.items():
+                    if result.get('retCode') != 0:
+                        record(symbol)['error'] = result.get('retMsg')
+            except asyncio.TimeoutError:
+                break
+            except Exception as e:
+                for pos in legs:
+                    record(pos['symbol'])['error'] = str(e)
+            
+            # Verify from exchange state, not from order acks
+            await asyncio.sleep(min(0.2, remaining()))
+            positions = None
+        
+        for symbol, entry in outcome.items():
+            if entry['status'] == 'open':
+                entry['status'] = 'timeout' if not entry['error'] else 'failed'
+        
+        report = {
+            'reason': reason,
+            'symbols': outcome,
+            'flat': all(e['status'] == 'flat' for e in outcome.values()),
+            'time_to_flat': time.monotonic() - started
+        }
+        self._print_flatten_report(report)
+        return report
+    
+    def _print_flatten_report(self, report):
+        outcome = report['symbols']
+        if not outcome:
+            return
+        flat = sum(1 for e in outcome.values() if e['status'] == 'flat')
+        status = "✅" if report['flat'] else "❌"
+        print(f"\n{status} Flatten | {report['reason']} | {flat}/{len(outcome)} flat | {report['time_to_flat']:.2f}s")
+        for symbol, e in sorted(outcome.items()):
+            if e['status'] == 'flat':
+                print(f"   {symbol} | Flat in {e['time_to_flat']:.2f}s | {e['attempts']} attempt(s) | PnL: {e['pnl']:+.2f}")
+            else:
+                print(f"   {symbol} | {e['status'].upper()} | {e['error'] or 'Not flat by deadline'} | Manual intervention required")
+    
+    async def flatten_positions(self, reason="Bot Stop"):
+        """Flatten this engine's symbol"""
+        return await self.flatten_all({self.linear}, reason)
+    
+    async def stop(self, shared=True):
+        """shared=False leaves the market stream, tracer, journal and notifier to the engine that owns them"""
         self.running = False
         
-        if self.position:
-            await self.close_position("Bot Stop")
\ No newline at end of file
+        if self.renderer and self.display_enabled:
+            self.renderer.stop()
+        
+        if self.scheduler and self.scheduler.cycles:
+            print(f"\n⏱️ Scheduler | {self.scheduler.summary()}")
+        
+        if self.latency and self.latency.histograms:
+            print(f"\n{self.latency.report(f'Latency | {self.linear}')}")
+        
+        if self.api_usage and self.api_usage.endpoints:
+            print(f"\n{self.api_usage.report()}")
+        
+        if self.watchdog:
+            self.watchdog.stop()
+            print(f"\n{self.watchdog.report()}")
+        
+        if self.memory:
+            self.memory.sample()
+        
+        if self.market_stream and shared:
+            self.market_stream.stop()
+        
+        if self.exchange:
+            await self.flatten_positions("Bot Stop")
+            self.check_position()
+        
+        await self._save_state(force=True)
+        if self.profiler:
+            self.profiler.finish()
+        if not shared:
+            return
+        if self.tracer:
+            self.tracer.flush()
+        if self.journal:
+            self.journal.close()
+        await self.notifier.flush()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import time
+import asyncio
+
+class LocalTrailingStop:
+    """Client-side trailing stop ratcheted on every tick, amending the exchange SL sparingly"""
+
+    def __init__(self, exchange, linear, risk_manager, format_price, min_amend_ticks=5,
+                 min_amend_interval=0.25):
+        self.exchange = exchange
+        self.linear = linear
+        self.risk_manager = risk_manager
+        self.format_price = format_price
+        self.min_amend_ticks = min_amend_ticks          # Only amend after moving this many ticks
+        self.min_amend_interval = min_amend_interval    # Seconds between set_trading_stop calls
+
+        self.info = None
+        self.on_activate = None     # async callback(price, profit_pct)
+        self.on_breach = None       # async callback(price, stop) when the local stop is crossed
+        self.reset()
+
+        # Counters
+        self.ticks_seen = 0
+        self.amends_sent = 0
+        self.amends_failed = 0
+
+    def reset(self):
+        """Forget the current position"""
+        self.side = None
+        self.entry_price = 0
+        self.active = False
+        self.stop_price = None
+        self.sent_price = None
+        self._last_amend = 0.0
+        self._amend_task = None
+        self._breached = False
+
+    def watch(self, side, entry_price, info, active=False):
+        """Start tracking a position ('buy' or 'sell')"""
+        if self.side == side and self.entry_price == entry_price:
+            return
+        self.reset()
+        self.side = side
+        self.entry_price = entry_price
+        self.info = info
+        self.active = active
+
+    def on_price(self, price):
+        """Feed a trade/ticker price, may schedule activation or an amend"""
+        if not self.side or not self.entry_price:
+            return
+        self.ticks_seen += 1
+
+        if not self.active:
+            if not self.risk_manager.should_activate_profit_lock(self.entry_price, price, self._rm_side()):
+                return
+            self.active = True
+            if self.on_activate:
+                asyncio.get_running_loop().create_task(self.on_activate(price, self._profit_pct(price)))
+
+        candidate = self.risk_manager.get_trailing_stop_price(price, self._rm_side())
+        if self.stop_price is None or self._is_better(candidate, self.stop_price):
+            self.stop_price = candidate
+
+        if self._crossed(price) and not self._breached:
+            self._breached = True
+            if self.on_breach:
+                asyncio.get_running_loop().create_task(self._breach(price, self.stop_price))
+            return
+
+        self._maybe_amend()
+
+    async def _breach(self, price, stop):
+        try:
+            await self.on_breach(price, stop)
+        except Exception as e:
+            print(f"\n⚠️ SL/TP Warning | Trailing Close Error | {e}")
+        finally:
+            # A close that was skipped or failed leaves the position open, the next crossing tick retries
+            if self.side is not None:
+                self._breached = False
+
+    def _rm_side(self):
+        return 'long' if self.side == 'buy' else 'short'
+
+    def _profit_pct(self, price):
+        if self.side == 'buy':
+            return (price - self.entry_price) / self.entry_price * 100
+        return (self.entry_price - price) / self.entry_price * 100
+
+    def _is_better(self, candidate, current):
+        return candidate > current if self.side == 'buy' else candidate < current
+
+    def _crossed(self, price):
+        if self.stop_price is None:
+            return False
+        return price <= self.stop_price if self.side == 'buy' else price >= self.stop_price
+
+    def _needs_amend(self):
+        if not self.side or self.stop_price is None or not self.info:
+            return False  # Without instrument info the stop cannot be formatted
+        if self.sent_price is None:
+            return True
+        return abs(self.stop_price - self.sent_price) >= self.info['tick_size'] * self.min_amend_ticks
+
+    def _maybe_amend(self):
+        if self._amend_task is not None and not self._amend_task.done():
+            return  # The in-flight amend re-checks the stop when its call returns
+        if not self._needs_amend():
+            return
+
+        wait = self.min_amend_interval - (time.monotonic() - self._last_amend)
+        self._amend_task = asyncio.get_running_loop().create_task(self._amend(max(wait, 0)))
+
+    async def _amend(self, delay):
+        task = asyncio.current_task()
+        while True:
+            # Coalesce: moves during the delay are folded into one call
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._amend_task is not task or not self._needs_amend():
+                return  # Position reset or replaced, or the exchange stop is already close enough
+
+            stop = self.stop_price
+            self._last_amend = time.monotonic()
+            try:
+                resp = await asyncio.to_thread(
+                    self.exchange.set_trading_stop,
+                    category="linear",
+                    symbol=self.linear,
+                    positionIdx=0,
+                    stopLoss=self.format_price(self.info, stop),
+                    slTriggerBy="LastPrice"
+                )
+                if resp.get('retCode') != 0:
+                    self.amends_failed += 1
+                    print(f"\n⚠️ SL/TP Warning | Trailing Amend Failed | {resp.get('retMsg')}")
+                    return
+                self.sent_price = stop
+                self.amends_sent += 1
+            except Exception as e:
+                self.amends_failed += 1
+                print(f"\n⚠️ SL/TP Warning | Trailing Amend Error | {e}")
+                return
+
+            # Ratchets that landed during the call go out next, still rate limited
+            delay = self.min_amend_interval - (time.monotonic() - self._last_amend)
@@ -1,16 +1,21 @@
 import os
 import sys
 import asyncio
-from dotenv import load_dotenv
-
-load_dotenv(override=True)
 
 # Add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from core.trade_engine import TradeEngine
+from core.startup import StartupProfiler
+
+# The trading stack (pandas, strategy, engine) is still needed before the first cycle, it is imported
+# inside main() only so --startup-profile can time it. pybit and telegram load lazily on first use.
+profiler = StartupProfiler(enabled='--startup-profile' in sys.argv)
+
+with profiler.phase("dotenv"):
+    from dotenv import load_dotenv
+    load_dotenv(override=True)
 
 def display_startup_info(engine, wallet_balance, current_price):
     """Display streamlined startup info"""
@@ -22,18 +27,36 @@ def display_startup_info(engine, wallet_balance, current_price):
 async def main():
     engine = None
     try:
-        engine = TradeEngine()
+        # SYMBOLS=BNB/USDT,ETH/USDT trades several symbols on one loop and one client
+        symbols = [s.strip() for s in os.getenv('SYMBOLS', '').split(',') if s.strip()]
         
-        if not engine.connect():
+        with profiler.phase("import pandas"):
+            import pandas
+        with profiler.phase("import core.trade_engine"):
+            from core.trade_engine import TradeEngine
+        
+        with profiler.phase("engine init"):
+            # ACCOUNTS=main,sub1 computes signals once and trades them on every account
+            accounts = [a.strip() for a in os.getenv('ACCOUNTS', '').split(',') if a.strip()]
+            if len(accounts) > 1:
+                from core.fanout import FanOutEngine
+                engine = FanOutEngine(accounts, symbol=symbols[0] if symbols else None)
+            elif len(symbols) > 1:
+                from core.multi_engine import MultiSymbolEngine
+                engine = MultiSymbolEngine(symbols)
+            else:
+                engine = TradeEngine(symbol=symbols[0] if symbols else None)
+            engine.startup_profiler = profiler
+        
+        with profiler.phase("connect (concurrent probes)"):
+            connected = engine.connect()
+        if not connected:
             print("❌ Connection Failed | Check API credentials")
             return
         
-        # Get current data for startup display
-        wallet_balance = engine.get_wallet_balance()
-        ticker = engine.exchange.get_tickers(category="linear", symbol=engine.linear)
-        current_price = float(ticker['result']['list'][0]['lastPrice']) if ticker.get('retCode') == 0 else 0.086
-        
-        display_startup_info(engine, wallet_balance, current_price)
+        # Balance and price come from the connect-time probes, no extra round trips
+        wallet_balance = engine.startup_balance
+        display_startup_info(engine, wallet_balance, engine.startup_price)
         
         await engine.notifier.bot_started(engine.symbol, wallet_balance)
         await engine.run()
@@ -48,9 +71,9 @@ async def main():
         if engine:
             try:
                 await engine.stop()
-                print("✅ Bot Stopped | All positions closed | Session complete")
-            except:
-                pass
+                print("✅ Bot Stopped | Session complete")
+            except Exception as e:
+                print(f"❌ Shutdown Error | {e} | Check open positions manually")
 
 if __name__ == "__main__":
     try:
@@ -59,4 +82,4 @@ if __name__ == "__main__":
         print("👋 Done")
     except Exception as e:
         print(f"❌ Fatal: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -2,12 +2,15 @@ import json
 import os
 import pandas as pd
 import numpy as np
+from core import tracing
 
 class RSIMFICloudStrategy:
     def __init__(self, risk_manager):
         self.risk_manager = risk_manager  # Get symbol from risk manager
         self._load_config()
         self.last_signal = None
+        self.last_rsi = None     # Latest values kept for the status display
+        self.last_mfi = None
     
     def _load_config(self):
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -114,6 +117,7 @@ class RSIMFICloudStrategy:
         
         # Calculate indicators
         df = self.calculate_indicators(df)
+        tracing.mark('indicators')
         
         # Get current values
         current_rsi = df['rsi'].iloc[-1]
@@ -124,6 +128,9 @@ class RSIMFICloudStrategy:
         if pd.isna(current_rsi) or pd.isna(current_mfi):
             return None
         
+        self.last_rsi = current_rsi
+        self.last_mfi = current_mfi
+        
         # Signal conditions
         oversold = self.params['oversold_level']
         overbought = self.params['overbought_level']
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+import signal
+import asyncio
+import multiprocessing
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+# Add project root to path
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.risk_budget import RiskBudget
+
+def shard_symbols(symbols, workers):
+    """Round-robin symbols over at most `workers` shards"""
+    shards = [[] for _ in range(min(workers, len(symbols)))]
+    for i, symbol in enumerate(symbols):
+        shards[i % len(shards)].append(symbol)
+    return shards
+
+async def run_shard(shard_id, symbols, budget, announce):
+    from core.trade_engine import TradeEngine
+    from core.multi_engine import MultiSymbolEngine
+
+    engine = MultiSymbolEngine(symbols) if len(symbols) > 1 else TradeEngine(symbol=symbols[0])
+    for e in getattr(engine, 'engines', [engine]):
+        e.risk_budget = budget
+
+    # Supervisor asks for shutdown with SIGTERM, positions are flattened on the way out
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: setattr(engine, 'running', False))
+
+    try:
+        if not engine.connect():
+            print(f"❌ Shard {shard_id} | Connection Failed | {','.join(symbols)}")
+            sys.exit(2)
+
+        if announce:
+            await engine.notifier.bot_started(engine.symbol, engine.startup_balance)
+        await engine.run()
+    finally:
+        await engine.stop()
+
+def worker_main(shard_id, symbols, budget, announce):
+    # Ctrl+C goes to the whole process group, let the supervisor drive shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Each worker exposes metrics on its own port / file
+    if os.getenv('METRICS_PORT'):
+        os.environ['METRICS_PORT'] = str(int(os.environ['METRICS_PORT']) + shard_id)
+    if os.getenv('METRICS_TEXTFILE'):
+        root, ext = os.path.splitext(os.environ['METRICS_TEXTFILE'])
+        os.environ['METRICS_TEXTFILE'] = f"{root}_shard{shard_id}{ext}"
+    asyncio.run(run_shard(shard_id, symbols, budget, announce))
+
+class Supervisor:
+    """Shards symbols over worker processes and restarts the ones that crash"""
+
+    def __init__(self, symbols, workers=None, risk_units=None, max_backoff=60.0):
+        self.ctx = multiprocessing.get_context('spawn')
+        self.shards = shard_symbols(symbols, workers or os.cpu_count() or 1)
+        self.budget = RiskBudget(symbols, risk_units or len(symbols), ctx=self.ctx)
+        self.max_backoff = max_backoff
+        self.procs = {}          # shard_id -> Process
+        self.restarts = {}       # shard_id -> restart count
+        self.next_start = {}     # shard_id -> monotonic time the restart is due
+        self.running = False
+
+    def _spawn(self, shard_id):
+        announce = self.restarts.get(shard_id, 0) == 0
+        proc = self.ctx.Process(
+            target=worker_main,
+            args=(shard_id, self.shards[shard_id], self.budget, announce),
+            name=f"shard-{shard_id}",
+            daemon=False
+        )
+        proc.start()
+        self.procs[shard_id] = proc
+        self.next_start.pop(shard_id, None)
+
+    def start(self):
+        self.running = True
+        for shard_id in range(len(self.shards)):
+            self._spawn(shard_id)
+        print(f"🚀 Supervisor | {len(self.shards)} workers | "
+              f"Risk budget: {self.budget.max_units:.0f} units")
+
+    def poll(self):
+        """Restart dead workers with exponential backoff"""
+        now = time.monotonic()
+        for shard_id, proc in list(self.procs.items()):
+            if proc.is_alive():
+                continue
+
+            if shard_id not in self.next_start:
+                count = self.restarts.get(shard_id, 0)
+                backoff = min(2 ** count, self.max_backoff)
+                self.next_start[shard_id] = now + backoff
+                self.restarts[shard_id] = count + 1
+                print(f"\n⚠️ Worker Crashed | Shard {shard_id} | {','.join(self.shards[shard_id])} | "
+                      f"Exit {proc.exitcode} | Restart in {backoff:.0f}s")
+            elif now >= self.next_start[shard_id]:
+                proc.close()
+                self._spawn(shard_id)
+                print(f"\n🔄 Worker Restarted | Shard {shard_id} | Restart #{self.restarts[shard_id]}")
+
+    def stop(self, timeout=30.0):
+        """SIGTERM every worker so it flattens, then kill stragglers after timeout"""
+        self.running = False
+        for proc in self.procs.values():
+            if proc.is_alive():
+                proc.terminate()
+
+        deadline = time.monotonic() + timeout
+        for shard_id, proc in self.procs.items():
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                print(f"❌ Shard {shard_id} did not stop in {timeout:.0f}s | Killing | Manual check required")
+                proc.kill()
+                proc.join()
+
+    def run(self, interval=1.0):
+        self.start()
+        try:
+            while self.running:
+                time.sleep(interval)
+                self.poll()
+        finally:
+            self.stop()
+
+def main():
+    symbols = [s.strip() for s in os.getenv('SYMBOLS', 'BNB/USDT').split(',') if s.strip()]
+    workers = int(os.getenv('WORKERS', '0')) or None
+    risk_units = float(os.getenv('RISK_BUDGET_UNITS', '0')) or None
+
+    supervisor = Supervisor(symbols, workers=workers, risk_units=risk_units)
+    signal.signal(signal.SIGTERM, lambda *_: setattr(supervisor, 'running', False))
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutdown Initiated | Stopping workers...")
+    print("✅ Supervisor Stopped | All workers exited")
+
+if __name__ == "__main__":
+    main()